@@ -1,6 +1,21 @@
 from PySide2 import QtCore, QtGui, QtWidgets, QtSvg
+import array
+import bisect
+import collections
+import concurrent.futures
+import contextlib
+import functools
+import hashlib
 import typing
+import weakref
 import json
+import math
+import mmap
+import os
+import statistics
+import struct
+import sys
+import time
 
 # TODO: Alt mouse wheel always zoom out.
 # TODO: Add remaining locators to example.json.
@@ -34,6 +49,706 @@ class InariCommandInterpreter():
         print(f'Host_GetSelection(item: {item}, worldSpace: {worldSpace}, relative: {relative})')
         return [0, 0, 0]
 
+    # Sets the positions of multiple items in one call, maps item names to [x, y, z].
+    # Bridges should override this with a bulk implementation, the default falls back to Host_SetPosition per item.
+    def Host_SetPositions(self, positions:typing.Dict[str, typing.List[float]], worldSpace:bool=False, relative:bool=True) -> None:
+        for item, position in positions.items():
+            self.Host_SetPosition(item, position[0], position[1], position[2], worldSpace=worldSpace, relative=relative)
+
+    # Gets the positions of multiple items in one call, returned in the same order as the supplied item names.
+    # Bridges should override this with a bulk implementation, the default falls back to Host_GetPosition per item.
+    def Host_GetPositions(self, items:typing.List[str], worldSpace:bool=False, relative:bool=True) -> typing.List[typing.List[float]]:
+        return [self.Host_GetPosition(item, worldSpace=worldSpace, relative=relative) for item in items]
+
+    # Opens an undo chunk, all changes made until the chunk is closed are undone as a single step.
+    def Host_OpenUndoChunk(self, name:str) -> None:
+        print(f'Host_OpenUndoChunk(name: {name})')
+
+    # Closes the undo chunk opened by Host_OpenUndoChunk.
+    def Host_CloseUndoChunk(self) -> None:
+        print(f'Host_CloseUndoChunk()')
+
+    # Calls callback with the item name whenever the local transform of one of the supplied items changes in the host.
+    # Returns true if the host supports change notifications; without them Inari can't mirror the host positions.
+    def Host_AddTransformChangedCallback(self, items:typing.List[str], callback:typing.Callable[[str], None]) -> bool:
+        return False
+
+    # Removes all callbacks added with Host_AddTransformChangedCallback.
+    def Host_RemoveTransformChangedCallbacks(self) -> None:
+        pass
+
+    # Calls callback whenever the current frame of the host changes, for example during playback.
+    # Returns true if the host supports frame notifications; without them live pose reflection polls the host instead.
+    def Host_AddFrameChangedCallback(self, callback:typing.Callable[[], None]) -> bool:
+        return False
+
+    # Removes all callbacks added with Host_AddFrameChangedCallback.
+    def Host_RemoveFrameChangedCallbacks(self) -> None:
+        pass
+
+    # Calls callback once the host executed all calls made before, and the notifications they caused were passed to the callbacks.
+    # Bridges executing the calls right away call it immediately, bridges queuing them call it once the host acknowledged them.
+    def Host_Synchronize(self, callback:typing.Callable[[], None]) -> None:
+        callback()
+
+"""
+InariCommandInterpreterProxy forwards all host calls to the InariCommandInterpreter provided by the bridge and reports them to listeners.
+Listeners are called after every host call with the call name, positional and keyword arguments, result and duration in seconds,
+which is used for recording interaction traces and profiling the host communication. The InariWidget always talks to the host through one.
+"""
+class InariCommandInterpreterProxy(InariCommandInterpreter):
+    # The InariCommandInterpreter the host calls are forwarded to.
+    commandInterpreter: InariCommandInterpreter = None
+
+    # Constructor.
+    def __init__(self, commandInterpreter: InariCommandInterpreter) -> None:
+        self.commandInterpreter = commandInterpreter
+        self._listeners: typing.List[typing.Callable[[str, tuple, dict, typing.Any, float], None]] = []
+
+    # Adds a listener called after every host call.
+    def addListener(self, listener: typing.Callable[[str, tuple, dict, typing.Any, float], None]) -> None:
+        self._listeners.append(listener)
+
+    # Removes a listener added with addListener().
+    def removeListener(self, listener: typing.Callable[[str, tuple, dict, typing.Any, float], None]) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    # Forwards a host call and reports it to the listeners.
+    def call(self, name: str, *args, **kwargs) -> typing.Any:
+        if len(self._listeners) == 0:
+            return getattr(self.commandInterpreter, name)(*args, **kwargs)
+        start = time.perf_counter()
+        result = getattr(self.commandInterpreter, name)(*args, **kwargs)
+        duration = time.perf_counter() - start
+        for listener in list(self._listeners):
+            listener(name, args, kwargs, result, duration)
+        return result
+
+    def Host_SetSelection(self, items:typing.List[str]) -> None:
+        return self.call("Host_SetSelection", items)
+
+    def Host_GetSelection(self) -> typing.List[str]:
+        return self.call("Host_GetSelection")
+
+    def Host_SetPosition(self, item:str, x:float, y:float, z:float, worldSpace:bool=False, relative:bool=True) -> None:
+        return self.call("Host_SetPosition", item, x, y, z, worldSpace=worldSpace, relative=relative)
+
+    def Host_GetPosition(self, item:str, worldSpace:bool=False, relative:bool=True) -> typing.List[float]:
+        return self.call("Host_GetPosition", item, worldSpace=worldSpace, relative=relative)
+
+    def Host_SetPositions(self, positions:typing.Dict[str, typing.List[float]], worldSpace:bool=False, relative:bool=True) -> None:
+        return self.call("Host_SetPositions", positions, worldSpace=worldSpace, relative=relative)
+
+    def Host_GetPositions(self, items:typing.List[str], worldSpace:bool=False, relative:bool=True) -> typing.List[typing.List[float]]:
+        return self.call("Host_GetPositions", items, worldSpace=worldSpace, relative=relative)
+
+    def Host_OpenUndoChunk(self, name:str) -> None:
+        return self.call("Host_OpenUndoChunk", name)
+
+    def Host_CloseUndoChunk(self) -> None:
+        return self.call("Host_CloseUndoChunk")
+
+    def Host_AddTransformChangedCallback(self, items:typing.List[str], callback:typing.Callable[[str], None]) -> bool:
+        return self.call("Host_AddTransformChangedCallback", items, callback)
+
+    def Host_RemoveTransformChangedCallbacks(self) -> None:
+        return self.call("Host_RemoveTransformChangedCallbacks")
+
+    def Host_AddFrameChangedCallback(self, callback:typing.Callable[[], None]) -> bool:
+        return self.call("Host_AddFrameChangedCallback", callback)
+
+    def Host_RemoveFrameChangedCallbacks(self) -> None:
+        return self.call("Host_RemoveFrameChangedCallbacks")
+
+    # Not a host command, so it isn't reported to the listeners.
+    def Host_Synchronize(self, callback:typing.Callable[[], None]) -> None:
+        self.commandInterpreter.Host_Synchronize(callback)
+
+
+"""
+InariAsyncCommandInterpreter is the asynchronous variant of the InariCommandInterpreter API, so Inari never waits on a slow host command.
+Host calls return a concurrent.futures.Future and are queued, the queue is executed in order by a pump provided by the bridge: a function
+scheduling a callable to run on the host main thread at a safe point, like maya.utils.executeDeferred. Without one a zero timer is used.
+Calls submitted with a key cancel the queued call with the same key that hasn't run yet, for example an outdated selection.
+Callback registration stays synchronous and is done on the InariCommandInterpreter directly.
+"""
+class InariAsyncCommandInterpreter(QtCore.QObject):
+    # The InariCommandInterpreter the queued calls are executed on.
+    commandInterpreter: InariCommandInterpreter = None
+    # Time in milliseconds a single pump may spend executing calls, the remaining ones are left to the next pump.
+    pumpBudget: float = 8.0
+
+    # Constructor.
+    # pump is called with a callable whenever queued calls are waiting to be executed, None uses a zero timer.
+    def __init__(self, commandInterpreter: InariCommandInterpreter, pump: typing.Callable[[typing.Callable[[], None]], typing.Any] = None, parent: QtCore.QObject = None) -> None:
+        super().__init__(parent)
+        self.commandInterpreter = commandInterpreter
+        self.pump = pump
+        # Queued (future, function, key) tuples, in submission order.
+        self._queue: typing.Deque[typing.Tuple[concurrent.futures.Future, typing.Callable[[], typing.Any], typing.Hashable]] = collections.deque()
+        # Maps keys -> futures of the queued calls submitted with them.
+        self._keyedFutures: typing.Dict[typing.Hashable, concurrent.futures.Future] = {}
+        self._pumpScheduled = False
+        self._pumpTimer = QtCore.QTimer(self)
+        self._pumpTimer.setSingleShot(True)
+        self._pumpTimer.setInterval(0)
+        self._pumpTimer.timeout.connect(self.pumped)
+
+    # Sets the pump executing the queued calls, see the constructor.
+    def setPump(self, pump: typing.Callable[[typing.Callable[[], None]], typing.Any]) -> None:
+        self.pump = pump
+
+    # Queues a function and returns the future of its result. A queued call with the same key that hasn't run yet is cancelled.
+    def submit(self, function: typing.Callable[[], typing.Any], key: typing.Hashable = None) -> concurrent.futures.Future:
+        if key != None:
+            self.cancel(key)
+        future = concurrent.futures.Future()
+        self._queue.append((future, function, key))
+        if key != None:
+            self._keyedFutures[key] = future
+        self.schedulePump()
+        return future
+
+    # Queues a call of an InariCommandInterpreter method, see submit().
+    def call(self, name: str, *args, key: typing.Hashable = None, **kwargs) -> concurrent.futures.Future:
+        return self.submit(functools.partial(getattr(self.commandInterpreter, name), *args, **kwargs), key)
+
+    # Cancels the queued call submitted with the key, returns false if there is none or it already runs.
+    def cancel(self, key: typing.Hashable) -> bool:
+        future = self._keyedFutures.pop(key, None)
+        return future != None and future.cancel()
+
+    # Returns the number of queued calls, including cancelled ones that haven't been dropped yet.
+    def pending(self) -> int:
+        return len(self._queue)
+
+    # Executes queued calls in order, until the queue is empty, the future has been resolved or the budget in milliseconds is used up.
+    def execute(self, until: concurrent.futures.Future = None, budget: float = None) -> None:
+        timer = QtCore.QElapsedTimer()
+        timer.start()
+        while len(self._queue) > 0 and not (until != None and until.done()):
+            if budget != None and timer.elapsed() >= budget:
+                self.schedulePump()
+                return
+            future, function, key = self._queue.popleft()
+            if key != None and self._keyedFutures.get(key) is future:
+                del self._keyedFutures[key]
+            # Cancelled calls are skipped.
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                result = function()
+            except Exception as exception:
+                print(f'Host call failed: {exception!r}')
+                future.set_exception(exception)
+            else:
+                future.set_result(result)
+
+    # Executes the queued calls up to the future and returns its result, for calls whose result is needed right away.
+    def wait(self, future: concurrent.futures.Future) -> typing.Any:
+        self.execute(until=future)
+        return future.result()
+
+    # Asks the pump to execute the queued calls, unless it already has been.
+    def schedulePump(self) -> None:
+        if self._pumpScheduled:
+            return
+        self._pumpScheduled = True
+        if self.pump != None:
+            self.pump(self.pumped)
+        else:
+            self._pumpTimer.start()
+
+    # Called by the pump, executes the queued calls within the pump budget.
+    def pumped(self) -> None:
+        self._pumpScheduled = False
+        self.execute(budget=self.pumpBudget)
+
+    def Host_SetSelection(self, items:typing.List[str]) -> concurrent.futures.Future:
+        # Only the latest selection matters, a queued one is outdated.
+        return self.call("Host_SetSelection", items, key="Host_SetSelection")
+
+    def Host_GetSelection(self) -> concurrent.futures.Future:
+        return self.call("Host_GetSelection")
+
+    def Host_SetPosition(self, item:str, x:float, y:float, z:float, worldSpace:bool=False, relative:bool=True) -> concurrent.futures.Future:
+        return self.call("Host_SetPosition", item, x, y, z, worldSpace=worldSpace, relative=relative)
+
+    def Host_GetPosition(self, item:str, worldSpace:bool=False, relative:bool=True) -> concurrent.futures.Future:
+        return self.call("Host_GetPosition", item, worldSpace=worldSpace, relative=relative)
+
+    def Host_SetPositions(self, positions:typing.Dict[str, typing.List[float]], worldSpace:bool=False, relative:bool=True) -> concurrent.futures.Future:
+        return self.call("Host_SetPositions", positions, worldSpace=worldSpace, relative=relative)
+
+    def Host_GetPositions(self, items:typing.List[str], worldSpace:bool=False, relative:bool=True) -> concurrent.futures.Future:
+        return self.call("Host_GetPositions", items, worldSpace=worldSpace, relative=relative)
+
+    def Host_OpenUndoChunk(self, name:str) -> concurrent.futures.Future:
+        return self.call("Host_OpenUndoChunk", name)
+
+    def Host_CloseUndoChunk(self) -> concurrent.futures.Future:
+        return self.call("Host_CloseUndoChunk")
+
+
+"""
+InariCommandQueue sits in front of the InariCommandInterpreter and coalesces high frequency commands like drag updates.
+Only the latest value per item is kept, and the queue is flushed to the host at most once per display frame.
+Transactions group everything sent to the host in between into a single host undo chunk.
+With an InariAsyncCommandInterpreter the host calls are deferred to its pump instead of made right away, in the same order.
+"""
+class InariCommandQueue(QtCore.QObject):
+    # The InariCommandInterpreter used for interacting with the host application.
+    commandInterpreter: InariCommandInterpreter = None
+    # The InariAsyncCommandInterpreter host calls are deferred to, None makes them right away.
+    asyncCommandInterpreter: InariAsyncCommandInterpreter = None
+    # The InariPositionMirror positions sent to the host are written through to.
+    positionMirror: "InariPositionMirror" = None
+
+    # Constructor.
+    def __init__(self, commandInterpreter: InariCommandInterpreter, parent: QtCore.QObject = None) -> None:
+        super().__init__(parent)
+        self.commandInterpreter = commandInterpreter
+        # Maps (item, worldSpace) -> [x, y, z, relative], in the order the items were first queued.
+        self._pendingPositions: typing.Dict[typing.Tuple[str, bool], list] = {}
+        self._transactionDepth = 0
+        self._lastFlushTime = QtCore.QElapsedTimer()
+        # The flush timer is restarted for the remainder of the current frame whenever a command is queued.
+        self._flushTimer = QtCore.QTimer(self)
+        self._flushTimer.setSingleShot(True)
+        self._flushTimer.setTimerType(QtCore.Qt.PreciseTimer)
+        self._flushTimer.timeout.connect(self.flush)
+
+    # Sets the InariCommandInterpreter used for interacting with the host application.
+    def setCommandInterpreter(self, commandInterpreter: InariCommandInterpreter) -> None:
+        self.flush()
+        self.commandInterpreter = commandInterpreter
+
+    # Sets the InariPositionMirror positions sent to the host are written through to.
+    def setPositionMirror(self, positionMirror: "InariPositionMirror") -> None:
+        self.positionMirror = positionMirror
+
+    # Sets the InariAsyncCommandInterpreter host calls are deferred to, None makes them right away.
+    def setAsyncCommandInterpreter(self, asyncCommandInterpreter: typing.Optional[InariAsyncCommandInterpreter]) -> None:
+        self.flush()
+        self.asyncCommandInterpreter = asyncCommandInterpreter
+
+    # Makes a host call right away, or defers it to the InariAsyncCommandInterpreter.
+    def submit(self, function: typing.Callable[[], typing.Any]) -> None:
+        if self.asyncCommandInterpreter != None:
+            self.asyncCommandInterpreter.submit(function)
+        else:
+            function()
+
+    # Returns the duration of a display frame in milliseconds.
+    @staticmethod
+    def frameInterval() -> float:
+        screen = QtGui.QGuiApplication.primaryScreen()
+        refreshRate = screen.refreshRate() if screen != None else 0
+        return 1000.0 / (refreshRate if refreshRate > 0 else 60.0)
+
+    # Queues a Host_SetPosition command, replacing the pending value for the item; relative moves are accumulated.
+    def setPosition(self, item: str, x: float, y: float, z: float, worldSpace: bool = False, relative: bool = True) -> None:
+        pending = self._pendingPositions.get((item, worldSpace))
+        if pending != None and relative:
+            pending[0] += x
+            pending[1] += y
+            pending[2] += z
+        else:
+            self._pendingPositions[(item, worldSpace)] = [x, y, z, relative]
+        self.scheduleFlush()
+
+    # Schedules a flush at the start of the next display frame.
+    def scheduleFlush(self) -> None:
+        if self._flushTimer.isActive():
+            return
+        elapsed = self._lastFlushTime.elapsed() if self._lastFlushTime.isValid() else self.frameInterval()
+        self._flushTimer.start(max(0, int(self.frameInterval() - elapsed)))
+
+    # Sends all pending commands to the host, positions are sent as one Host_SetPositions call per space and mode.
+    def flush(self) -> None:
+        self._flushTimer.stop()
+        self._lastFlushTime.start()
+        pendingPositions, self._pendingPositions = self._pendingPositions, {}
+        batches: typing.Dict[typing.Tuple[bool, bool], typing.Dict[str, typing.List[float]]] = {}
+        for (item, worldSpace), (x, y, z, relative) in pendingPositions.items():
+            batches.setdefault((worldSpace, relative), {})[item] = [x, y, z]
+        for (worldSpace, relative), positions in batches.items():
+            self.submit(functools.partial(self.sendPositions, positions, worldSpace, relative))
+            # Deferred positions are written to the mirror right away, as that's where they are going to end up.
+            if self.positionMirror != None:
+                self.positionMirror.write(positions, worldSpace=worldSpace, relative=relative)
+        # Outside of transactions nothing else is going to change the items soon, so the host echoes are settled once they were sent.
+        # That includes the echoes of a transaction whose last positions were already flushed before it ended.
+        if self.positionMirror != None and not self.inTransaction():
+            self.submit(self.positionMirror.settle)
+
+    # Sends positions to the host, notifications received until the host executed the call are echoes for the position mirror.
+    def sendPositions(self, positions: typing.Dict[str, typing.List[float]], worldSpace: bool, relative: bool) -> None:
+        if self.positionMirror == None:
+            self.commandInterpreter.Host_SetPositions(positions, worldSpace=worldSpace, relative=relative)
+            return
+        self.positionMirror.beginWriting()
+        try:
+            self.commandInterpreter.Host_SetPositions(positions, worldSpace=worldSpace, relative=relative)
+        finally:
+            # Remote hosts only queue the call, their echoes arrive after it returned.
+            self.commandInterpreter.Host_Synchronize(self.positionMirror.endWriting)
+
+    # Begins a transaction, transactions can be nested and only the outermost one opens a host undo chunk.
+    def beginTransaction(self, name: str) -> None:
+        if self._transactionDepth == 0:
+            self.flush()
+            self.submit(functools.partial(self.commandInterpreter.Host_OpenUndoChunk, name))
+        self._transactionDepth += 1
+
+    # Ends a transaction, flushing the pending commands before the host undo chunk is closed.
+    def endTransaction(self) -> None:
+        if self._transactionDepth == 0:
+            return
+        self._transactionDepth -= 1
+        if self._transactionDepth == 0:
+            self.flush()
+            self.submit(self.commandInterpreter.Host_CloseUndoChunk)
+
+    # Returns true while inside a transaction.
+    def inTransaction(self) -> bool:
+        return self._transactionDepth > 0
+
+
+"""
+InariPositionMirror holds the last known local space positions of the host items controlled by the locators, so drags start without a host round trip.
+The mirror is filled with one bulk query when a scene is loaded, and kept up to date by transform change notifications from the host,
+refreshing the changed items with one bulk query per display frame. Positions set by Inari are written through instead of queried again.
+Hosts without change notifications can't keep the mirror valid, so it's disabled and every query goes to the host.
+In live mode, all mirrored items are refreshed once per host frame, as animated values don't send change notifications during playback.
+"""
+class InariPositionMirror(QtCore.QObject):
+    # Emitted with the item names whose mirrored positions changed.
+    positionsChanged = QtCore.Signal(list)
+    # The InariCommandInterpreter used for interacting with the host application.
+    commandInterpreter: InariCommandInterpreter = None
+    # The InariAsyncCommandInterpreter whose queued calls are executed before querying the host, so queries see the deferred changes.
+    asyncCommandInterpreter: InariAsyncCommandInterpreter = None
+    # True while the host notifies the mirror of transform changes.
+    enabled: bool = False
+    # True while all mirrored items are refreshed once per host frame, see setLive().
+    live: bool = False
+    # Time in milliseconds between refreshes in live mode, for hosts without frame notifications.
+    livePollInterval: int = 100
+
+    # Constructor.
+    def __init__(self, commandInterpreter: InariCommandInterpreter, parent: QtCore.QObject = None) -> None:
+        super().__init__(parent)
+        self.commandInterpreter = commandInterpreter
+        # The tracked item names, see track().
+        self._itemNames: typing.List[str] = []
+        # Maps item names -> [x, y, z].
+        self._positions: typing.Dict[str, typing.List[float]] = {}
+        # Item names changed in the host since they were last queried, in the order they were notified.
+        self._dirtyItems: typing.Dict[str, None] = {}
+        # Notifications received while Inari itself is setting positions are echoes of its own changes, they are refreshed once settled.
+        self._writeDepth = 0
+        self._echoedItems: typing.Dict[str, None] = {}
+        # True when settle() was called while still writing, it's settled once the last write ended.
+        self._settlePending = False
+        self._lastRefreshTime = QtCore.QElapsedTimer()
+        self._refreshTimer = QtCore.QTimer(self)
+        self._refreshTimer.setSingleShot(True)
+        self._refreshTimer.setTimerType(QtCore.Qt.PreciseTimer)
+        self._refreshTimer.timeout.connect(self.refresh)
+        self._livePollTimer = QtCore.QTimer(self)
+        self._livePollTimer.setInterval(self.livePollInterval)
+        self._livePollTimer.timeout.connect(self.frameChanged)
+
+    # Sets the InariAsyncCommandInterpreter whose queued calls are executed before querying the host.
+    def setAsyncCommandInterpreter(self, asyncCommandInterpreter: typing.Optional[InariAsyncCommandInterpreter]) -> None:
+        self.asyncCommandInterpreter = asyncCommandInterpreter
+
+    # Queries the local space positions of the supplied items from the host, after the deferred host calls queued before.
+    def queryPositions(self, itemNames: typing.List[str]) -> typing.List[typing.List[float]]:
+        if self.asyncCommandInterpreter != None:
+            return self.asyncCommandInterpreter.wait(self.asyncCommandInterpreter.Host_GetPositions(itemNames, worldSpace=False))
+        return self.commandInterpreter.Host_GetPositions(itemNames, worldSpace=False)
+
+    # Enables or disables live mode, where all mirrored items are refreshed with one bulk query per host frame.
+    # The host is polled instead if it doesn't support frame notifications.
+    def setLive(self, live: bool) -> None:
+        if live == self.live:
+            return
+        self.live = live
+        if live:
+            if not self.commandInterpreter.Host_AddFrameChangedCallback(self.frameChanged):
+                self._livePollTimer.start()
+            # Hosts without transform change notifications haven't been queried yet.
+            if not self.enabled:
+                self.frameChanged()
+        else:
+            self._livePollTimer.stop()
+            self.commandInterpreter.Host_RemoveFrameChangedCallbacks()
+
+    # Host frame notification, in live mode marks all mirrored items as changed and schedules a refresh.
+    def frameChanged(self) -> None:
+        if not self.live:
+            return
+        if len(self._itemNames) == 0:
+            return
+        self._dirtyItems.update(dict.fromkeys(self._itemNames))
+        self.scheduleRefresh()
+
+    # Mirrors the positions of the supplied items, replacing the previously mirrored ones.
+    # Subscribes to the host change notifications of the items and fills the mirror with one bulk query.
+    def track(self, itemNames: typing.List[str]) -> None:
+        self.clear()
+        itemNames = list(dict.fromkeys(itemNames))
+        if len(itemNames) == 0:
+            return
+        self._itemNames = itemNames
+        self.enabled = bool(self.commandInterpreter.Host_AddTransformChangedCallback(itemNames, self.invalidate))
+        if self.enabled or self.live:
+            self._positions = {itemName: list(position) for itemName, position in zip(itemNames, self.queryPositions(itemNames))}
+            self.positionsChanged.emit(itemNames)
+
+    # Unsubscribes from the host change notifications and drops all mirrored positions.
+    def clear(self) -> None:
+        if self.enabled:
+            self.commandInterpreter.Host_RemoveTransformChangedCallbacks()
+        self.enabled = False
+        self._refreshTimer.stop()
+        self._itemNames = []
+        self._positions.clear()
+        self._dirtyItems.clear()
+        self._echoedItems.clear()
+        self._settlePending = False
+
+    # Returns the local space positions of the supplied items, only the ones not mirrored or changed in the host are queried, in one call.
+    def positions(self, itemNames: typing.List[str]) -> typing.List[typing.List[float]]:
+        if not self.enabled:
+            return self.queryPositions(itemNames)
+        missingItems = [itemName for itemName in dict.fromkeys(itemNames) if not itemName in self._positions or itemName in self._dirtyItems]
+        if len(missingItems) > 0:
+            self.query(missingItems)
+        return [list(self._positions[itemName]) for itemName in itemNames]
+
+    # Returns the mirrored local space position of an item, or None if it isn't mirrored.
+    def position(self, itemName: str) -> typing.Optional[typing.List[float]]:
+        position = self._positions.get(itemName)
+        return list(position) if position != None else None
+
+    # Host transform change notification, marks the item as changed and schedules a refresh.
+    def invalidate(self, itemName: str) -> None:
+        if self._writeDepth > 0:
+            self._echoedItems[itemName] = None
+            return
+        self._dirtyItems[itemName] = None
+        self.scheduleRefresh()
+
+    # Schedules a refresh at the start of the next display frame.
+    def scheduleRefresh(self) -> None:
+        if self._refreshTimer.isActive():
+            return
+        elapsed = self._lastRefreshTime.elapsed() if self._lastRefreshTime.isValid() else InariCommandQueue.frameInterval()
+        self._refreshTimer.start(max(0, int(InariCommandQueue.frameInterval() - elapsed)))
+
+    # Queries the positions of all items changed in the host in one call, called by the refresh timer.
+    def refresh(self) -> None:
+        self._refreshTimer.stop()
+        self._lastRefreshTime.start()
+        if len(self._dirtyItems) > 0:
+            self.query(list(self._dirtyItems))
+
+    # Queries the positions of the supplied items in one call, and updates the mirror.
+    def query(self, itemNames: typing.List[str]) -> None:
+        positions = self.queryPositions(itemNames)
+        changedItems = []
+        for itemName, position in zip(itemNames, positions):
+            self._dirtyItems.pop(itemName, None)
+            if self._positions.get(itemName) != list(position):
+                self._positions[itemName] = list(position)
+                changedItems.append(itemName)
+        if len(changedItems) > 0:
+            self.positionsChanged.emit(changedItems)
+
+    # Context manager wrapped around host calls setting positions, host notifications received meanwhile are echoes of the change.
+    @contextlib.contextmanager
+    def writing(self) -> typing.Iterator[None]:
+        self.beginWriting()
+        try:
+            yield
+        finally:
+            self.endWriting()
+
+    # Begins setting positions in the host, host notifications received until endWriting() are echoes of the change.
+    def beginWriting(self) -> None:
+        self._writeDepth += 1
+
+    # Ends setting positions in the host, settling the echoes if it was asked for meanwhile.
+    def endWriting(self) -> None:
+        if self._writeDepth == 0:
+            return
+        self._writeDepth -= 1
+        if self._writeDepth == 0 and self._settlePending:
+            self.settle()
+
+    # Writes positions set by Inari through to the mirror, world space positions can't be mirrored and are queried again instead.
+    def write(self, positions: typing.Dict[str, typing.List[float]], worldSpace: bool = False, relative: bool = True) -> None:
+        if not self.enabled:
+            return
+        changedItems = []
+        for itemName, position in positions.items():
+            if worldSpace or (relative and not itemName in self._positions):
+                self.invalidate(itemName)
+            elif relative:
+                self._positions[itemName] = [value + delta for value, delta in zip(self._positions[itemName], position)]
+                changedItems.append(itemName)
+            else:
+                self._positions[itemName] = list(position)
+                changedItems.append(itemName)
+        if len(changedItems) > 0:
+            self.positionsChanged.emit(changedItems)
+
+    # Queries the echoed items once Inari is done changing them, so host side adjustments like limits end up in the mirror.
+    def settle(self) -> None:
+        # Echoes of writes the host hasn't acknowledged yet are still to come.
+        if self._writeDepth > 0:
+            self._settlePending = True
+            return
+        self._settlePending = False
+        if len(self._echoedItems) == 0:
+            return
+        self._dirtyItems.update(self._echoedItems)
+        self._echoedItems.clear()
+        self.scheduleRefresh()
+
+
+"""
+InariDragSession translates a set of locators together while the mouse is dragged.
+The start positions are taken from the InariPositionMirror, and every update is queued on the InariCommandQueue,
+which sends the positions of all dragged locators to the host as one batched call per frame.
+"""
+class InariDragSession():
+    # Constructor.
+    def __init__(self, scene: "InariScene", locators: typing.List["InariLocator"], scenePosition: QtCore.QPointF) -> None:
+        self.scene = scene
+        self.itemNames = list(dict.fromkeys(locator.itemName for locator in locators))
+        # Capture necessary data for drag translation.
+        self._initialScenePosition = scenePosition
+        positions = scene.positionMirror.positions(self.itemNames)
+        self._initialPositions = {itemName: list(position) for itemName, position in zip(self.itemNames, positions)}
+
+    # sceneMouseMoveEvent, called by InariScene while the session is registerd to scene mouse move events.
+    def sceneMouseMoveEvent(self, event: QtWidgets.QGraphicsSceneMouseEvent) -> None:
+        # Drag translation.
+        delta = (event.scenePos() - self._initialScenePosition)
+        delta.setY(delta.y() * -1)
+        delta /= 100
+
+        # Queue the newly calculated object positions, the queue sends them to the host in one call per frame.
+        for itemName, position in self._initialPositions.items():
+            self.scene.commandQueue.setPosition(itemName, position[0] + delta.x(), position[1] + delta.y(), position[2], worldSpace=False, relative=False)
+
+
+"""
+InariPoseBlend moves a set of host items from their current positions towards a pose, weight 1 applies the pose.
+Every update is queued on the InariCommandQueue, which sends the positions of all items to the host as one batched call per frame.
+"""
+class InariPoseBlend():
+    # Constructor, pose maps item names -> [x, y, z] local space positions.
+    def __init__(self, scene: "InariScene", pose: typing.Dict[str, typing.List[float]]) -> None:
+        self.scene = scene
+        self.pose = pose
+        # The start positions are only needed for partial weights, so applying a pose doesn't query the host.
+        self._startPositions: typing.Optional[typing.Dict[str, typing.List[float]]] = None
+
+    # Queues the positions blended between the start positions and the pose.
+    def setWeight(self, weight: float) -> None:
+        if weight >= 1.0:
+            for itemName, position in self.pose.items():
+                self.scene.commandQueue.setPosition(itemName, position[0], position[1], position[2], worldSpace=False, relative=False)
+            return
+        if self._startPositions == None:
+            itemNames = list(self.pose)
+            self._startPositions = {itemName: list(position) for itemName, position in zip(itemNames, self.scene.positionMirror.positions(itemNames))}
+        for itemName, position in self.pose.items():
+            start = self._startPositions[itemName]
+            self.scene.commandQueue.setPosition(itemName, *[a + (b - a) * weight for a, b in zip(start, position)], worldSpace=False, relative=False)
+
+
+"""
+InariPoseLibrary holds named poses, the local space positions of a set of host items, stored next to the scene file they belong to.
+The file is compact json: one table of the item names shared by all poses, and per pose the item indices and a flat list of positions.
+"""
+class InariPoseLibrary():
+    # File extension of pose library files, they are stored next to the json scene file they belong to.
+    extension: str = ".poses.json"
+    version: int = 1
+
+    # Constructor, use InariPoseLibrary.open() to load the pose library of a scene.
+    def __init__(self, path: typing.Optional[str] = None) -> None:
+        self.path = path
+        # Maps pose names -> item names -> [x, y, z].
+        self.poses: typing.Dict[str, typing.Dict[str, typing.List[float]]] = {}
+
+    # Returns the path of the pose library file belonging to a json scene file.
+    @classmethod
+    def libraryPath(cls, scenePath: str) -> str:
+        return os.path.splitext(scenePath)[0] + cls.extension
+
+    # Loads the pose library of a scene file, the library is empty if there is none yet or it couldn't be read.
+    @classmethod
+    def open(cls, scenePath: typing.Optional[str]) -> "InariPoseLibrary":
+        if scenePath == None:
+            return cls()
+        library = cls(cls.libraryPath(scenePath))
+        if not os.path.exists(library.path):
+            return library
+        try:
+            with open(library.path, "r") as file:
+                libraryObject = json.load(file)
+            itemNames = libraryObject["items"]
+            for name, poseObject in libraryObject["poses"].items():
+                positions = poseObject["positions"]
+                library.poses[name] = {itemNames[index]: positions[i * 3:i * 3 + 3] for i, index in enumerate(poseObject["items"])}
+        except (IOError, ValueError, KeyError, IndexError, TypeError):
+            print(f'Failed to read the pose library: {library.path}')
+            library.poses = {}
+        return library
+
+    # Writes the library to its file, returns false if it has no file or couldn't be written.
+    def save(self) -> bool:
+        if self.path == None:
+            return False
+        itemNames = list(dict.fromkeys(itemName for pose in self.poses.values() for itemName in pose))
+        itemIndices = {itemName: index for index, itemName in enumerate(itemNames)}
+        libraryObject = {
+            "version": self.version,
+            "items": itemNames,
+            "poses": {name: {"items": [itemIndices[itemName] for itemName in pose], "positions": [value for position in pose.values() for value in position]} for name, pose in self.poses.items()}
+        }
+        try:
+            with open(self.path, "w") as file:
+                json.dump(libraryObject, file, separators=(",", ":"))
+        except IOError:
+            print(f'Failed to write the pose library: {self.path}')
+            return False
+        return True
+
+    # Returns the names of all poses, in the order they were added.
+    def poseNames(self) -> typing.List[str]:
+        return list(self.poses)
+
+    # Returns a pose, maps item names -> [x, y, z], or None if there is no pose with the name.
+    def pose(self, name: str) -> typing.Optional[typing.Dict[str, typing.List[float]]]:
+        return self.poses.get(name)
+
+    # Adds a pose, replacing the one with the same name.
+    def setPose(self, name: str, pose: typing.Dict[str, typing.List[float]]) -> None:
+        self.poses[name] = {itemName: [float(value) for value in position] for itemName, position in pose.items()}
+
+    # Removes a pose, returns false if there is no pose with the name.
+    def removePose(self, name: str) -> bool:
+        return self.poses.pop(name, None) != None
+
 
 """
 InariScene can be thought as the scene data, providing the necessary functions to alter and manage the items.
@@ -44,12 +759,37 @@ class InariScene(QtWidgets.QGraphicsScene):
     shouldPropagateEventsToItems: bool = True
     # The InariCommandInterpreter used for interacting with the host application.
     commandInterpreter:InariCommandInterpreter = None
+    # The InariCommandQueue used for coalescing high frequency commands, like drag updates.
+    commandQueue:InariCommandQueue = None
+    # The InariAsyncCommandInterpreter selection changes are sent to the host with, None sends them right away.
+    asyncCommandInterpreter:InariAsyncCommandInterpreter = None
+    # The InariPositionMirror holding the last known host positions.
+    positionMirror:InariPositionMirror = None
+    # The active InariDragSession, if any.
+    dragSession:InariDragSession = None
+    # The active InariPoseBlend, if any.
+    poseBlend:InariPoseBlend = None
+    # If true, InariItems are drawn by the InariViews from texture atlases instead of painting themselves.
+    atlasRenderingEnabled:bool = False
+    # True while live pose reflection is enabled.
+    livePoseEnabled:bool = False
+    # True while the InariViews show the scene below InariItem.overviewLevelOfDetail.
+    overviewZoom:bool = False
     # All InariItem in this list will recieve scene/global mouse events.
     _sceneMouseMoveEventListeners:typing.List["InariItem"] = []
 
     # Constructor
     def __init__(self, parentItem: QtWidgets.QGraphicsItem) -> None:
         super().__init__(parentItem)
+        # Maps item names to the InariLocators in this scene controlling them, kept up to date by the locators.
+        self._locatorsByName: typing.Dict[str, typing.List["InariLocator"]] = {}
+        # Maps item names to the InariItems whose sub-items controlling them haven't been built yet, kept up to date by the items.
+        self._pendingItemsByName: typing.Dict[str, typing.List["InariItem"]] = {}
+        # Nesting depth of bulk inserts, and the item index method to restore once the outermost one ends.
+        self._bulkInsertDepth = 0
+        self._bulkInsertItemIndexMethod = self.itemIndexMethod()
+        # Maps ids to the panels whose locators are drawn on top of the overview image while the scene is live, see isLive().
+        self._liveOverviewPanels: typing.Dict[int, "InariItem"] = {}
         # Register signals
         QtCore.QObject.connect(self, QtCore.SIGNAL("selectionChanged()"), self.selectionChangedSignal)
 
@@ -57,6 +797,18 @@ class InariScene(QtWidgets.QGraphicsScene):
     def setCommandInterpreter(self, commandInterpreter:InariCommandInterpreter) -> None:
         self.commandInterpreter = commandInterpreter
 
+    # Sets the InariCommandQueue used for coalescing high frequency commands, like drag updates.
+    def setCommandQueue(self, commandQueue:InariCommandQueue) -> None:
+        self.commandQueue = commandQueue
+
+    # Sets the InariAsyncCommandInterpreter selection changes are sent to the host with, None sends them right away.
+    def setAsyncCommandInterpreter(self, asyncCommandInterpreter:typing.Optional[InariAsyncCommandInterpreter]) -> None:
+        self.asyncCommandInterpreter = asyncCommandInterpreter
+
+    # Sets the InariPositionMirror holding the last known host positions.
+    def setPositionMirror(self, positionMirror:InariPositionMirror) -> None:
+        self.positionMirror = positionMirror
+
     # If false, items won't recieve events and vise-versa.
     def setShouldPropagateEventsToItems(self, shouldPropagateEventsToItems: bool) -> None:
         self.shouldPropagateEventsToItems = shouldPropagateEventsToItems
@@ -69,6 +821,57 @@ class InariScene(QtWidgets.QGraphicsScene):
             boundingRect |= item.sceneBoundingRect()
         return boundingRect
 
+    # Enables or disables atlas rendering, where InariViews draw the InariItems in batches from texture atlases.
+    def setAtlasRenderingEnabled(self, atlasRenderingEnabled:bool) -> None:
+        self.atlasRenderingEnabled = atlasRenderingEnabled
+        for item in self.items():
+            if isinstance(item, InariItem):
+                item.setDrawnByView(atlasRenderingEnabled)
+        self.update()
+
+    # Adds a locator to the item name index, called by InariLocator when it's added to the scene or renamed.
+    def registerLocator(self, locator: "InariLocator") -> None:
+        if locator.itemName != None:
+            self._locatorsByName.setdefault(locator.itemName, []).append(locator)
+
+    # Removes a locator from the item name index, called by InariLocator when it's removed from the scene or renamed.
+    def unregisterLocator(self, locator: "InariLocator") -> None:
+        locators = self._locatorsByName.get(locator.itemName)
+        if locators != None and locator in locators:
+            locators.remove(locator)
+            if len(locators) == 0:
+                del self._locatorsByName[locator.itemName]
+
+    # Returns the locators controlling the item with the supplied name.
+    def locators(self, itemName: str) -> typing.List["InariLocator"]:
+        return self._locatorsByName.get(itemName, [])
+
+    # Adds an item with pending sub-items to the pending item name index, called by InariItem when its sub-items are deferred.
+    def registerPendingItem(self, item: "InariItem") -> None:
+        for itemName in item.pendingItemNames():
+            self._pendingItemsByName.setdefault(itemName, []).append(item)
+
+    # Removes an item from the pending item name index, called by InariItem when it's expanded or removed from the scene.
+    def unregisterPendingItem(self, item: "InariItem") -> None:
+        for itemName in item.pendingItemNames():
+            pendingItems = self._pendingItemsByName.get(itemName)
+            if pendingItems != None and item in pendingItems:
+                pendingItems.remove(item)
+                if len(pendingItems) == 0:
+                    del self._pendingItemsByName[itemName]
+
+    # Returns the items whose pending sub-items control the item with the supplied name.
+    def pendingItems(self, itemName: str) -> typing.List["InariItem"]:
+        return self._pendingItemsByName.get(itemName, [])
+
+    # Returns the names of all items controlled by locators in this scene.
+    def itemNames(self) -> typing.List[str]:
+        return list(self._locatorsByName)
+
+    # Returns the names of all items controlled by locators that haven't been built yet.
+    def pendingItemNames(self) -> typing.List[str]:
+        return list(self._pendingItemsByName)
+
     # Registers an InariItem for receiving scene space/global mouse events.
     def registerSceneMouseMoveEventListener(self, item: "InariItem") -> None:
         self._sceneMouseMoveEventListeners.append(item)
@@ -77,6 +880,69 @@ class InariScene(QtWidgets.QGraphicsScene):
     def unregisterSceneMouseMoveEventListener(self, item: "InariItem") -> None:
         self._sceneMouseMoveEventListeners.remove(item)
 
+    # Starts dragging the supplied locators, everything sent to the host during the drag is undone as a single step.
+    def beginDragSession(self, locators: typing.List["InariLocator"], scenePosition: QtCore.QPointF) -> None:
+        self.endDragSession()
+        self.commandQueue.beginTransaction('Inari Drag')
+        self.dragSession = InariDragSession(self, locators, scenePosition)
+        self.registerSceneMouseMoveEventListener(self.dragSession)
+
+    # Ends the active drag session, if any.
+    def endDragSession(self) -> None:
+        if self.dragSession == None:
+            return
+        self.unregisterSceneMouseMoveEventListener(self.dragSession)
+        self.dragSession = None
+        self.commandQueue.endTransaction()
+        self.restoreOverviews()
+
+    # Starts blending the host items towards a pose, everything sent to the host during the blend is undone as a single step.
+    def beginPoseBlend(self, pose: typing.Dict[str, typing.List[float]]) -> InariPoseBlend:
+        self.endPoseBlend()
+        self.commandQueue.beginTransaction('Inari Pose')
+        self.poseBlend = InariPoseBlend(self, pose)
+        return self.poseBlend
+
+    # Ends the active pose blend, if any.
+    def endPoseBlend(self) -> None:
+        if self.poseBlend == None:
+            return
+        self.poseBlend = None
+        self.commandQueue.endTransaction()
+        self.restoreOverviews()
+
+    # Enables or disables live pose reflection, the InariWidget moves the locators.
+    def setLivePoseEnabled(self, livePoseEnabled: bool) -> None:
+        self.livePoseEnabled = livePoseEnabled
+        self.restoreOverviews()
+
+    # Returns true while locators move every frame, during a drag, a pose blend or live pose reflection.
+    # Panels whose locators move while live draw only their static art from the overview image, with the locators drawn on top,
+    # so moving a locator doesn't render its whole panel again.
+    def isLive(self) -> bool:
+        return self.dragSession != None or self.poseBlend != None or self.livePoseEnabled
+
+    # Sets whether the InariViews show the scene below InariItem.overviewLevelOfDetail, where panels with a live overview draw their locators.
+    def setOverviewZoom(self, overviewZoom: bool) -> None:
+        if overviewZoom == self.overviewZoom:
+            return
+        self.overviewZoom = overviewZoom
+        for panel in list(self._liveOverviewPanels.values()):
+            panel.updateLiveItems()
+
+    # Keeps a panel drawing only its static art from the overview image until the scene is no longer live.
+    def registerLiveOverviewPanel(self, panel: "InariItem") -> None:
+        self._liveOverviewPanels[id(panel)] = panel
+
+    # Once the scene is no longer live, the locators are drawn into the overview images of their panels again.
+    def restoreOverviews(self) -> None:
+        if self.isLive():
+            return
+        panels = list(self._liveOverviewPanels.values())
+        self._liveOverviewPanels.clear()
+        for panel in panels:
+            panel.setLiveOverview(False)
+
     # Overwritten mouse move event handler, please refer to the QT documentation.
     def mouseMoveEvent(self, event:QtWidgets.QGraphicsSceneMouseEvent) -> None:
         super().mouseMoveEvent(event)
@@ -96,15 +962,56 @@ class InariScene(QtWidgets.QGraphicsScene):
     # Overwritten addItem function, please refer to the QT documentation.
     def addItem(self, item: QtWidgets.QGraphicsItem) -> None:
         super().addItem(item)
-        # Recalculate the scene rect size and add a big margin, this allows freer scene movement
-        # since camera transformations won't be blocked due to the small default scene size.
+        # During bulk inserts the scene rect is recalculated once at the end instead.
+        if self._bulkInsertDepth == 0:
+            self.updateSceneRect()
+
+    # Adds multiple items, only recalculating the item index and scene rect once.
+    def addItems(self, items: typing.Iterable[QtWidgets.QGraphicsItem]) -> None:
+        with self.bulkInsert():
+            for item in items:
+                self.addItem(item)
+
+    # Recalculates the scene rect from the items bounding rect.
+    def updateSceneRect(self) -> None:
+        # Add a big margin, this allows freer scene movement since camera transformations
+        # won't be blocked due to the small default scene size.
         self.setSceneRect(self.itemsBoundingRect().marginsAdded(QtCore.QMarginsF(1024*128, 1024*128, 1024*128, 1024*128)))
 
+    # Begins a bulk insert; the item index is disabled and the scene rect isn't updated until the matching endBulkInsert().
+    def beginBulkInsert(self) -> None:
+        if self._bulkInsertDepth == 0:
+            self._bulkInsertItemIndexMethod = self.itemIndexMethod()
+            self.setItemIndexMethod(QtWidgets.QGraphicsScene.NoIndex)
+        self._bulkInsertDepth += 1
+
+    # Ends a bulk insert, the outermost one rebuilds the item index and recalculates the scene rect once.
+    def endBulkInsert(self) -> None:
+        if self._bulkInsertDepth == 0:
+            return
+        self._bulkInsertDepth -= 1
+        if self._bulkInsertDepth == 0:
+            self.setItemIndexMethod(self._bulkInsertItemIndexMethod)
+            self.updateSceneRect()
+
+    # Context manager wrapping beginBulkInsert() and endBulkInsert(), items added with addSubItem() are covered too.
+    @contextlib.contextmanager
+    def bulkInsert(self) -> typing.Iterator[None]:
+        self.beginBulkInsert()
+        try:
+            yield
+        finally:
+            self.endBulkInsert()
+
     # Connected to the selectionChanged() signal, please refer to the QT documentation.
     def selectionChangedSignal(self) -> None:
         # Tell the host application to update it's selection to match Inari.
         items = [item.itemName for item in self.selectedItems() if isinstance(item, InariLocator)]
-        self.commandInterpreter.Host_SetSelection(items)
+        # Deferred selections supersede the ones that haven't been sent yet, so a slow host only ever applies the latest one.
+        if self.asyncCommandInterpreter != None:
+            self.asyncCommandInterpreter.Host_SetSelection(items)
+        else:
+            self.commandInterpreter.Host_SetSelection(items)
 
 
 """
@@ -119,10 +1026,46 @@ class InariView(QtWidgets.QGraphicsView):
     _lastRightMousePressPosition:QtCore.QPoint = None
     _lastRightMousePressVerticalScalingFactor:float = None
     _lastRightMousePressHorizontalScalingFactor:float = None
+    # Time in milliseconds after the last zoom step before the zoom gesture is considered settled.
+    zoomSettleDelay: int = 150
+    # Zoom factor of a single mouse wheel step.
+    wheelZoomFactor: float = 1.05
+    # Fraction of the remaining mouse wheel zoom applied per display frame, wheel zooming eases towards its target.
+    wheelZoomSmoothing: float = 0.35
+    # The texture atlas used when the scene has atlas rendering enabled.
+    _atlas: "InariTextureAtlas" = None
+    # The InariStatistics frames are reported to.
+    inariStatistics: "InariStatistics" = None
+    # Color of the paint heat overlay, drawn over the items with an opacity relative to the slowest visible item.
+    heatColor: QtGui.QColor = QtGui.QColor(255, 64, 0)
+    # Viewport backends; the raster backend paints on the CPU, the OpenGL backend composites on the GPU.
+    # Under Mesa, setting LIBGL_ALWAYS_SOFTWARE=1 runs the OpenGL backend on the software rasterizer, so it can be tested without a GPU.
+    rasterBackend: str = "raster"
+    openGLBackend: str = "opengl"
+    # The viewport backend in use, see setViewportBackend().
+    viewportBackend: str = "raster"
+    # Maps sample counts to whether an OpenGL context could be created with them, so OpenGL is only probed once.
+    _openGLAvailability: typing.Dict[int, bool] = {}
 
     # Constructor
-    def __init__(self, scene: QtWidgets.QGraphicsScene, parent: QtWidgets.QWidget = None):
+    # The viewport backend and its sample count default to the "viewport/backend" and "viewport/samples" settings.
+    def __init__(self, scene: QtWidgets.QGraphicsScene, parent: QtWidgets.QWidget = None, viewportBackend: str = None, samples: int = None):
         super().__init__(scene, parent)
+        # While this timer is active the view is zooming, items reuse their closest cached pixmaps until it times out.
+        self._zoomSettleTimer = QtCore.QTimer(self)
+        self._zoomSettleTimer.setSingleShot(True)
+        self._zoomSettleTimer.setInterval(self.zoomSettleDelay)
+        self._zoomSettleTimer.timeout.connect(self.zoomSettled)
+        # Camera input is collected from the mouse events and applied once per display frame by this timer.
+        self._pendingPan = QtCore.QPoint()
+        self._pendingDragZoomPosition: QtCore.QPoint = None
+        self._pendingWheelZoom = 1.0
+        self._wheelZoomPosition = QtCore.QPointF()
+        self._lastCameraUpdateTime = QtCore.QElapsedTimer()
+        self._cameraTimer = QtCore.QTimer(self)
+        self._cameraTimer.setSingleShot(True)
+        self._cameraTimer.setTimerType(QtCore.Qt.PreciseTimer)
+        self._cameraTimer.timeout.connect(self.applyCameraInput)
         # Configuration
         self.setTransformationAnchor(QtWidgets.QGraphicsView.AnchorUnderMouse)
         self.setResizeAnchor(QtWidgets.QGraphicsView.AnchorViewCenter)
@@ -132,11 +1075,221 @@ class InariView(QtWidgets.QGraphicsView):
         self.setBackgroundBrush(QtGui.QColor(26, 26, 26))
         self.setFrameShape(QtWidgets.QFrame.NoFrame)
         self.setDragMode(QtWidgets.QGraphicsView.DragMode.RubberBandDrag)
+        settings = QtCore.QSettings("Khaos Systems", "Inari")
+        viewportBackend = viewportBackend if viewportBackend != None else str(settings.value("viewport/backend", self.rasterBackend))
+        samples = samples if samples != None else int(settings.value("viewport/samples", 4))
+        self.setViewportBackend(viewportBackend, samples)
+
+    # Sets the viewport backend the view renders through, returns the backend in use.
+    # The OpenGL backend renders with "samples" samples per pixel, and falls back to the raster backend if no OpenGL context can be created.
+    def setViewportBackend(self, viewportBackend: str, samples: int = 4) -> str:
+        if viewportBackend == self.openGLBackend:
+            surfaceFormat = QtGui.QSurfaceFormat.defaultFormat()
+            surfaceFormat.setSamples(samples)
+            if self.isOpenGLAvailable(surfaceFormat):
+                viewport = QtWidgets.QOpenGLWidget()
+                viewport.setFormat(surfaceFormat)
+                self.setViewport(viewport)
+                # The whole OpenGL viewport is redrawn every frame anyway, tracking the changed regions would only cost time.
+                self.setViewportUpdateMode(QtWidgets.QGraphicsView.FullViewportUpdate)
+                self.viewportBackend = self.openGLBackend
+                return self.viewportBackend
+            print(f'OpenGL is not available, falling back to the raster viewport backend.')
+        elif viewportBackend != self.rasterBackend:
+            print(f'Unknown viewport backend: {viewportBackend}')
+
+        if self.viewportBackend != self.rasterBackend:
+            self.setViewport(QtWidgets.QWidget())
+        self.setViewportUpdateMode(QtWidgets.QGraphicsView.MinimalViewportUpdate)
+        self.viewportBackend = self.rasterBackend
+        return self.viewportBackend
+
+    # Returns true if an OpenGL context with the supplied format can be created and made current.
+    @classmethod
+    def isOpenGLAvailable(cls, surfaceFormat: QtGui.QSurfaceFormat) -> bool:
+        available = cls._openGLAvailability.get(surfaceFormat.samples())
+        if available == None:
+            context = QtGui.QOpenGLContext()
+            context.setFormat(surfaceFormat)
+            available = context.create()
+            if available:
+                surface = QtGui.QOffscreenSurface()
+                surface.setFormat(context.format())
+                surface.create()
+                available = surface.isValid() and context.makeCurrent(surface)
+                context.doneCurrent()
+                surface.destroy()
+            cls._openGLAvailability[surfaceFormat.samples()] = available
+        return available
 
     # Sets the InariCommandInterpreter used for interacting with the host application.
     def setCommandInterpreter(self, commandInterpreter:InariCommandInterpreter):
         self.commandInterpreter = commandInterpreter
 
+    # Sets the InariStatistics frames are reported to.
+    def setStatistics(self, inariStatistics: "InariStatistics") -> None:
+        self.inariStatistics = inariStatistics
+
+    # Returns true while a zoom gesture is in progress.
+    def isZooming(self) -> bool:
+        return self._zoomSettleTimer.isActive()
+
+    # Marks the view as zooming, restarting the settle timer.
+    def zoomStep(self) -> None:
+        self._zoomSettleTimer.start()
+
+    # Schedules applying the collected camera input at the start of the next display frame.
+    def scheduleCameraUpdate(self) -> None:
+        if self._cameraTimer.isActive():
+            return
+        elapsed = self._lastCameraUpdateTime.elapsed() if self._lastCameraUpdateTime.isValid() else InariCommandQueue.frameInterval()
+        self._cameraTimer.start(max(0, int(InariCommandQueue.frameInterval() - elapsed)))
+
+    # Applies the camera input collected since the last frame as a single transform update.
+    def applyCameraInput(self) -> None:
+        self._cameraTimer.stop()
+        self._lastCameraUpdateTime.start()
+
+        # Camera panning.
+        if not self._pendingPan.isNull():
+            verticalScrollBar = self.verticalScrollBar()
+            horizontalScrollBar = self.horizontalScrollBar()
+            verticalScrollBar.setValue(verticalScrollBar.value() - self._pendingPan.y())
+            horizontalScrollBar.setValue(horizontalScrollBar.value() - self._pendingPan.x())
+            self._pendingPan = QtCore.QPoint()
+
+        # Camera zooming, only the latest cursor position of the drag matters.
+        if self._pendingDragZoomPosition != None:
+            self.applyDragZoom(self._pendingDragZoomPosition)
+            self._pendingDragZoomPosition = None
+
+        # Mouse wheel zooming, eased towards the target over the following frames.
+        if self._pendingWheelZoom != 1.0:
+            # The remaining zoom is applied at once when it's too small to notice.
+            if abs(math.log(self._pendingWheelZoom)) < 0.005:
+                factor = self._pendingWheelZoom
+            else:
+                factor = self._pendingWheelZoom ** self.wheelZoomSmoothing
+            self._pendingWheelZoom = 1.0 if factor == self._pendingWheelZoom else self._pendingWheelZoom / factor
+            self.zoomAround(factor, self._wheelZoomPosition)
+            if self._pendingWheelZoom != 1.0:
+                self.scheduleCameraUpdate()
+
+    # Applies all collected camera input at once, including the remaining mouse wheel zoom.
+    def flushCameraInput(self) -> None:
+        self.applyCameraInput()
+        if self._pendingWheelZoom != 1.0:
+            factor, self._pendingWheelZoom = self._pendingWheelZoom, 1.0
+            self.zoomAround(factor, self._wheelZoomPosition)
+        self._cameraTimer.stop()
+
+    # Scales the view, keeping the scene point under the supplied viewport position in place.
+    def zoomAround(self, factor: float, viewportPosition: QtCore.QPointF) -> None:
+        self.setTransformationAnchor(QtWidgets.QGraphicsView.NoAnchor)
+        scenePosition = self.viewportTransform().inverted()[0].map(viewportPosition)
+        self.scale(factor, factor)
+        delta = self.viewportTransform().map(scenePosition) - viewportPosition
+        self.horizontalScrollBar().setValue(self.horizontalScrollBar().value() + round(delta.x()))
+        self.verticalScrollBar().setValue(self.verticalScrollBar().value() + round(delta.y()))
+        self.zoomStep()
+
+    # Called once a zoom gesture has settled, repaints so the items get rasterized at the new scale.
+    def zoomSettled(self) -> None:
+        self.viewport().update()
+
+    # Overwritten background drawing method, please refer to the QT documentation.
+    def drawBackground(self, painter: QtGui.QPainter, rect: QtCore.QRectF) -> None:
+        super().drawBackground(painter, rect)
+        if isinstance(self.scene(), InariScene) and self.scene().atlasRenderingEnabled:
+            self.drawAtlasItems(painter, rect)
+        else:
+            self._atlas = None
+
+    # Overwritten paint event handler, please refer to the QT documentation.
+    def paintEvent(self, event: QtGui.QPaintEvent) -> None:
+        if isinstance(self.scene(), InariScene):
+            levelOfDetail = QtWidgets.QStyleOptionGraphicsItem.levelOfDetailFromTransform(self.transform())
+            self.scene().setOverviewZoom(levelOfDetail < InariItem.overviewLevelOfDetail)
+        if self.inariStatistics == None or not self.inariStatistics.enabled:
+            super().paintEvent(event)
+            return
+        self.inariStatistics.beginFrame()
+        super().paintEvent(event)
+        self.inariStatistics.endFrame()
+
+    # Overwritten foreground drawing method, please refer to the QT documentation.
+    def drawForeground(self, painter: QtGui.QPainter, rect: QtCore.QRectF) -> None:
+        super().drawForeground(painter, rect)
+        if self.inariStatistics != None and self.inariStatistics.heatEnabled:
+            self.drawPaintHeat(painter, rect)
+
+    # Draws the paint heat overlay, shading every item intersecting the rect by its paint time.
+    def drawPaintHeat(self, painter: QtGui.QPainter, rect: QtCore.QRectF) -> None:
+        paintTimes = self.inariStatistics.paintTimes
+        items = [(item, paintTimes[item]) for item in self.scene().items(rect, QtCore.Qt.IntersectsItemBoundingRect) if item in paintTimes]
+        if len(items) == 0:
+            return
+        maximumPaintTime = max(paintTime for item, paintTime in items)
+        if maximumPaintTime <= 0:
+            return
+        painter.save()
+        for item, paintTime in items:
+            color = QtGui.QColor(self.heatColor)
+            color.setAlphaF(0.75 * paintTime / maximumPaintTime)
+            painter.fillRect(item.sceneBoundingRect(), color)
+        painter.restore()
+
+    # Draws all InariItems intersecting the rect from the texture atlas, in batches of fragments sharing an atlas page.
+    def drawAtlasItems(self, painter: QtGui.QPainter, rect: QtCore.QRectF) -> None:
+        # Rebuild the atlas at the current scale, but not while zooming; the old one gets scaled until the zoom gesture settles.
+        scale = QtWidgets.QStyleOptionGraphicsItem.levelOfDetailFromTransform(self.transform()) * self.devicePixelRatioF()
+        bucket = InariPixmapCache.bucket(scale)
+        if self._atlas == None or (self._atlas.bucket != bucket and not self.isZooming()):
+            self._atlas = InariTextureAtlas(bucket)
+        bucketScale = InariPixmapCache.bucketScale(self._atlas.bucket)
+
+        painter.save()
+        painter.setRenderHint(QtGui.QPainter.SmoothPixmapTransform)
+        fragments: typing.List[QtGui.QPainter.PixmapFragment] = []
+        fragmentsPage = -1
+        countItems = self.inariStatistics != None and self.inariStatistics.enabled
+        for item in self.scene().items(rect, QtCore.Qt.IntersectsItemBoundingRect, QtCore.Qt.AscendingOrder):
+            if not item.isVisible():
+                continue
+            if countItems:
+                self.inariStatistics.itemPainted(item)
+            if isinstance(item, InariItem) and item.pendingJsonItems != None:
+                item.inariWidget.scheduleExpand(item)
+            rendererKey, renderer = item.currentRenderer()
+            region = self._atlas.region(rendererKey, renderer)
+            sceneTransform = item.sceneTransform()
+            # Fragments can't be sheared or mirrored along a single axis, mirroring along both is a rotation though.
+            mirrored = sceneTransform.m11() < 0 or sceneTransform.m22() < 0
+            if region == None or sceneTransform.isRotating() or (mirrored and not (sceneTransform.m11() < 0 and sceneTransform.m22() < 0)):
+                # Items that can't be drawn as fragments are painted normally, keeping the drawing order intact.
+                if len(fragments) > 0:
+                    InariTextureAtlas.drawFragments(painter, fragments, self._atlas.pages[fragmentsPage])
+                    fragments = []
+                painter.save()
+                painter.setTransform(sceneTransform, True)
+                item.paintRenderer(painter, QtWidgets.QStyleOptionGraphicsItem(), self.viewport(), rendererKey, renderer)
+                painter.restore()
+                continue
+
+            # Flush the batch when the page changes, so the drawing order stays intact.
+            page, sourceRect = region
+            if page != fragmentsPage and len(fragments) > 0:
+                InariTextureAtlas.drawFragments(painter, fragments, self._atlas.pages[fragmentsPage])
+                fragments = []
+            fragmentsPage = page
+
+            # Fragments are positioned by their center and scaled from the atlas raster size.
+            center = sceneTransform.map(item._boundingRect.center())
+            fragments.append(QtGui.QPainter.PixmapFragment.create(center, sourceRect, abs(sceneTransform.m11()) / bucketScale, abs(sceneTransform.m22()) / bucketScale, 180 if mirrored else 0))
+        if len(fragments) > 0:
+            InariTextureAtlas.drawFragments(painter, fragments, self._atlas.pages[fragmentsPage])
+        painter.restore()
+
     # Frames the selected items within the view bounds, or all of them if no items are selected.
     def frameSelected(self):
         # Find the base selection bound.
@@ -196,6 +1349,8 @@ class InariView(QtWidgets.QGraphicsView):
     # Overwritten mouse release event handler, please refer to the QT documentation.
     def mouseReleaseEvent(self, event: QtGui.QMouseEvent) -> None:
         super().mouseReleaseEvent(event)
+        # Apply the camera input still waiting for the next frame, it would be dropped otherwise.
+        self.flushCameraInput()
         # Set default cursor; the cursor might have been changed in the when the mouse was pressed.
         self.window().setCursor(QtCore.Qt.ArrowCursor)
 
@@ -209,94 +1364,435 @@ class InariView(QtWidgets.QGraphicsView):
         if self._lastRightMousePressPosition == None:
             self._lastRightMousePressPosition = event.pos()
 
-        # Camera transformation logic.
+        # Camera transformation logic, the input is collected and applied once per display frame.
         if bool(QtWidgets.QApplication.queryKeyboardModifiers() & QtCore.Qt.KeyboardModifier.AltModifier):
             if bool((event.buttons() & QtCore.Qt.MiddleButton) or (event.buttons() & QtCore.Qt.LeftButton)):
                 # Camera panning.
-                verticalScrollBar = self.verticalScrollBar()
-                horizontalScrollBar = self.horizontalScrollBar()
-                delta = event.pos() - self._lastMouseMovePosition
-                verticalScrollBar.setValue(verticalScrollBar.value() - delta.y())
-                horizontalScrollBar.setValue(horizontalScrollBar.value() - delta.x())
+                self._pendingPan += event.pos() - self._lastMouseMovePosition
+                self.scheduleCameraUpdate()
             elif bool(event.buttons() & QtCore.Qt.RightButton):
-                """ 
-                Camera zooming; this is some freaking messy math, don't judge; it works pretty well! xD
-                There is most likely a cleaner way of doing this but i honestly can't bother finding it.
-                If this is triggering to you, feel free to hit me with a pull request.
-                """
-                self.setTransformationAnchor(QtWidgets.QGraphicsView.NoAnchor)
-                # TODO: Make zooming slower when distanceToOrigin increases
-                # Capture data for correcting view translation offset.
-                oldSceneSpaceOriginPoint = self.mapToScene(self._lastRightMousePressPosition)
-                ### Calculate scaleing factor
-                cursorPoint = QtGui.QVector2D(event.pos())
-                originPoint = QtGui.QVector2D(self._lastRightMousePressPosition)
-                orientationPoint = originPoint + QtGui.QVector2D(1, 1)
-                orientationVector = orientationPoint - originPoint
-                cursorVector = orientationPoint - cursorPoint
-                # Introduce a small constant value if the vector length is 0.
-                # This is needed since the vector normalization calulation will cause an error if the vector has a length of 0
-                orientationVector = (orientationVector + QtGui.QVector2D(0.001, 0.001)) if bool(orientationVector.length() == 0) else orientationVector
-                cursorVector = (cursorVector + QtGui.QVector2D(0.001, 0.001)) if bool(cursorVector.length() == 0) else cursorVector
-                orientationUnitVector = orientationVector.normalized() # Normalization calulation
-                cursorUnitVector = cursorVector.normalized() # Normalization calulation
-                dotProduct = QtGui.QVector2D.dotProduct(orientationUnitVector, cursorUnitVector)
-                distanceToOrigin = originPoint.distanceToPoint(cursorPoint)
-                globalScaleFactor = 1 - (dotProduct * distanceToOrigin * 0.0015) # dot * dist * zoomSensitivity
-                ### Create the actial matrix for applying the scale; the initial scaleing factors should be set on mouse putton pressed.
-                finalHorizontalScalingFactor = min(max(self._lastRightMousePressHorizontalScalingFactor * globalScaleFactor, 0.2), 2)
-                finalVerticalScalingFactor = min(max(self._initialRightMousePressVerticalScalingFactor * globalScaleFactor, 0.2), 2)
-                # print(finalHorizontalScalingFactor)
-                # print(finalVerticalScalingFactor) 
-                horizontalScalingFactor = finalHorizontalScalingFactor # FIXME: This should possibly not by multiplying since it wont be linear; i think...
-                verticalScalingFactor = finalVerticalScalingFactor # FIXME: If addition or subtraction is the correct way to go, the globalScaleFactor range need to change.
-                verticalShearingFactor = self.matrix().m12()
-                horizontalShearingFactor = self.matrix().m21()
-                self.setMatrix(QtGui.QMatrix(horizontalScalingFactor, verticalShearingFactor, horizontalShearingFactor, verticalScalingFactor, self.matrix().dx(), self.matrix().dy()))
-                # Correct view translation offset.
-                newSceneSpaceOriginPoint = self.mapToScene(self._lastRightMousePressPosition)
-                translationDelta = newSceneSpaceOriginPoint - oldSceneSpaceOriginPoint;
-                self.translate(translationDelta.x(), translationDelta.y())
+                # Camera zooming.
+                self._pendingDragZoomPosition = event.pos()
+                self.scheduleCameraUpdate()
        
         # Capture necessary data used for camera transformation. 
         self._lastMouseMovePosition = event.pos()
 
+    # Applies right mouse drag zooming for the supplied cursor position, relative to the right mouse press.
+    def applyDragZoom(self, position: QtCore.QPoint) -> None:
+        """ 
+        Camera zooming; this is some freaking messy math, don't judge; it works pretty well! xD
+        There is most likely a cleaner way of doing this but i honestly can't bother finding it.
+        If this is triggering to you, feel free to hit me with a pull request.
+        """
+        self.setTransformationAnchor(QtWidgets.QGraphicsView.NoAnchor)
+        # TODO: Make zooming slower when distanceToOrigin increases
+        # Capture data for correcting view translation offset.
+        oldSceneSpaceOriginPoint = self.mapToScene(self._lastRightMousePressPosition)
+        ### Calculate scaleing factor
+        cursorPoint = QtGui.QVector2D(position)
+        originPoint = QtGui.QVector2D(self._lastRightMousePressPosition)
+        orientationPoint = originPoint + QtGui.QVector2D(1, 1)
+        orientationVector = orientationPoint - originPoint
+        cursorVector = orientationPoint - cursorPoint
+        # Introduce a small constant value if the vector length is 0.
+        # This is needed since the vector normalization calulation will cause an error if the vector has a length of 0
+        orientationVector = (orientationVector + QtGui.QVector2D(0.001, 0.001)) if bool(orientationVector.length() == 0) else orientationVector
+        cursorVector = (cursorVector + QtGui.QVector2D(0.001, 0.001)) if bool(cursorVector.length() == 0) else cursorVector
+        orientationUnitVector = orientationVector.normalized() # Normalization calulation
+        cursorUnitVector = cursorVector.normalized() # Normalization calulation
+        dotProduct = QtGui.QVector2D.dotProduct(orientationUnitVector, cursorUnitVector)
+        distanceToOrigin = originPoint.distanceToPoint(cursorPoint)
+        globalScaleFactor = 1 - (dotProduct * distanceToOrigin * 0.0015) # dot * dist * zoomSensitivity
+        ### Create the actial matrix for applying the scale; the initial scaleing factors should be set on mouse putton pressed.
+        finalHorizontalScalingFactor = min(max(self._lastRightMousePressHorizontalScalingFactor * globalScaleFactor, 0.2), 2)
+        finalVerticalScalingFactor = min(max(self._initialRightMousePressVerticalScalingFactor * globalScaleFactor, 0.2), 2)
+        # print(finalHorizontalScalingFactor)
+        # print(finalVerticalScalingFactor) 
+        horizontalScalingFactor = finalHorizontalScalingFactor # FIXME: This should possibly not by multiplying since it wont be linear; i think...
+        verticalScalingFactor = finalVerticalScalingFactor # FIXME: If addition or subtraction is the correct way to go, the globalScaleFactor range need to change.
+        verticalShearingFactor = self.matrix().m12()
+        horizontalShearingFactor = self.matrix().m21()
+        self.setMatrix(QtGui.QMatrix(horizontalScalingFactor, verticalShearingFactor, horizontalShearingFactor, verticalScalingFactor, self.matrix().dx(), self.matrix().dy()))
+        # Correct view translation offset.
+        newSceneSpaceOriginPoint = self.mapToScene(self._lastRightMousePressPosition)
+        translationDelta = newSceneSpaceOriginPoint - oldSceneSpaceOriginPoint;
+        self.translate(translationDelta.x(), translationDelta.y())
+        self.zoomStep()
+
     # Overwritten wheel event handler, please refer to the QT documentation.
     def wheelEvent(self, event: QtGui.QWheelEvent) -> None:
         # Accepting the event stops it from propagating, canceling the default scroll behaviour.
         event.accept()
 
-        # Mouse wheel zooming
-        zoomFactor = 1.05
-        self.setTransformationAnchor(QtWidgets.QGraphicsView.AnchorUnderMouse)
+        # Mouse wheel zooming, the steps are accumulated and eased towards over the following frames.
         # Add angleDelta() x and y to get propper mouse wheel delta.
         if event.angleDelta().y() + event.angleDelta().x() > 0:
-            self.scale(zoomFactor, zoomFactor)
+            self._pendingWheelZoom *= self.wheelZoomFactor
         else:
-            self.scale(1 / zoomFactor, 1 / zoomFactor)
+            self._pendingWheelZoom /= self.wheelZoomFactor
+        # posF(), as position() needs Qt 5.14.
+        self._wheelZoomPosition = event.posF()
+        self.scheduleCameraUpdate()
+
+"""
+InariCompiledScene is a compact binary form of a json scene file, read through a memory map on load so no per-key parsing is needed.
+The items are stored flat in depth first order as array-packed integer and float records, with an interned string
+table for the type names, image paths and item names, and parent, first child and next sibling indices for the hierarchy.
+Items are exposed as InariCompiledElement views, which behave like the json objects the deserializer expects.
+The records are copied out of the mapping in one go and the mapping is closed, so elements kept as pending sub-items don't keep the
+file mapped, which would make replacing it on recompile fail on Windows.
+"""
+class InariCompiledScene():
+    # File extension of compiled scene files, they are stored next to the json file they were compiled from.
+    extension: str = ".inaric"
+    # File identification, format version and byte order marker, files written on a machine with a different byte order are rejected.
+    magic: bytes = b"INARISC\0"
+    version: int = 1
+    byteOrderMarker: int = 0x01020304
+    # Header layout: magic, version, byte order marker, item count, string count.
+    headerFormat: str = "=8sIIII"
+    # Keys stored in the string table, in the order of their integer record slots.
+    stringFields: typing.Tuple[str, ...] = ("type", "imagePath", "hoverImagePath", "itemName")
+    # Keys stored as floats, in the order of their float record slots.
+    floatFields: typing.Tuple[str, ...] = ("positionX", "positionY", "scaleX", "scaleY")
+    # Integer record layout: one slot per string field followed by the present field flags and the hierarchy indices.
+    flagsSlot: int = 4
+    parentSlot: int = 5
+    firstChildSlot: int = 6
+    nextSiblingSlot: int = 7
+    integerRecordSize: int = 8
+    floatRecordSize: int = 4
+
+    # Constructor, use InariCompiledScene.open() to load a compiled scene file.
+    # Nothing references the buffer afterwards, so it can be closed.
+    def __init__(self, path: str, buffer: mmap.mmap) -> None:
+        self.path = path
+        headerSize = struct.calcsize(self.headerFormat)
+        _, _, _, self.itemCount, stringCount = struct.unpack_from(self.headerFormat, buffer)
+
+        # String table.
+        offset = headerSize
+        offsets = array.array("I", buffer[offset:offset + (stringCount + 1) * 4])
+        offset += (stringCount + 1) * 4
+        self.strings = [sys.intern(buffer[offset + offsets[i]:offset + offsets[i + 1]].decode("utf-8")) for i in range(stringCount)]
+        offset = self.align(offset + offsets[stringCount])
+
+        # Item records.
+        integerSize = self.itemCount * self.integerRecordSize * 4
+        self.integers = array.array("i", buffer[offset:offset + integerSize])
+        offset += integerSize
+        self.floats = array.array("d", buffer[offset:offset + self.itemCount * self.floatRecordSize * 8])
+
+    # Returns the path of the compiled scene file belonging to a json scene file.
+    @classmethod
+    def compiledPath(cls, jsonPath: str) -> str:
+        return os.path.splitext(jsonPath)[0] + cls.extension
+
+    # Returns true if the compiled scene file belonging to a json scene file exists and is newer than it.
+    @classmethod
+    def isUpToDate(cls, jsonPath: str) -> bool:
+        try:
+            return os.stat(cls.compiledPath(jsonPath)).st_mtime_ns >= os.stat(jsonPath).st_mtime_ns
+        except OSError:
+            return False
+
+    # Returns the offset rounded up to the 8 byte alignment of the float records.
+    @staticmethod
+    def align(offset: int) -> int:
+        return (offset + 7) & ~7
+
+    # Compiles a json scene file, returns the path of the compiled scene file or None if it couldn't be compiled.
+    @classmethod
+    def compile(cls, jsonPath: str, compiledPath: str = None) -> typing.Optional[str]:
+        compiledPath = compiledPath or cls.compiledPath(jsonPath)
+        try:
+            with open(jsonPath, "r") as file:
+                projectObject = json.loads(file.read())
+        except (IOError, ValueError):
+            print(f'Failed to read file from path: {jsonPath}')
+            return None
+
+        strings: typing.Dict[str, int] = {}
+        integers = array.array("i")
+        floats = array.array("d")
+
+        # Flatten the items depth first, linking every item to its parent, first child and next sibling.
+        def flatten(jsonItems: typing.List[dict], parentIndex: int) -> None:
+            previousIndex = -1
+            for jsonItem in jsonItems:
+                index = len(integers) // cls.integerRecordSize
+                record = [-1] * cls.integerRecordSize
+                values = [0.0] * cls.floatRecordSize
+                flags = 0
+                for slot, key in enumerate(cls.stringFields):
+                    if key in jsonItem:
+                        flags |= 1 << slot
+                        record[slot] = strings.setdefault(str(jsonItem[key]), len(strings))
+                for slot, key in enumerate(cls.floatFields):
+                    if key in jsonItem:
+                        flags |= 1 << (len(cls.stringFields) + slot)
+                        values[slot] = float(jsonItem[key])
+                record[cls.flagsSlot] = flags
+                record[cls.parentSlot] = parentIndex
+                integers.extend(record)
+                floats.extend(values)
+
+                if previousIndex >= 0:
+                    integers[previousIndex * cls.integerRecordSize + cls.nextSiblingSlot] = index
+                elif parentIndex >= 0:
+                    integers[parentIndex * cls.integerRecordSize + cls.firstChildSlot] = index
+                previousIndex = index
+                flatten(jsonItem.get("items", []), index)
+        flatten(projectObject.get("items", []), -1)
+
+        # Encode the string table.
+        encodedStrings = [string.encode("utf-8") for string in strings]
+        offsets = array.array("I", [0])
+        for encodedString in encodedStrings:
+            offsets.append(offsets[-1] + len(encodedString))
+
+        # Write to a temporary file first, so a failed compile never leaves a broken compiled scene file behind.
+        header = struct.pack(cls.headerFormat, cls.magic, cls.version, cls.byteOrderMarker, len(integers) // cls.integerRecordSize, len(encodedStrings))
+        body = header + offsets.tobytes() + b"".join(encodedStrings)
+        body += b"\0" * (cls.align(len(body)) - len(body))
+        temporaryPath = compiledPath + ".tmp"
+        try:
+            with open(temporaryPath, "wb") as file:
+                file.write(body)
+                file.write(integers.tobytes())
+                file.write(floats.tobytes())
+            os.replace(temporaryPath, compiledPath)
+        except OSError:
+            print(f'Failed to write compiled scene to path: {compiledPath}')
+            return None
+        return compiledPath
+
+    # Reads a compiled scene file through a memory map, returns None if the file couldn't be read or isn't a valid compiled scene.
+    # The mapping is closed before returning, on every path.
+    @classmethod
+    def open(cls, path: str) -> typing.Optional["InariCompiledScene"]:
+        try:
+            with open(path, "rb") as file:
+                # The mapping stays valid after the file is closed.
+                buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            print(f'Failed to read compiled scene from path: {path}')
+            return None
+
+        with buffer:
+            headerSize = struct.calcsize(cls.headerFormat)
+            if len(buffer) < headerSize:
+                print(f'Invalid compiled scene: {path}')
+                return None
+            magic, version, byteOrderMarker, _, _ = struct.unpack_from(cls.headerFormat, buffer)
+            if magic != cls.magic or version != cls.version or byteOrderMarker != cls.byteOrderMarker:
+                print(f'Incompatible compiled scene: {path}')
+                return None
+            return cls(path, buffer)
+
+    # Returns the top-level items.
+    def items(self) -> typing.List["InariCompiledElement"]:
+        return self.children(-1)
+
+    # Returns the sub-items of the item at the supplied index, or the top-level items if the index is -1.
+    def children(self, index: int) -> typing.List["InariCompiledElement"]:
+        if index < 0:
+            child = 0 if self.itemCount > 0 else -1
+        else:
+            child = self.integers[index * self.integerRecordSize + self.firstChildSlot]
+        children = []
+        while child >= 0:
+            children.append(InariCompiledElement(self, child))
+            child = self.integers[child * self.integerRecordSize + self.nextSiblingSlot]
+        return children
+
+"""
+InariCompiledElement is a read-only view of a single item in an InariCompiledScene.
+It supports the subset of the dict interface used for json objects: "in", [] and get(), including the "items" key.
+"""
+class InariCompiledElement():
+    __slots__ = ("scene", "index", "flags")
+
+    # Lookup table mapping keys to their flag bit, whether they're stored in the string table, and their record slot.
+    _fields = dict(
+        [(key, (1 << slot, True, slot)) for slot, key in enumerate(InariCompiledScene.stringFields)] +
+        [(key, (1 << (len(InariCompiledScene.stringFields) + slot), False, slot)) for slot, key in enumerate(InariCompiledScene.floatFields)])
+
+    # Constructor.
+    def __init__(self, scene: InariCompiledScene, index: int) -> None:
+        self.scene = scene
+        self.index = index
+        self.flags = scene.integers[index * InariCompiledScene.integerRecordSize + InariCompiledScene.flagsSlot]
+
+    def __contains__(self, key: str) -> bool:
+        if key == "items":
+            return self.scene.integers[self.index * InariCompiledScene.integerRecordSize + InariCompiledScene.firstChildSlot] >= 0
+        field = self._fields.get(key)
+        return field != None and bool(self.flags & field[0])
+
+    def __getitem__(self, key: str) -> typing.Any:
+        if key == "items":
+            return self.scene.children(self.index)
+        field = self._fields.get(key)
+        if field == None or not self.flags & field[0]:
+            raise KeyError(key)
+        if field[1]:
+            return self.scene.strings[self.scene.integers[self.index * InariCompiledScene.integerRecordSize + field[2]]]
+        return self.scene.floats[self.index * InariCompiledScene.floatRecordSize + field[2]]
+
+    def get(self, key: str, default: typing.Any = None) -> typing.Any:
+        if key == "items":
+            return self.scene.children(self.index) if key in self else default
+        field = self._fields.get(key)
+        if field == None or not self.flags & field[0]:
+            return default
+        if field[1]:
+            return self.scene.strings[self.scene.integers[self.index * InariCompiledScene.integerRecordSize + field[2]]]
+        return self.scene.floats[self.index * InariCompiledScene.floatRecordSize + field[2]]
+
+
+"""
+InariSceneLoader builds the items of a scene in time-sliced chunks between event loop iterations, so the host UI stays
+interactive while large pickers load. Items are built breadth first, meaning top-level panels show up first.
+Every item is fully built before it's added, and sub-items only after their parent, so cancelling leaves a consistent partial scene.
+"""
+class InariSceneLoader(QtCore.QObject):
+    # Emitted after every chunk with the number of processed items and the total number of items.
+    progressChanged = QtCore.Signal(int, int)
+    # Emitted once all items have been built.
+    finished = QtCore.Signal()
+    # Emitted if the loading was cancelled, the items built so far remain in the scene.
+    cancelled = QtCore.Signal()
+    # Time budget of a single chunk in milliseconds.
+    sliceDuration: int = 8
+
+    # Constructor.
+    def __init__(self, inariWidget: "InariWidget", jsonItems: typing.List[dict], parent: QtCore.QObject = None) -> None:
+        super().__init__(parent)
+        self.inariWidget = inariWidget
+        self.processedItemCount = 0
+        self.totalItemCount = self.countJsonItems(jsonItems)
+        # Queue of (parent item, json object) pairs waiting to be built.
+        self._queue: typing.Deque[typing.Tuple[typing.Optional[QtWidgets.QGraphicsItem], dict]] = collections.deque((None, jsonItem) for jsonItem in jsonItems)
+        # The assets are parsed on the thread pool, items are only built once they are all done.
+        self._assetPreloader = inariWidget.createAssetPreloader(jsonItems)
+        self._timer = QtCore.QTimer(self)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self.loadChunk)
+
+    # Returns the number of items in a json items list, including all sub-items.
+    @classmethod
+    def countJsonItems(cls, jsonItems: typing.List[dict]) -> int:
+        return sum(1 + cls.countJsonItems(jsonItem.get("items", [])) for jsonItem in jsonItems)
+
+    # Starts loading, the first chunk is built once control returns to the event loop.
+    def start(self) -> None:
+        self.inariWidget.inariScene.beginBulkInsert()
+        self._timer.start()
+
+    # Cancels loading, the items built so far remain in the scene.
+    def cancel(self) -> None:
+        if not self.isRunning():
+            return
+        self._stop()
+        self.cancelled.emit()
+
+    # Returns true while there are items left to build.
+    def isRunning(self) -> bool:
+        return self._timer.isActive()
+
+    # Builds items until the chunk time budget is used up, called by the timer.
+    def loadChunk(self) -> None:
+        # Wait for the asset preloader without blocking the event loop.
+        if not self._assetPreloader.collect():
+            return
+
+        timer = QtCore.QElapsedTimer()
+        timer.start()
+        while len(self._queue) > 0 and timer.elapsed() < self.sliceDuration:
+            parent, jsonItem = self._queue.popleft()
+            item = self.inariWidget.deserializeJsonElement(parent, jsonItem)
+            self.processedItemCount += 1
+            if item != None and self.inariWidget.defersSubItems(parent, jsonItem):
+                # The sub-items are built once the item is first painted or expanded.
+                item.setPendingJsonItems(jsonItem["items"])
+                self.processedItemCount += self.countJsonItems(jsonItem["items"])
+            elif item != None:
+                # Queue the sub-items, they are built once all items above them are.
+                self._queue.extend((item, childJsonItem) for childJsonItem in jsonItem.get("items", []))
+            else:
+                # Sub-items of items that failed to deserialize are skipped.
+                self.processedItemCount += self.countJsonItems(jsonItem.get("items", []))
+
+        # Grow the scene rect, so the items built so far can be navigated.
+        self.inariWidget.inariScene.updateSceneRect()
+        self.progressChanged.emit(self.processedItemCount, self.totalItemCount)
+
+        if len(self._queue) == 0:
+            self._stop()
+            self.finished.emit()
+
+    # Stops the timer and ends the bulk insert.
+    def _stop(self) -> None:
+        self._timer.stop()
+        self._queue.clear()
+        self.inariWidget.inariScene.endBulkInsert()
+        self._assetPreloader.collect()
+        self._assetPreloader.release()
+
 
 """
 InariWidget is the master widget, responsible for creating and managing the InariScene and InariView from a high level.
 """
 class InariWidget(QtWidgets.QWidget):
-    # The InariCommandInterpreter used for interacting with the host application.
-    inariCommandInterpreter:InariCommandInterpreter = InariCommandInterpreter()
+    # The InariCommandInterpreter used for interacting with the host application, wrapping the one provided by the bridge.
+    inariCommandInterpreter:"InariCommandInterpreterProxy" = None
     # Path to the currently opened scene file, used for stuff like reloading and saveing scenes.
     currentScenePath: str = None
+    # The InariSceneLoader building the current scene when opened with openSceneAsync().
+    sceneLoader: "InariSceneLoader" = None
+    # The InariStatistics shown by the statistics panel.
+    inariStatistics: "InariStatistics" = None
+    # Time in milliseconds to wait after the scene file changed before reloading it, editors often write files in several steps.
+    sceneReloadDelay: int = 100
+    # Number of times the reload is retried, sceneReloadDelay apart, while the changed scene file is missing.
+    sceneReloadRetries: int = 20
+    # If true, the sub-items of top-level items are only built once the item is first painted or expanded.
+    lazyInstantiationEnabled: bool = False
+    # If true, the locators follow the positions of their host items, see setLivePoseEnabled().
+    livePoseEnabled: bool = False
+    # The InariAsyncCommandInterpreter host calls are deferred to, see setAsyncHostCallsEnabled().
+    inariAsyncCommandInterpreter: "InariAsyncCommandInterpreter" = None
+    # If true, selection changes and positions are sent to the host by the pump of the InariAsyncCommandInterpreter.
+    asyncHostCallsEnabled: bool = False
+    # The InariPoseLibrary of the current scene.
+    poseLibrary: "InariPoseLibrary" = None
 
     # Constructor.
-    def __init__(self, parent: QtCore.QObject, commandInterpreter:InariCommandInterpreter):
+    # The viewport backend of the InariView can be chosen here, see InariView.setViewportBackend(); None uses the one from the settings.
+    def __init__(self, parent: QtCore.QObject, commandInterpreter:InariCommandInterpreter, viewportBackend: str = None):
         super().__init__(parent)
         
-        # Configure the widget.
-        self.inariCommandInterpreter = commandInterpreter
+        # Configure the widget, the host is talked to through a proxy so host calls can be observed.
+        self.inariCommandInterpreter = InariCommandInterpreterProxy(commandInterpreter)
+        self.inariCommandQueue = InariCommandQueue(self.inariCommandInterpreter, self)
+        self.inariPositionMirror = InariPositionMirror(self.inariCommandInterpreter, self)
+        self.inariPositionMirror.positionsChanged.connect(self.reflectPose)
+        self.inariCommandQueue.setPositionMirror(self.inariPositionMirror)
+        self.inariAsyncCommandInterpreter = InariAsyncCommandInterpreter(self.inariCommandInterpreter, parent=self)
+        self.poseLibrary = InariPoseLibrary()
+        self.inariStatistics = InariStatistics(self.inariCommandInterpreter)
 
         # Create and configure the scene.
         self.inariScene = InariScene(self)
         self.inariScene.setCommandInterpreter(self.inariCommandInterpreter)
+        self.inariScene.setCommandQueue(self.inariCommandQueue)
+        self.inariScene.setPositionMirror(self.inariPositionMirror)
 
         # Create and configure the view.
-        self.inariView = InariView(self.inariScene, self)
+        self.inariView = InariView(self.inariScene, self, viewportBackend)
+        self.inariView.setStatistics(self.inariStatistics)
         self.inariView.move(0, 0)
         self.inariView.show()
 
@@ -305,23 +1801,221 @@ class InariWidget(QtWidgets.QWidget):
         self.toolbarWidget.move(10, 10)
         self.toolbarWidget.show()
 
-    # Sets the active selection from a list of item names.
+        # Create the statistics panel, it's opened with the toolbar terminal button.
+        self.statisticsWidget = InariStatisticsWidget(self, QtCore.Qt.WindowFlags())
+        self.statisticsWidget.move(10, 55)
+        self.statisticsWidget.hide()
+
+        # Create the pose panel, it's opened with the toolbar pose button and placed on the right, next to the statistics panel.
+        self.poseWidget = InariPoseWidget(self, QtCore.Qt.WindowFlags())
+        self.poseWidget.hide()
+
+        # Reload the scene when the scene file changes on disk.
+        self.sceneFileWatcher = QtCore.QFileSystemWatcher(self)
+        self.sceneFileWatcher.fileChanged.connect(self.sceneFileChanged)
+        self._sceneReloadTimer = QtCore.QTimer(self)
+        self._sceneReloadTimer.setSingleShot(True)
+        self._sceneReloadTimer.setInterval(self.sceneReloadDelay)
+        self._sceneReloadTimer.timeout.connect(self.reloadScene)
+        self._sceneReloadRetriesLeft = 0
+
+        # Items painted with pending sub-items are expanded once control returns to the event loop, building items while painting isn't safe.
+        # They are expanded in time-sliced chunks, inside one bulk insert lasting until all scheduled items are built.
+        self._scheduledExpansions: typing.Dict[int, "InariItem"] = {}
+        self._expanding = False
+        self._expansionTimer = QtCore.QTimer(self)
+        self._expansionTimer.setSingleShot(True)
+        self._expansionTimer.setInterval(0)
+        self._expansionTimer.timeout.connect(self.expandScheduledItems)
+
+    # Sets the active selection from a list of item names, only the locators whose selection state differs are changed.
+    # The host is told about the new selection once if notifyHost is true; selections coming from the host shouldn't echo back.
     # TODO: This should most likely be done with command interpreter.
-    def setSelection(self, items:typing.List[str]) -> None:
-        # Clear active selection.
-        self.inariScene.clearSelection()
+    def setSelection(self, items:typing.List[str], notifyHost:bool=False) -> None:
+        # Find the locators to be selected using the item name index, building them first if they are pending.
+        pendingItems = {id(pendingItem): pendingItem for itemName in items for pendingItem in self.inariScene.pendingItems(itemName)}
+        if len(pendingItems) > 0:
+            with self.inariScene.bulkInsert():
+                for pendingItem in pendingItems.values():
+                    pendingItem.expand()
+        selection = set()
+        for itemName in items:
+            selection.update(self.inariScene.locators(itemName))
+        currentSelection = set(item for item in self.inariScene.selectedItems() if isinstance(item, InariLocator))
+
+        # Apply the difference, without the scene pushing every single change to the host.
+        blocked = self.inariScene.blockSignals(True)
+        try:
+            for locator in currentSelection - selection:
+                locator.setSelected(False)
+            for locator in selection - currentSelection:
+                locator.setSelected(True)
+        finally:
+            self.inariScene.blockSignals(blocked)
+
+        if notifyHost:
+            self.inariScene.selectionChangedSignal()
+
+    # Enables or disables atlas rendering, where the view draws all items in batches from texture atlases.
+    def setAtlasRenderingEnabled(self, atlasRenderingEnabled:bool) -> None:
+        self.inariScene.setAtlasRenderingEnabled(atlasRenderingEnabled)
+
+    # Enables or disables lazy instantiation; the sub-items of top-level items are kept as json until the item is first painted or expanded,
+    # so the items and assets of panels that are never looked at are never built. Only applies to scenes opened afterwards.
+    def setLazyInstantiationEnabled(self, lazyInstantiationEnabled: bool) -> None:
+        self.lazyInstantiationEnabled = lazyInstantiationEnabled
+
+    # Enables or disables deferred host calls; selection changes and positions are queued in order and sent to the host by the pump,
+    # a function scheduling a callable on the host main thread like maya.utils.executeDeferred. None keeps the current pump.
+    # Queries that need the host state, like drag start positions missing from the position mirror, execute the queued calls first.
+    def setAsyncHostCallsEnabled(self, asyncHostCallsEnabled: bool, pump: typing.Callable[[typing.Callable[[], None]], typing.Any] = None) -> None:
+        if pump != None:
+            self.inariAsyncCommandInterpreter.setPump(pump)
+        self.asyncHostCallsEnabled = asyncHostCallsEnabled
+        asyncCommandInterpreter = self.inariAsyncCommandInterpreter if asyncHostCallsEnabled else None
+        self.inariCommandQueue.setAsyncCommandInterpreter(asyncCommandInterpreter)
+        self.inariPositionMirror.setAsyncCommandInterpreter(asyncCommandInterpreter)
+        self.inariScene.setAsyncCommandInterpreter(asyncCommandInterpreter)
+        # Calls queued so far are still sent, in order.
+        if not asyncHostCallsEnabled:
+            self.inariAsyncCommandInterpreter.execute()
+
+    # Returns the names of the host items a pose is captured for or applied to: the ones of the selected locators, or all items of the scene.
+    def poseItemNames(self, selectedOnly: bool = False) -> typing.List[str]:
+        if selectedOnly:
+            return list(dict.fromkeys(item.itemName for item in self.inariScene.selectedItems() if isinstance(item, InariLocator)))
+        return list(dict.fromkeys(self.inariScene.itemNames() + self.inariScene.pendingItemNames()))
+
+    # Captures the positions of all or only the selected items as a pose, with at most one bulk host query, and saves the pose library.
+    # Returns false if there were no items to capture.
+    def capturePose(self, name: str, selectedOnly: bool = False) -> bool:
+        itemNames = self.poseItemNames(selectedOnly)
+        if len(itemNames) == 0:
+            return False
+        self.poseLibrary.setPose(name, dict(zip(itemNames, self.inariPositionMirror.positions(itemNames))))
+        self.poseLibrary.save()
+        return True
+
+    # Removes a pose from the pose library and saves it, returns false if there is no pose with the name.
+    def removePose(self, name: str) -> bool:
+        if not self.poseLibrary.removePose(name):
+            return False
+        self.poseLibrary.save()
+        return True
+
+    # Applies a pose, or blends towards it by weight, with one batched host call in one undo step.
+    # If selectedOnly is true, only the selected items of the pose are applied. Returns false if there is no pose with the name.
+    def applyPose(self, name: str, weight: float = 1.0, selectedOnly: bool = False) -> bool:
+        if not self.beginPoseBlend(name, selectedOnly):
+            return False
+        self.setPoseBlendWeight(weight)
+        self.endPoseBlend()
+        return True
+
+    # Starts blending towards a pose, for example while a blend slider is dragged; the whole blend is undone as a single step.
+    # Returns false if there is no pose with the name.
+    def beginPoseBlend(self, name: str, selectedOnly: bool = False) -> bool:
+        pose = self.poseLibrary.pose(name)
+        if pose == None:
+            return False
+        if selectedOnly:
+            selectedItems = set(self.poseItemNames(True))
+            pose = {itemName: position for itemName, position in pose.items() if itemName in selectedItems}
+        self.inariScene.beginPoseBlend(pose)
+        return True
 
-        # Set new selection.
+    # Sets the weight of the active pose blend, 0 keeps the positions the blend started from and 1 applies the pose.
+    def setPoseBlendWeight(self, weight: float) -> None:
+        if self.inariScene.poseBlend != None:
+            self.inariScene.poseBlend.setWeight(weight)
+
+    # Ends the active pose blend, sending the last positions to the host.
+    def endPoseBlend(self) -> None:
+        self.inariScene.endPoseBlend()
+
+    # Enables or disables live pose reflection, where each locator is offset from its scene file position by the local space position of its host item,
+    # so the picker follows the pose during playback. The host positions are refreshed with one bulk query per host frame, and only the locators
+    # whose host items moved are moved and repainted.
+    def setLivePoseEnabled(self, livePoseEnabled: bool) -> None:
+        if livePoseEnabled == self.livePoseEnabled:
+            return
+        self.livePoseEnabled = livePoseEnabled
+        self.inariPositionMirror.setLive(livePoseEnabled)
+        self.inariScene.setLivePoseEnabled(livePoseEnabled)
         for item in self.inariScene.items():
             if isinstance(item, InariLocator):
-                if item.itemName() in items:
-                    item.setSelected(True)
+                self.reflectItemPose(item)
+
+    # Moves the locators of the supplied item names to their reflected positions, connected to the position mirror positionsChanged() signal.
+    def reflectPose(self, itemNames: typing.List[str]) -> None:
+        if not self.livePoseEnabled:
+            return
+        for itemName in itemNames:
+            for locator in self.inariScene.locators(itemName):
+                self.reflectItemPose(locator)
+
+    # Moves a locator to its scene file position offset by the mirrored position of its host item, or back to its scene file position if live
+    # pose reflection is disabled. The offset is the inverse of the drag mapping, 100 scene units per host unit with the y axis flipped.
+    def reflectItemPose(self, locator: "InariLocator") -> None:
+        position = self.inariPositionMirror.position(locator.itemName) if self.livePoseEnabled else None
+        if position == None or locator.restPosition == None:
+            if locator.restPosition != None and locator.pos() != locator.restPosition:
+                locator.setPos(locator.restPosition)
+            return
+        # The offset is in scene space, map it into the coordinates of the parent for mirrored or scaled panels.
+        origin = locator.mapToParent(locator.mapFromScene(QtCore.QPointF(0, 0)))
+        offset = locator.mapToParent(locator.mapFromScene(QtCore.QPointF(position[0] * 100, -position[1] * 100))) - origin
+        reflectedPosition = locator.restPosition + offset
+        if locator.pos() != reflectedPosition:
+            locator.setPos(reflectedPosition)
+
+    # Returns true if the sub-items of a json item are kept as pending json on the item instead of being built.
+    def defersSubItems(self, parent: typing.Optional["InariItem"], jsonItem) -> bool:
+        return self.lazyInstantiationEnabled and parent == None and len(jsonItem.get("items", [])) > 0
+
+    # Schedules building the pending sub-items of an item, called when an item with pending sub-items is painted.
+    def scheduleExpand(self, item: "InariItem") -> None:
+        self._scheduledExpansions[id(item)] = item
+        if not self._expansionTimer.isActive():
+            self._expansionTimer.start()
+
+    # Builds the pending sub-items of the items scheduled with scheduleExpand() until the InariSceneLoader chunk time budget is used up,
+    # called by the expansion timer. Framing a freshly opened scene paints every panel, so they are built over several event loop iterations.
+    def expandScheduledItems(self) -> None:
+        if not self._expanding:
+            self._expanding = True
+            self.inariScene.beginBulkInsert()
+        timer = QtCore.QElapsedTimer()
+        timer.start()
+        while len(self._scheduledExpansions) > 0 and timer.elapsed() < InariSceneLoader.sliceDuration:
+            item = self._scheduledExpansions.pop(next(iter(self._scheduledExpansions)))
+            if item.scene() is self.inariScene:
+                item.expand()
+        if len(self._scheduledExpansions) > 0:
+            self._expansionTimer.start()
+            return
+        self.stopExpanding()
+
+    # Drops the scheduled expansions, and ends the bulk insert of the ones in progress.
+    def stopExpanding(self) -> None:
+        self._expansionTimer.stop()
+        self._scheduledExpansions.clear()
+        if self._expanding:
+            self._expanding = False
+            self.inariScene.endBulkInsert()
 
     # Removes all scene items and resets the scene path.
     def newScene(self):
+        # Stop loading the previous scene, if it's still being loaded.
+        if self.sceneLoader != None:
+            self.sceneLoader.cancel()
+            self.sceneLoader = None
+        self.stopExpanding()
+        self.inariScene.endPoseBlend()
+        self.inariPositionMirror.clear()
         for item in self.inariScene.items():
             self.inariScene.removeItem(item)
-        self.currentScenePath = None
+        self.setCurrentScenePath(None)
 
     # Opens a scene from path, returns true action was successful.
     def openScene(self, path: str) -> bool:
@@ -332,90 +2026,325 @@ class InariWidget(QtWidgets.QWidget):
             return False
 
         # Set new current scene path.
-        self.currentScenePath = path
+        self.setCurrentScenePath(path)
+        self.trackItemPositions()
 
         # If this is reached, everything went as planned!
         return True
 
-    # Deserialize scene file from path, returns true action was successful.
-    def deserializeSceneFromFile(self, filepath: str) -> bool:
+    # Opens a scene from path without blocking, the items are built in time-sliced chunks by the returned InariSceneLoader.
+    # Returns None if the scene file couldn't be read.
+    def openSceneAsync(self, path: str) -> typing.Optional["InariSceneLoader"]:
+        # Create new scene and read the scene file from the supplied path.
+        self.newScene()
+        projectObject = self.readSceneFile(path)
+        if projectObject == None:
+            return None
+
+        # Set new current scene path.
+        self.setCurrentScenePath(path)
+
+        # Start building the items.
+        self.sceneLoader = InariSceneLoader(self, projectObject.get("items", []), self)
+        self.sceneLoader.finished.connect(self.trackItemPositions)
+        self.sceneLoader.start()
+        return self.sceneLoader
+
+    # Mirrors the host positions of all items controlled by the scene, including the ones that haven't been built yet.
+    def trackItemPositions(self) -> None:
+        self.inariPositionMirror.track(self.inariScene.itemNames() + self.inariScene.pendingItemNames())
+
+    # Sets the path of the currently opened scene file, and watches it for changes.
+    def setCurrentScenePath(self, path: typing.Optional[str]) -> None:
+        if len(self.sceneFileWatcher.files()) > 0:
+            self.sceneFileWatcher.removePaths(self.sceneFileWatcher.files())
+        self.currentScenePath = path
+        if path != None and os.path.exists(path):
+            self.sceneFileWatcher.addPath(path)
+        self.poseLibrary = InariPoseLibrary.open(path)
+        if self.poseWidget.isVisible():
+            self.poseWidget.refresh()
+
+    # Connected to the scene file watcher fileChanged() signal, please refer to the QT documentation.
+    def sceneFileChanged(self, path: str) -> None:
+        self._sceneReloadRetriesLeft = self.sceneReloadRetries
+        self._sceneReloadTimer.start()
+
+    # Reloads the current scene from disk, only adding, removing and patching the items that changed.
+    # Items are matched to the json items by their type and item name, or image path for items without one, in order of appearance
+    # among their siblings; the selection and view transform are kept. Returns true if the action was successful.
+    def reloadScene(self) -> bool:
+        self._sceneReloadTimer.stop()
+        if self.currentScenePath == None or (self.sceneLoader != None and self.sceneLoader.isRunning()):
+            return False
+        # Editors saving by deleting and writing the file again make the watcher drop it, so it's watched again once the file is back.
+        if not self.currentScenePath in self.sceneFileWatcher.files():
+            if not os.path.exists(self.currentScenePath):
+                if self._sceneReloadRetriesLeft > 0:
+                    self._sceneReloadRetriesLeft -= 1
+                    self._sceneReloadTimer.start()
+                return False
+            self.sceneFileWatcher.addPath(self.currentScenePath)
+        projectObject = self.readSceneFile(self.currentScenePath)
+        if projectObject == None:
+            return False
+
+        selection = [item.itemName for item in self.inariScene.selectedItems() if isinstance(item, InariLocator)]
+        itemNames = set(self.inariScene.itemNames() + self.inariScene.pendingItemNames())
+        topLevelItems = [item for item in self.inariScene.items(QtCore.Qt.AscendingOrder) if isinstance(item, InariItem) and item.panelItem is item]
+        # Items whose json item didn't change are skipped with their sub-items, unless an asset changed on disk.
+        skipUnchanged = not svgRendererCache.isOutdated()
+        with self.inariScene.bulkInsert():
+            self.reloadJsonElementsList(None, topLevelItems, projectObject.get("items", []), {}, skipUnchanged)
+        self.setSelection(selection)
+        # Only subscribe to the host again if the controlled items changed.
+        if set(self.inariScene.itemNames() + self.inariScene.pendingItemNames()) != itemNames:
+            self.trackItemPositions()
+        return True
+
+    # Returns the identity live items are matched to json items by when reloading.
+    @staticmethod
+    def itemIdentity(item: "InariItem") -> tuple:
+        if isinstance(item, InariLocator):
+            return ("InariLocator", item.itemName)
+        return ("InariItem", item.imagePath)
+
+    # Returns the identity of a json item, see itemIdentity().
+    @staticmethod
+    def jsonItemIdentity(jsonItem) -> tuple:
+        if jsonItem.get("type") == "InariLocator":
+            return ("InariLocator", str(jsonItem.get("itemName")))
+        return (jsonItem.get("type"), str(jsonItem.get("imagePath")))
+
+    # Recursively reloads the sub-items of parent, or the top-level items if parent is None, from a json items list.
+    # rendererKeys caches the svgRendererCache keys of the asset paths checked so far. If skipUnchanged is true, items equal to the json item
+    # they were last loaded from are neither patched nor recursed into.
+    def reloadJsonElementsList(self, parent: typing.Optional["InariItem"], items: typing.List["InariItem"], jsonItems, rendererKeys: typing.Dict[str, tuple], skipUnchanged: bool = False) -> None:
+        # Maps identities to the live items, in stacking order.
+        liveItems: typing.Dict[tuple, typing.List["InariItem"]] = {}
+        for item in items:
+            liveItems.setdefault(self.itemIdentity(item), []).append(item)
+
+        reloadedItems = []
+        for jsonItem in jsonItems:
+            candidates = liveItems.get(self.jsonItemIdentity(jsonItem))
+            if candidates:
+                item = candidates.pop(self.matchCandidate(candidates, jsonItem))
+                if skipUnchanged and jsonItem == item.jsonItem:
+                    reloadedItems.append(item)
+                    continue
+                self.patchItem(item, jsonItem, rendererKeys)
+                if item.pendingJsonItems != None:
+                    # Sub-items that haven't been built yet are simply replaced.
+                    item.setPendingJsonItems(jsonItem.get("items"))
+                else:
+                    self.reloadJsonElementsList(item, list(item.subItems), jsonItem.get("items", []), rendererKeys, skipUnchanged)
+            else:
+                item = self.deserializeJsonElementTree(parent, jsonItem)
+                if item == None:
+                    continue
+            reloadedItems.append(item)
+
+        # Remove the items no longer in the scene file.
+        for candidates in liveItems.values():
+            for item in candidates:
+                if parent != None:
+                    parent.removeSubItem(item)
+                else:
+                    self.inariScene.removeItem(item)
+
+        # Restore the stacking order of the scene file, only if it changed, as restacking is linear in the number of siblings.
+        liveIds, reloadedIds = set(id(item) for item in items), set(id(item) for item in reloadedItems)
+        currentOrder = [item for item in items if id(item) in reloadedIds] + [item for item in reloadedItems if not id(item) in liveIds]
+        if any(current is not reloaded for current, reloaded in zip(currentOrder, reloadedItems)):
+            for index in range(len(reloadedItems) - 2, -1, -1):
+                reloadedItems[index].stackBefore(reloadedItems[index + 1])
+        if parent != None:
+            parent.subItems = reloadedItems
+            parent.invalidateOverview()
+
+    # Returns the index of the live item a json item is matched to, out of the candidates sharing its identity.
+    # Items without an item name, like background panels using the same asset, are told apart by the names of their sub-locators.
+    @staticmethod
+    def matchCandidate(candidates: typing.List["InariItem"], jsonItem) -> int:
+        # Pending items have no sub-items to tell them apart by yet.
+        if len(candidates) > 1 and all(candidate.pendingJsonItems == None for candidate in candidates):
+            jsonItemNames = [str(jsonSubItem.get("itemName")) for jsonSubItem in jsonItem.get("items", []) if jsonSubItem.get("type") == "InariLocator"]
+            for index, candidate in enumerate(candidates):
+                if [subItem.itemName for subItem in candidate.subItems if isinstance(subItem, InariLocator)] == jsonItemNames:
+                    return index
+        return 0
+
+    # Patches the assets and transform of a live item to match a json item, renderers are only re-acquired for changed assets.
+    def patchItem(self, item: "InariItem", jsonItem, rendererKeys: typing.Dict[str, tuple]) -> None:
+        imagePath = str(jsonItem.get("imagePath"))
+        if InariItem.isRendererOutdated(item.rendererKey, item.imagePath, imagePath, rendererKeys):
+            item.setImagePath(imagePath)
+        if isinstance(item, InariLocator):
+            hoverImagePath = str(jsonItem.get("hoverImagePath"))
+            if InariItem.isRendererOutdated(item.activeRendererKey, item.hoverImagePath, hoverImagePath, rendererKeys):
+                item.setHoverImagePath(hoverImagePath)
+        self.deserializeItemTransform(item, jsonItem)
+        item.jsonItem = jsonItem
+        if self.livePoseEnabled and isinstance(item, InariLocator):
+            self.reflectItemPose(item)
+
+    # Reads and parses a scene file from path, returns None if the file couldn't be read.
+    # If a compiled scene file newer than the json file exists, the compiled one is read instead.
+    @staticmethod
+    def readSceneFile(filepath: str) -> typing.Optional[dict]:
         # Validate filepath
         if filepath == None:
-            return False
+            return None
 
         if not type(filepath) == str:
             print(f'The "filepath" argument must be of type string. Received type: {type(filepath)}.')
-            return False
+            return None
+
+        if filepath.endswith(InariCompiledScene.extension) or (filepath.endswith('.json') and InariCompiledScene.isUpToDate(filepath)):
+            compiledPath = filepath if filepath.endswith(InariCompiledScene.extension) else InariCompiledScene.compiledPath(filepath)
+            compiledScene = InariCompiledScene.open(compiledPath)
+            if compiledScene != None:
+                return {"items": compiledScene.items()}
+            if filepath == compiledPath:
+                return None
 
         if not filepath.endswith('.json'):
             print("Unknown file extension.")
-            return False
+            return None
 
-        # Deserialize items
+        # Parse the file.
         try:
             with open(filepath, "r") as file:
-                projectObject = json.loads(file.read())
-                if "items" in projectObject:
-                    # Recursively deserialize items.
-                    self.deserializeJsonElementsList(None, projectObject["items"])
+                return json.loads(file.read())
         except IOError:
             print(f'Failed to read file from path: {filepath}')
+            return None
+
+    # Deserialize scene file from path, returns true action was successful.
+    def deserializeSceneFromFile(self, filepath: str) -> bool:
+        projectObject = self.readSceneFile(filepath)
+        if projectObject == None:
             return False
 
+        # Deserialize items
+        if "items" in projectObject:
+            # Parse and rasterize the assets on the thread pool first.
+            assetPreloader = self.createAssetPreloader(projectObject["items"])
+            assetPreloader.collect(block=True)
+
+            # Recursively deserialize items, the scene index and rect are only recalculated once at the end.
+            with self.inariScene.bulkInsert():
+                self.deserializeJsonElementsList(None, projectObject["items"])
+            assetPreloader.release()
+
+            # A scene with items that loads none failed to load.
+            if len(projectObject["items"]) > 0 and len(self.inariScene.items()) == 0:
+                print(f'No items of the scene could be loaded: {filepath}')
+                return False
+
         # If this is reached, everything went as planned!
         return True
 
+    # Creates an InariAssetPreloader and starts loading all assets referenced by a json items list.
+    # The assets are rasterized at the current view scale, as that's what they will be painted at first.
+    def createAssetPreloader(self, jsonItems: typing.List[dict]) -> "InariAssetPreloader":
+        scale = QtWidgets.QStyleOptionGraphicsItem.levelOfDetailFromTransform(self.inariView.transform()) * self.inariView.devicePixelRatioF()
+        # Images may have been baked since the last scene was opened.
+        bakedRasterCache.refresh()
+        assetPreloader = InariAssetPreloader(scale)
+        assetPreloader.start(InariAssetPreloader.collectImagePaths(jsonItems, not self.lazyInstantiationEnabled))
+        return assetPreloader
+
     # Recursively deserialize items from a json object.
     def deserializeJsonElementsList(self, parent:QtWidgets.QGraphicsItem, jsonItems):
         for jsonItem in jsonItems:
-                item = None
-
-                # Deserialize type specific item properties.
-                if "type" in jsonItem:
-                    if jsonItem["type"] == "InariItem":
-                        if "imagePath" in jsonItem:
-                            item = InariItem(self, str(jsonItem["imagePath"]))
-                    elif jsonItem["type"] == "InariLocator":
-                        item = InariLocator(self, str(jsonItem["imagePath"]), str(jsonItem["hoverImagePath"]))
-                        item.setItemName(str(jsonItem["itemName"]))
-                    else:
-                        print(f'Unknown item type: {jsonItem["type"]}')
-                        continue
-                else:
-                    print(f'All items need a "type" field')
-                    continue 
-                    
-                # Deserialize generic item properties.
-                if jsonItem != None:
-                    # Set command interpreter reference.
-                    item.setCommandInterpreter(self.inariCommandInterpreter)
-
-                    # Set item position.
-                    if "positionX" in jsonItem:
-                        item.setX(float(jsonItem["positionX"]))
-                    if "positionY" in jsonItem:
-                        item.setY(float(jsonItem["positionY"]))
-
-                    # Set item scale.
-                    if "scaleX" in jsonItem:
-                        if float(jsonItem["scaleX"]) < 0:
-                            item.setX(item.x() + (item.boundingRect().width() * abs(float(jsonItem["scaleX"]))))
-                        item.setTransform(item.transform().scale(float(jsonItem["scaleX"]), 1))
-                    if "scaleY" in jsonItem:
-                        if float(jsonItem["scaleY"]) < 0:
-                            item.setY(item.y() + (item.boundingRect().height() * abs(float(jsonItem["scaleY"]))))
-                        item.setTransform(item.transform().scale(1, float(jsonItem["scaleY"])))
-
-                    # Add item to scene.
-                    if parent != None:
-                        # setParentItem will add the item to the scene automatically.
-                        item.setParentItem(parent)
-                    else:
-                        self.inariScene.addItem(item)
-
-                    # Deserialize sub-items.
-                    if "items" in jsonItem:
-                        self.deserializeJsonElementsList(item, jsonItem["items"])
+            self.deserializeJsonElementTree(parent, jsonItem)
+
+    # Deserialize a single item from a json object including its sub-items, returns None if the item couldn't be deserialized.
+    # With lazy instantiation enabled, the sub-items of top-level items are kept as pending json instead.
+    def deserializeJsonElementTree(self, parent:QtWidgets.QGraphicsItem, jsonItem) -> typing.Optional["InariItem"]:
+        item = self.deserializeJsonElement(parent, jsonItem)
+
+        # Deserialize sub-items.
+        if item != None and self.defersSubItems(parent, jsonItem):
+            item.setPendingJsonItems(jsonItem["items"])
+        elif item != None and "items" in jsonItem:
+            self.deserializeJsonElementsList(item, jsonItem["items"])
+        return item
+
+    # Deserialize a single item from a json object and add it to the parent or scene, sub-items are not deserialized.
+    # Returns None if the item couldn't be deserialized.
+    def deserializeJsonElement(self, parent:"InariItem", jsonItem) -> typing.Optional["InariItem"]:
+        item = None
+
+        # Deserialize type specific item properties.
+        itemType = jsonItem.get("type")
+        if itemType == "InariItem":
+            imagePath = jsonItem.get("imagePath")
+            if imagePath == None:
+                return None
+            item = InariItem(self, str(imagePath))
+        elif itemType == "InariLocator":
+            item = InariLocator(self, str(jsonItem["imagePath"]), str(jsonItem["hoverImagePath"]))
+            item.setItemName(str(jsonItem["itemName"]))
+        elif itemType != None:
+            print(f'Unknown item type: {itemType}')
+            return None
+        else:
+            print(f'All items need a "type" field')
+            return None
+
+        # Deserialize generic item properties.
+        # Set command interpreter reference.
+        item.setCommandInterpreter(self.inariCommandInterpreter)
+        self.deserializeItemTransform(item, jsonItem)
+        item.jsonItem = jsonItem
+
+        # Add item to scene.
+        if parent != None:
+            # addSubItem will add the item to the scene automatically.
+            parent.addSubItem(item)
+        else:
+            self.inariScene.addItem(item)
+
+        # Exceptions raised by item change handlers are swallowed by Qt and leave the item outside the scene, so don't treat it as built.
+        if item.scene() is not self.inariScene:
+            print(f'Failed to add item to the scene: {jsonItem.get("itemName", jsonItem.get("imagePath"))}')
+            return None
+
+        # Items built while live pose reflection is enabled start out in the current pose.
+        if self.livePoseEnabled and isinstance(item, InariLocator):
+            self.reflectItemPose(item)
+
+        return item
+
+    # Deserialize the position and scale of an item from a json object, replacing its current position and transform.
+    def deserializeItemTransform(self, item:QtWidgets.QGraphicsItem, jsonItem) -> None:
+        positionX = jsonItem.get("positionX")
+        positionY = jsonItem.get("positionY")
+        scaleX = jsonItem.get("scaleX")
+        scaleY = jsonItem.get("scaleY")
+
+        # Item position.
+        x = float(positionX) if positionX != None else 0.0
+        y = float(positionY) if positionY != None else 0.0
+
+        # Item scale, negative scales mirror the item in place.
+        transform = QtGui.QTransform()
+        if scaleX != None:
+            if float(scaleX) < 0:
+                x += item.boundingRect().width() * abs(float(scaleX))
+            transform.scale(float(scaleX), 1)
+        if scaleY != None:
+            if float(scaleY) < 0:
+                y += item.boundingRect().height() * abs(float(scaleY))
+            transform.scale(1, float(scaleY))
+
+        item.setPos(x, y)
+        item.setTransform(transform)
+        if isinstance(item, InariLocator):
+            item.restPosition = QtCore.QPointF(x, y)
 
     # Overwritten key press event handler, please refer to the QT documentation.
     def keyPressEvent(self, event: QtGui.QKeyEvent) -> None:
@@ -423,8 +2352,7 @@ class InariWidget(QtWidgets.QWidget):
 
         # F5 to reload the scene.
         if (event.key() == QtCore.Qt.Key_F5):
-            self.clearScene()
-            self.deserializeSceneFromFile(self.currentScenePath)
+            self.reloadScene()
 
     # Overwritten resize event handler, please refer to the QT documentation.
     def resizeEvent(self, event: QtGui.QResizeEvent) -> None:
@@ -433,6 +2361,7 @@ class InariWidget(QtWidgets.QWidget):
         # Propagate resize to view and toolbar. this should ideally be done with QT layouts.
         self.inariView.resize(self.size().width(), self.size().height())
         self.toolbarWidget.resize(self.size().width()-20, 35)
+        self.poseWidget.move(self.size().width()-self.poseWidget.width()-10, 55)
 
 # endregion
 
@@ -524,21 +2453,36 @@ class InariToolbarWidget(QtWidgets.QWidget):
         # Terminal Button
         self.terminalButton = InariToolbarPushButton(self, "./resources/graphics/Button_Terminal.svg", "./resources/graphics/Button_Terminal_Hover.svg")
         self.terminalButton.resize(self.buttonSize)
+        self.terminalButton.clicked.connect(self.terminalButtonPressed)
+
+        # Pose Button
+        self.poseButton = InariToolbarPushButton(self, "./resources/graphics/Button_Pose.svg", "./resources/graphics/Button_Pose_Hover.svg")
+        self.poseButton.resize(self.buttonSize)
+        self.poseButton.clicked.connect(self.poseButtonPressed)
 
     # Method connected to the new buttons clicked signal, please refer to the QT documentation.
     def newButtonPressed(self):
         self.inariWidget.newScene()
 
+    # Method connected to the terminal button clicked signal, toggles the statistics panel.
+    def terminalButtonPressed(self):
+        self.inariWidget.statisticsWidget.setVisible(not self.inariWidget.statisticsWidget.isVisible())
+
+    # Method connected to the pose button clicked signal, toggles the pose panel.
+    def poseButtonPressed(self):
+        self.inariWidget.poseWidget.setVisible(not self.inariWidget.poseWidget.isVisible())
+
     # Method connected to the open button clicked signal, please refer to the QT documentation.
     def openButtonPressed(self):
         # Open a file dialog to let the user select the scene to be opened.
         path = QtWidgets.QFileDialog.getOpenFileName(self)[0]
 
-        # Open the scene from path.
-        self.inariWidget.openScene(path)
+        # Open the scene from path, the items are built while the picker stays interactive.
+        sceneLoader = self.inariWidget.openSceneAsync(path)
 
-        # Frame the content of the newly opened scene.
-        self.inariWidget.inariView.frameSelected()
+        # Frame the content of the newly opened scene once it's loaded.
+        if sceneLoader != None:
+            sceneLoader.finished.connect(self.inariWidget.inariView.frameSelected)
 
     # Overwritten paint event handler, please refer to the QT documentation.
     def paintEvent(self, event: QtGui.QPaintEvent) -> None:
@@ -573,8 +2517,924 @@ class InariToolbarWidget(QtWidgets.QWidget):
         self.saveButton.move(self.size().width()-(self.buttonSize.width()*3)-(self.buttonMargin*3), self.buttonMargin)
         self.newButton.move(self.size().width()-(self.buttonSize.width()*4)-(self.buttonMargin*4), self.buttonMargin)
         self.terminalButton.move(self.size().width()-(self.buttonSize.width()*5)-(self.buttonMargin*5), self.buttonMargin)
+        self.poseButton.move(self.size().width()-(self.buttonSize.width()*6)-(self.buttonMargin*6), self.buttonMargin)
+
+"""
+InariPoseWidget is the pose library panel opened with the toolbar pose button.
+Poses are captured from all or only the selected items, and applied at once or blended towards with the slider, the whole slider drag
+being a single undo step. Poses store the local translation of the items, the only transform the InariCommandInterpreter exposes.
+"""
+class InariPoseWidget(QtWidgets.QWidget):
+    # A reference to the owning InariWidget.
+    inariWidget: "InariWidget" = None
+    # Width of the panel in pixels.
+    panelWidth: int = 280
+    # Number of blend slider steps between the current positions and the pose.
+    blendSteps: int = 100
+
+    # Constructor.
+    def __init__(self, inariWidget: "InariWidget", f: QtCore.Qt.WindowFlags = None) -> None:
+        super().__init__(parent=inariWidget, f=f)
+        self.inariWidget = inariWidget
+        font = QtGui.QFont('Consolas', 9)
+        font.setStyleHint(QtGui.QFont.Monospace)
+        self.setFont(font)
+        self.setStyleSheet(
+            "QWidget { color: rgb(156, 156, 156); }"
+            "QListWidget, QLineEdit, QPushButton { background-color: rgb(43, 43, 43); border: none; padding: 3px; }"
+            "QPushButton:hover { color: rgb(190, 190, 190); }"
+            "QPushButton:disabled { color: rgb(90, 90, 90); }"
+        )
+        self.resize(self.panelWidth, 300)
+
+        # Pose list, the selected pose is the one applied, blended or removed.
+        self.poseList = QtWidgets.QListWidget(self)
+        self.poseList.currentItemChanged.connect(self.updateButtons)
+
+        # Capture controls, the name defaults to the one of the selected pose so it can be recaptured.
+        self.nameEdit = QtWidgets.QLineEdit(self)
+        self.nameEdit.setPlaceholderText("Pose name")
+        self.captureAllButton = QtWidgets.QPushButton("Capture all", self)
+        self.captureAllButton.clicked.connect(lambda: self.capture(False))
+        self.captureSelectedButton = QtWidgets.QPushButton("Capture selected", self)
+        self.captureSelectedButton.clicked.connect(lambda: self.capture(True))
+
+        # Apply controls.
+        self.selectedOnlyCheckBox = QtWidgets.QCheckBox("Selected items only", self)
+        self.applyButton = QtWidgets.QPushButton("Apply", self)
+        self.applyButton.clicked.connect(self.applyButtonPressed)
+        self.removeButton = QtWidgets.QPushButton("Remove", self)
+        self.removeButton.clicked.connect(self.removeButtonPressed)
+
+        # Blend slider, blending starts when it's pressed and snaps back once released.
+        # Clicking the groove would jump without a press, so only dragging the handle blends.
+        self.blendSlider = QtWidgets.QSlider(QtCore.Qt.Horizontal, self)
+        self.blendSlider.setRange(0, self.blendSteps)
+        self.blendSlider.setPageStep(0)
+        self.blendSlider.setFocusPolicy(QtCore.Qt.NoFocus)
+        self.blendSlider.sliderPressed.connect(self.blendSliderPressed)
+        self.blendSlider.sliderMoved.connect(self.blendSliderMoved)
+        self.blendSlider.sliderReleased.connect(self.blendSliderReleased)
+
+        # Layout the panel.
+        captureLayout = QtWidgets.QHBoxLayout()
+        captureLayout.addWidget(self.captureAllButton)
+        captureLayout.addWidget(self.captureSelectedButton)
+        applyLayout = QtWidgets.QHBoxLayout()
+        applyLayout.addWidget(self.applyButton)
+        applyLayout.addWidget(self.removeButton)
+        blendLayout = QtWidgets.QHBoxLayout()
+        blendLayout.addWidget(QtWidgets.QLabel("Blend", self))
+        blendLayout.addWidget(self.blendSlider)
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.setContentsMargins(10, 10, 10, 10)
+        layout.addWidget(self.poseList)
+        layout.addWidget(self.nameEdit)
+        layout.addLayout(captureLayout)
+        layout.addWidget(self.selectedOnlyCheckBox)
+        layout.addLayout(applyLayout)
+        layout.addLayout(blendLayout)
+        self.updateButtons()
+
+    # Returns the name of the pose selected in the list, or None.
+    def currentPoseName(self) -> typing.Optional[str]:
+        item = self.poseList.currentItem()
+        # Compared by identity, older PySide2 versions don't implement != for QListWidgetItem.
+        return item.text() if item is not None else None
+
+    # Fills the pose list from the pose library of the InariWidget, keeping the selected pose if it still exists.
+    def refresh(self) -> None:
+        currentPoseName = self.currentPoseName()
+        self.poseList.clear()
+        for name in self.inariWidget.poseLibrary.poseNames():
+            self.poseList.addItem(name)
+        matches = self.poseList.findItems(currentPoseName, QtCore.Qt.MatchExactly) if currentPoseName != None else []
+        if len(matches) > 0:
+            self.poseList.setCurrentItem(matches[0])
+        self.updateButtons()
+
+    # Enables the buttons acting on the selected pose only while one is selected.
+    def updateButtons(self, *args) -> None:
+        hasPose = self.currentPoseName() != None
+        self.applyButton.setEnabled(hasPose)
+        self.removeButton.setEnabled(hasPose)
+        self.blendSlider.setEnabled(hasPose)
+        if hasPose:
+            self.nameEdit.setText(self.currentPoseName())
+
+    # Captures all or only the selected items as a pose named after the name field, or numbered if it's empty.
+    def capture(self, selectedOnly: bool) -> None:
+        name = self.nameEdit.text().strip()
+        if len(name) == 0:
+            poseNames = self.inariWidget.poseLibrary.poseNames()
+            index = len(poseNames) + 1
+            while f'Pose {index}' in poseNames:
+                index += 1
+            name = f'Pose {index}'
+        if not self.inariWidget.capturePose(name, selectedOnly):
+            print(f'No items to capture the pose {name} from.')
+            return
+        self.refresh()
+        self.poseList.setCurrentItem(self.poseList.findItems(name, QtCore.Qt.MatchExactly)[0])
+
+    # Method connected to the apply button clicked signal, please refer to the QT documentation.
+    def applyButtonPressed(self) -> None:
+        self.inariWidget.applyPose(self.currentPoseName(), selectedOnly=self.selectedOnlyCheckBox.isChecked())
+
+    # Method connected to the remove button clicked signal, please refer to the QT documentation.
+    def removeButtonPressed(self) -> None:
+        self.inariWidget.removePose(self.currentPoseName())
+        self.nameEdit.clear()
+        self.refresh()
+
+    # Method connected to the blend slider pressed signal, starts blending from the current positions.
+    def blendSliderPressed(self) -> None:
+        self.inariWidget.beginPoseBlend(self.currentPoseName(), self.selectedOnlyCheckBox.isChecked())
+
+    # Method connected to the blend slider moved signal, please refer to the QT documentation.
+    def blendSliderMoved(self, value: int) -> None:
+        self.inariWidget.setPoseBlendWeight(value / self.blendSteps)
+
+    # Method connected to the blend slider released signal, ends the blend and snaps the slider back for the next one.
+    def blendSliderReleased(self) -> None:
+        self.inariWidget.endPoseBlend()
+        self.blendSlider.setValue(0)
+
+    # Overwritten show event handler, please refer to the QT documentation.
+    def showEvent(self, event: QtGui.QShowEvent) -> None:
+        super().showEvent(event)
+        self.refresh()
+
+    # Overwritten paint event handler, please refer to the QT documentation.
+    def paintEvent(self, event: QtGui.QPaintEvent) -> None:
+        super().paintEvent(event)
+
+        # Create and configure painter.
+        painter = QtGui.QPainter()
+        painter.begin(self)
+        painter.setRenderHint(QtGui.QPainter.Antialiasing)
+
+        # Draw the widget background.
+        path = QtGui.QPainterPath()
+        path.addRoundedRect(0, 0, self.size().width(), self.size().height(), 10, 10)
+        painter.fillPath(path, QtGui.QColor(59, 59, 59, 230))
+
+        # Stop painting.
+        painter.end()
 #endregion
 
+# region Statistics.
+"""
+InariStatistics collects the instrumentation shown by the InariStatisticsWidget, to tell whether slowness comes from rendering or the host bridge.
+It records the frame times and number of items painted per frame of the InariView, the hit rates of the asset caches, and the count and latency
+histogram of every host call made through the InariCommandInterpreterProxy. Nothing is measured unless it's enabled, so it costs nothing while hidden.
+"""
+class InariStatistics():
+    # Number of recent frames the frame statistics are calculated from.
+    frameHistory: int = 120
+    # Upper bounds, in milliseconds, of the host call latency histogram buckets; the last bucket is unbounded.
+    latencyBuckets: typing.List[float] = [0.1, 1.0, 10.0, 100.0]
+    # Weight of the latest paint time in the smoothed per item paint times shown by the heat overlay.
+    heatSmoothing: float = 0.25
+
+    # Constructor.
+    def __init__(self, commandInterpreter: InariCommandInterpreterProxy) -> None:
+        self.commandInterpreter = commandInterpreter
+        self.enabled = False
+        self.heatEnabled = False
+        self.reset()
+
+    # Enables or disables collecting statistics, host calls are only timed while enabled.
+    def setEnabled(self, enabled: bool) -> None:
+        if enabled == self.enabled:
+            return
+        self.enabled = enabled
+        if enabled:
+            self.reset()
+            self.commandInterpreter.addListener(self.hostCall)
+        else:
+            self.commandInterpreter.removeListener(self.hostCall)
+
+    # Enables or disables timing every painted item, used by the paint heat overlay of the InariView.
+    def setHeatEnabled(self, heatEnabled: bool) -> None:
+        self.heatEnabled = heatEnabled
+        self.paintTimes.clear()
+
+    # Discards everything collected so far.
+    def reset(self) -> None:
+        # Frame times in milliseconds and number of items painted, per frame.
+        self.frameTimes: typing.Deque[float] = collections.deque(maxlen=self.frameHistory)
+        self.frameItemCounts: typing.Deque[int] = collections.deque(maxlen=self.frameHistory)
+        self.itemsPainted = 0
+        self._frameStart: float = None
+        # Maps InariItem -> smoothed paint time in milliseconds, the items aren't kept alive by it.
+        self.paintTimes: "weakref.WeakKeyDictionary[InariItem, float]" = weakref.WeakKeyDictionary()
+        # Maps host call name -> [count, total milliseconds, maximum milliseconds, histogram bucket counts].
+        self.hostCalls: typing.Dict[str, list] = {}
+        # The cache counters are process wide, hit rates are calculated from the difference to this snapshot.
+        self._cacheCounters = self.cacheCounters()
+
+    # Called by the InariView before painting a frame.
+    def beginFrame(self) -> None:
+        self.itemsPainted = 0
+        self._frameStart = time.perf_counter()
+
+    # Called by the InariView after painting a frame.
+    def endFrame(self) -> None:
+        if self._frameStart == None:
+            return
+        self.frameTimes.append((time.perf_counter() - self._frameStart) * 1000)
+        self.frameItemCounts.append(self.itemsPainted)
+        self._frameStart = None
+
+    # Called for every painted item, with its paint time in seconds while the heat overlay is enabled.
+    def itemPainted(self, item: "InariItem", duration: float = None) -> None:
+        self.itemsPainted += 1
+        if duration != None and self.heatEnabled:
+            previous = self.paintTimes.get(item)
+            milliseconds = duration * 1000
+            self.paintTimes[item] = milliseconds if previous == None else previous + (milliseconds - previous) * self.heatSmoothing
+
+    # Listener added to the InariCommandInterpreterProxy while enabled.
+    def hostCall(self, name: str, args: tuple, kwargs: dict, result: typing.Any, duration: float) -> None:
+        milliseconds = duration * 1000
+        callStatistics = self.hostCalls.get(name)
+        if callStatistics == None:
+            callStatistics = self.hostCalls[name] = [0, 0.0, 0.0, [0] * (len(self.latencyBuckets) + 1)]
+        callStatistics[0] += 1
+        callStatistics[1] += milliseconds
+        callStatistics[2] = max(callStatistics[2], milliseconds)
+        callStatistics[3][bisect.bisect_left(self.latencyBuckets, milliseconds)] += 1
+
+    # Returns the hit and miss counters of the process wide asset caches.
+    @staticmethod
+    def cacheCounters() -> typing.Dict[str, typing.Tuple[int, int]]:
+        return {
+            "Renderers": (svgRendererCache.hits, svgRendererCache.misses),
+            "Pixmaps": (pixmapCache.hits, pixmapCache.misses)
+        }
+
+    # Returns the lines of text shown by the InariStatisticsWidget.
+    def reportLines(self) -> typing.List[str]:
+        lines = []
+        if len(self.frameTimes) > 0:
+            lines.append(f'{"Frame":<20}{statistics.mean(self.frameTimes):>8.2f} ms avg {max(self.frameTimes):>8.2f} ms max')
+            lines.append(f'{"Items painted":<20}{statistics.mean(self.frameItemCounts):>8.0f} avg {max(self.frameItemCounts):>11} max')
+        else:
+            lines.append(f'{"Frame":<20}{"-":>8}')
+        for name, (hits, misses) in self.cacheCounters().items():
+            hits, misses = hits - self._cacheCounters[name][0], misses - self._cacheCounters[name][1]
+            rate = f'{hits / (hits + misses) * 100:.1f} %' if hits + misses > 0 else "-"
+            lines.append(f'{name + " cache":<20}{rate:>8} hit {hits:>6} / {misses} miss')
+        lines.append("")
+        bucketNames = [f'<{bound:g}' for bound in self.latencyBuckets] + [f'>={self.latencyBuckets[-1]:g}']
+        lines.append(f'{"Host call":<20}{"count":>6}{"avg ms":>8}{"max ms":>8} ' + "".join(f'{bucketName:>6}' for bucketName in bucketNames))
+        for name, (count, total, maximum, histogram) in sorted(self.hostCalls.items()):
+            lines.append(f'{name:<20}{count:>6}{total / count:>8.2f}{maximum:>8.2f} ' + "".join(f'{bucketCount:>6}' for bucketCount in histogram))
+        return lines
+
+"""
+InariStatisticsWidget is the instrumentation panel opened with the terminal button of the InariToolbarWidget.
+Statistics are only collected while the panel is visible, and the paint heat overlay only while it's checked.
+"""
+class InariStatisticsWidget(QtWidgets.QWidget):
+    # A reference to the owning InariWidget.
+    inariWidget: "InariWidget" = None
+    # Time in milliseconds between refreshes of the shown statistics.
+    refreshInterval: int = 500
+
+    # Constructor.
+    def __init__(self, inariWidget: "InariWidget", f: QtCore.Qt.WindowFlags = None) -> None:
+        super().__init__(parent=inariWidget, f=f)
+        self.inariWidget = inariWidget
+        self.panelFont = QtGui.QFont('Consolas', 9)
+        self.panelFont.setStyleHint(QtGui.QFont.Monospace)
+        self.lines: typing.List[str] = []
+
+        # Heat overlay checkbox.
+        self.heatCheckBox = QtWidgets.QCheckBox("Paint heat overlay", self)
+        self.heatCheckBox.setFont(self.panelFont)
+        self.heatCheckBox.setStyleSheet("color: rgb(156, 156, 156);")
+        self.heatCheckBox.move(14, 10)
+        self.heatCheckBox.toggled.connect(self.heatCheckBoxToggled)
+
+        # Refresh timer, only running while the panel is visible.
+        self._refreshTimer = QtCore.QTimer(self)
+        self._refreshTimer.setInterval(self.refreshInterval)
+        self._refreshTimer.timeout.connect(self.refresh)
+
+    # Method connected to the heat checkbox toggled signal, please refer to the QT documentation.
+    def heatCheckBoxToggled(self, checked: bool) -> None:
+        self.inariWidget.inariStatistics.setHeatEnabled(checked)
+        self.inariWidget.inariView.viewport().update()
+
+    # Updates the shown statistics, resizing the panel to fit them.
+    def refresh(self) -> None:
+        self.lines = self.inariWidget.inariStatistics.reportLines()
+        fontMetrics = QtGui.QFontMetrics(self.panelFont)
+        width = max([fontMetrics.horizontalAdvance(line) for line in self.lines] + [self.heatCheckBox.sizeHint().width()])
+        self.resize(width + 28, self.textTop() + fontMetrics.lineSpacing() * len(self.lines) + 10)
+        self.update()
+
+    # Returns the top of the statistics text, below the heat checkbox.
+    def textTop(self) -> int:
+        return self.heatCheckBox.y() + self.heatCheckBox.sizeHint().height() + 6
+
+    # Overwritten show event handler, please refer to the QT documentation.
+    def showEvent(self, event: QtGui.QShowEvent) -> None:
+        super().showEvent(event)
+        self.inariWidget.inariStatistics.setEnabled(True)
+        self.inariWidget.inariStatistics.setHeatEnabled(self.heatCheckBox.isChecked())
+        self.refresh()
+        self._refreshTimer.start()
+
+    # Overwritten hide event handler, please refer to the QT documentation.
+    def hideEvent(self, event: QtGui.QHideEvent) -> None:
+        super().hideEvent(event)
+        self._refreshTimer.stop()
+        self.inariWidget.inariStatistics.setEnabled(False)
+        self.inariWidget.inariStatistics.setHeatEnabled(False)
+        self.inariWidget.inariView.viewport().update()
+
+    # Overwritten paint event handler, please refer to the QT documentation.
+    def paintEvent(self, event: QtGui.QPaintEvent) -> None:
+        super().paintEvent(event)
+
+        # Create and configure painter.
+        painter = QtGui.QPainter()
+        painter.begin(self)
+        painter.setRenderHint(QtGui.QPainter.Antialiasing)
+
+        # Draw the widget background.
+        path = QtGui.QPainterPath()
+        path.addRoundedRect(0, 0, self.size().width(), self.size().height(), 10, 10)
+        painter.fillPath(path, QtGui.QColor(59, 59, 59, 230))
+
+        # Draw the statistics.
+        painter.setFont(self.panelFont)
+        painter.setPen(QtGui.QColor(156, 156, 156))
+        fontMetrics = QtGui.QFontMetrics(self.panelFont)
+        for index, line in enumerate(self.lines):
+            painter.drawText(QtCore.QPointF(14, self.textTop() + fontMetrics.ascent() + fontMetrics.lineSpacing() * index), line)
+
+        # Stop painting.
+        painter.end()
+# endregion
+
+# region Asset caching.
+"""
+InariSvgRendererCache shares parsed QSvgRenderers between all items using the same asset.
+Renderers are keyed by the resolved file path and modification time, so an asset edited on disk gets parsed again.
+Every acquire() must be paired with a release(); renderers that are no longer referenced are kept around in
+least-recently-used order, up to "capacity" of them, so re-opening a scene doesn't have to parse everything again.
+"""
+class InariSvgRendererCache():
+    # Maximum number of unreferenced renderers kept alive for reuse.
+    capacity: int = 64
+    # Maximum number of resolved file paths remembered, they are resolved again once it's exceeded.
+    resolvedPathCapacity: int = 4096
+    # Number of acquire() calls served from the cache/parsed from disk, useful for profiling.
+    hits: int = 0
+    misses: int = 0
+
+    # Constructor.
+    def __init__(self, capacity: int = 64) -> None:
+        self.capacity = capacity
+        # Maps key -> [renderer, reference count].
+        self._entries: typing.Dict[tuple, list] = {}
+        # Keys of unreferenced entries, the least recently used first.
+        self._unreferenced: "collections.OrderedDict[tuple, None]" = collections.OrderedDict()
+        # Maps file paths to resolved paths, resolving symbolic links costs a system call per path component.
+        self._resolvedPaths: typing.Dict[str, str] = {}
+
+    # Returns the cache key for the supplied file path, can be called from any thread.
+    def key(self, filepath: str) -> tuple:
+        absolutePath = os.path.abspath(filepath)
+        path = self._resolvedPaths.get(absolutePath)
+        if path == None:
+            if len(self._resolvedPaths) >= self.resolvedPathCapacity:
+                self._resolvedPaths = {}
+            path = os.path.normcase(os.path.realpath(absolutePath))
+            self._resolvedPaths[absolutePath] = path
+        try:
+            modificationTime = os.stat(path).st_mtime_ns
+        except OSError:
+            # Missing files still get a key, QSvgRenderer will simply be invalid.
+            modificationTime = None
+        return (path, modificationTime)
+
+    # Returns a tuple of the cache key and a shared renderer for the supplied file path, increasing its reference count.
+    def acquire(self, filepath: str) -> typing.Tuple[tuple, QtSvg.QSvgRenderer]:
+        key = self.key(filepath)
+        entry = self._entries.get(key)
+        if entry == None:
+            self.misses += 1
+            entry = [QtSvg.QSvgRenderer(filepath), 0]
+            self._entries[key] = entry
+        else:
+            self.hits += 1
+            self._unreferenced.pop(key, None)
+        entry[1] += 1
+        return key, entry[0]
+
+    # Returns true if a renderer with the supplied key is cached.
+    def contains(self, key: tuple) -> bool:
+        return key in self._entries
+
+    # Inserts an already parsed renderer and acquires a reference to it, used for renderers parsed ahead of time.
+    # If a renderer with the same key is already cached, that one is acquired instead.
+    def insert(self, key: tuple, renderer: QtSvg.QSvgRenderer) -> QtSvg.QSvgRenderer:
+        entry = self._entries.get(key)
+        if entry == None:
+            entry = [renderer, 0]
+            self._entries[key] = entry
+        else:
+            self._unreferenced.pop(key, None)
+        entry[1] += 1
+        return entry[0]
+
+    # Decreases the reference count of the renderer with the supplied key, unreferenced renderers become evictable.
+    def release(self, key: tuple) -> None:
+        entry = self._entries.get(key)
+        if entry == None:
+            return
+        entry[1] -= 1
+        if entry[1] <= 0:
+            entry[1] = 0
+            self._unreferenced[key] = None
+            self._evict()
+
+    # Drops all unreferenced renderers and their outlines, and the resolved file paths so changed symbolic links are picked up.
+    def clear(self) -> None:
+        for key in self._unreferenced:
+            del self._entries[key]
+            shapeCache.remove(key)
+        self._unreferenced.clear()
+        self._resolvedPaths = {}
+
+    # Returns true if the asset file of any referenced renderer changed on disk since it was parsed.
+    def isOutdated(self) -> bool:
+        return any(entry[1] > 0 and self.key(key[0]) != key for key, entry in self._entries.items())
+
+    # Returns the number of parsed renderers currently held by the cache.
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # Drops the least recently used unreferenced renderers, and their outlines, until the capacity is respected.
+    def _evict(self) -> None:
+        while len(self._unreferenced) > self.capacity:
+            key, _ = self._unreferenced.popitem(last=False)
+            del self._entries[key]
+            shapeCache.remove(key)
+
+# The process wide renderer cache, shared by all InariWidgets.
+svgRendererCache = InariSvgRendererCache()
+
+"""
+InariPixmapCache holds rasterized versions of the shared renderers, so painting an item is a pixmap blit instead of
+re-tessellating the SVG on every repaint. Pixmaps are keyed by the renderer cache key and a quantized device scale;
+the normal and active states of a locator are separate assets and therefore separate entries.
+The cache is bounded by a memory budget in bytes, evicting the least recently used pixmaps first.
+"""
+class InariPixmapCache():
+    # Memory budget in bytes.
+    budget: int = 64 * 1024 * 1024
+    # Number of scale buckets per doubling of the device scale.
+    bucketsPerOctave: int = 2
+    # Pixmaps wider or taller than this are not cached, the renderer is used directly instead.
+    maximumPixmapSize: int = 4096
+    # Number of pixmap() calls served from the cache/rasterized, useful for profiling.
+    hits: int = 0
+    misses: int = 0
+
+    # Constructor.
+    def __init__(self, budget: int = 64 * 1024 * 1024) -> None:
+        self.budget = budget
+        self.size = 0
+        # Maps (renderer key, bucket) -> QPixmap, the least recently used first.
+        self._pixmaps: "collections.OrderedDict[tuple, QtGui.QPixmap]" = collections.OrderedDict()
+        # Maps renderer key -> set of cached buckets, used for finding the nearest cached bucket.
+        self._buckets: typing.Dict[tuple, typing.Set[int]] = collections.defaultdict(set)
+        # Maps renderer key -> average color.
+        self._averageColors: typing.Dict[tuple, QtGui.QColor] = {}
+
+    # Returns the bucket a device scale is quantized to.
+    @classmethod
+    def bucket(cls, scale: float) -> int:
+        return int(round(math.log2(max(scale, 1e-6)) * cls.bucketsPerOctave))
+
+    # Returns the device scale a bucket is rasterized at.
+    @classmethod
+    def bucketScale(cls, bucket: int) -> float:
+        return 2 ** (bucket / cls.bucketsPerOctave)
+
+    # Returns a pixmap of the renderer close to the supplied device scale, or None if it should be rendered directly.
+    # If rasterize is false, the nearest already cached bucket is returned instead of rasterizing a new one when possible.
+    def pixmap(self, rendererKey: tuple, renderer: QtSvg.QSvgRenderer, scale: float, rasterize: bool = True) -> typing.Optional[QtGui.QPixmap]:
+        bucket = self.bucket(scale)
+        if not (rendererKey, bucket) in self._pixmaps and not rasterize and self._buckets.get(rendererKey):
+            bucket = min(self._buckets[rendererKey], key=lambda cachedBucket: abs(cachedBucket - bucket))
+
+        pixmap = self._pixmaps.get((rendererKey, bucket))
+        if pixmap is not None:
+            self.hits += 1
+            self._pixmaps.move_to_end((rendererKey, bucket))
+            return pixmap
+
+        # Use the image baked offline if there is one, otherwise rasterize the renderer at the bucket scale.
+        image = bakedRasterCache.load(rendererKey, bucket)
+        if image is None:
+            image = self.rasterize(renderer, bucket)
+        if image is None:
+            return None
+        self.misses += 1
+        pixmap = QtGui.QPixmap.fromImage(image)
+        self.insert(rendererKey, bucket, pixmap)
+        return pixmap
+
+    # Rasterizes a renderer at the bucket scale, returns None if the image would be empty or too large to be cached.
+    # QImage can be used outside the GUI thread, so this is safe to call from worker threads.
+    @classmethod
+    def rasterize(cls, renderer: QtSvg.QSvgRenderer, bucket: int) -> typing.Optional[QtGui.QImage]:
+        size = QtCore.QSizeF(renderer.defaultSize()) * cls.bucketScale(bucket)
+        width, height = math.ceil(size.width()), math.ceil(size.height())
+        if width <= 0 or height <= 0 or width > cls.maximumPixmapSize or height > cls.maximumPixmapSize:
+            return None
+        image = QtGui.QImage(width, height, QtGui.QImage.Format_ARGB32_Premultiplied)
+        image.fill(QtCore.Qt.transparent)
+        painter = QtGui.QPainter(image)
+        painter.setRenderHint(QtGui.QPainter.Antialiasing)
+        renderer.render(painter, QtCore.QRectF(0, 0, width, height))
+        painter.end()
+        return image
+
+    # Returns the average color of a renderer, used for drawing items too small to make out any detail.
+    def averageColor(self, rendererKey: tuple, renderer: QtSvg.QSvgRenderer) -> QtGui.QColor:
+        color = self._averageColors.get(rendererKey)
+        if color is None:
+            image = self.rasterize(renderer, self.bucket(16 / max(renderer.defaultSize().width(), renderer.defaultSize().height(), 1)))
+            if image is None:
+                color = QtGui.QColor(QtCore.Qt.transparent)
+            else:
+                color = QtGui.QColor.fromRgba(image.scaled(1, 1, QtCore.Qt.IgnoreAspectRatio, QtCore.Qt.SmoothTransformation).pixel(0, 0))
+            self._averageColors[rendererKey] = color
+        return color
+
+    # Returns true if a pixmap of the renderer is cached at the supplied bucket.
+    def contains(self, rendererKey: tuple, bucket: int) -> bool:
+        return (rendererKey, bucket) in self._pixmaps
+
+    # Inserts a pixmap into the cache, evicting other pixmaps if the budget is exceeded.
+    def insert(self, rendererKey: tuple, bucket: int, pixmap: QtGui.QPixmap) -> None:
+        self.remove(rendererKey, bucket)
+        self._pixmaps[(rendererKey, bucket)] = pixmap
+        self._buckets[rendererKey].add(bucket)
+        self.size += self.pixmapSize(pixmap)
+        while self.size > self.budget and len(self._pixmaps) > 1:
+            (evictedKey, evictedBucket), _ = next(iter(self._pixmaps.items()))
+            self.remove(evictedKey, evictedBucket)
+
+    # Removes a single pixmap from the cache.
+    def remove(self, rendererKey: tuple, bucket: int) -> None:
+        pixmap = self._pixmaps.pop((rendererKey, bucket), None)
+        if pixmap is None:
+            return
+        self.size -= self.pixmapSize(pixmap)
+        self._buckets[rendererKey].discard(bucket)
+        if not self._buckets[rendererKey]:
+            del self._buckets[rendererKey]
+
+    # Removes all pixmaps from the cache.
+    def clear(self) -> None:
+        self._pixmaps.clear()
+        self._buckets.clear()
+        self._averageColors.clear()
+        self.size = 0
+
+    # Returns the approximate memory footprint of a pixmap in bytes.
+    @staticmethod
+    def pixmapSize(pixmap: QtGui.QPixmap) -> int:
+        return pixmap.width() * pixmap.height() * 4
+
+# The process wide pixmap cache, shared by all InariWidgets.
+pixmapCache = InariPixmapCache()
+
+"""
+InariShapeCache shares the outlines of assets between all items using them, used for shape accurate hit testing.
+Outlines are traced once per asset from the alpha mask of a low resolution rasterization and simplified into a QPainterPath,
+keyed by the same renderer key as the svgRendererCache, so edited assets get traced again.
+Outlines are dropped along with their renderers when the svgRendererCache evicts them.
+"""
+class InariShapeCache():
+    # Longest side, in pixels, of the rasterization the outline is traced from. Assets are never upscaled.
+    resolution: int = 128
+
+    # Constructor.
+    def __init__(self) -> None:
+        # Maps renderer key -> outline in item coordinates.
+        self._shapes: typing.Dict[tuple, QtGui.QPainterPath] = {}
+
+    # Returns the outline of a renderer in item coordinates, tracing it first if needed.
+    def shape(self, rendererKey: tuple, renderer: QtSvg.QSvgRenderer) -> QtGui.QPainterPath:
+        shape = self._shapes.get(rendererKey)
+        if shape is None:
+            shape = self.trace(renderer)
+            self._shapes[rendererKey] = shape
+        return shape
+
+    # Traces the outline of a renderer from the alpha mask of its rasterization.
+    # Falls back to the default size rectangle if the asset can't be rasterized.
+    @classmethod
+    def trace(cls, renderer: QtSvg.QSvgRenderer) -> QtGui.QPainterPath:
+        size = QtCore.QSizeF(renderer.defaultSize())
+        shape = QtGui.QPainterPath()
+        longestSide = max(size.width(), size.height())
+        image = InariPixmapCache.rasterize(renderer, InariPixmapCache.bucket(min(1.0, cls.resolution / longestSide))) if longestSide > 0 else None
+        if image is None:
+            shape.addRect(QtCore.QRectF(QtCore.QPointF(0, 0), size))
+            return shape
+
+        mask = QtGui.QBitmap.fromImage(image.createAlphaMask(QtCore.Qt.ThresholdAlphaDither))
+        shape.addRegion(QtGui.QRegion(mask))
+        shape = shape.simplified()
+        return QtGui.QTransform.fromScale(size.width() / image.width(), size.height() / image.height()).map(shape)
+
+    # Removes the outline of a renderer from the cache.
+    def remove(self, rendererKey: tuple) -> None:
+        self._shapes.pop(rendererKey, None)
+
+    # Removes all outlines from the cache.
+    def clear(self) -> None:
+        self._shapes.clear()
+
+# The process wide shape cache, shared by all InariWidgets.
+shapeCache = InariShapeCache()
+
+"""
+InariBakedRasterCache is an on-disk cache of assets rasterized ahead of time, filled offline by InariBake.py.
+Images are keyed by a hash of the asset content and the InariPixmapCache scale bucket, so edited assets never hit stale images.
+The pixmapCache checks it before falling back to rasterizing the SVG live.
+"""
+class InariBakedRasterCache():
+    # Default cache directory, can be overridden with the INARI_BAKE_CACHE environment variable.
+    defaultDirectory: str = os.environ.get("INARI_BAKE_CACHE", os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache"))
+
+    # Constructor.
+    def __init__(self, directory: str = None) -> None:
+        self.directory = directory or self.defaultDirectory
+        # Maps renderer keys to content hashes, the key includes the modification time so edits get hashed again.
+        self._contentHashes: typing.Dict[tuple, typing.Optional[str]] = {}
+        # Names of the files in the cache directory, listed once so misses never touch the file system; None until listed.
+        self._fileNames: typing.Optional[typing.Set[str]] = None
+
+    # Returns the hash identifying the content of an asset.
+    @staticmethod
+    def contentHash(data: bytes) -> str:
+        return hashlib.sha1(data).hexdigest()
+
+    # Returns the content hash of the asset with the supplied renderer key, or None if it can't be read.
+    def rendererContentHash(self, rendererKey: tuple) -> typing.Optional[str]:
+        if not rendererKey in self._contentHashes:
+            try:
+                with open(rendererKey[0], "rb") as file:
+                    self._contentHashes[rendererKey] = self.contentHash(file.read())
+            except IOError:
+                self._contentHashes[rendererKey] = None
+        return self._contentHashes[rendererKey]
+
+    # Returns the file name of the baked image of an asset at the supplied bucket.
+    @staticmethod
+    def imageFileName(contentHash: str, bucket: int) -> str:
+        return f'{contentHash}_{InariPixmapCache.bucketsPerOctave}_{bucket}.png'
+
+    # Returns the path of the baked image of an asset at the supplied bucket.
+    def imagePath(self, contentHash: str, bucket: int) -> str:
+        return os.path.join(self.directory, self.imageFileName(contentHash, bucket))
+
+    # Returns the names of the files in the cache directory, listing it on first use; empty if the directory doesn't exist.
+    def fileNames(self) -> typing.Set[str]:
+        fileNames = self._fileNames
+        if fileNames == None:
+            try:
+                fileNames = set(os.listdir(self.directory))
+            except OSError:
+                fileNames = set()
+            self._fileNames = fileNames
+        return fileNames
+
+    # Lists the cache directory again on the next lookup, picking up images baked by another process meanwhile.
+    def refresh(self) -> None:
+        self._fileNames = None
+
+    # Returns true if the cache directory holds any files, no lookups are done otherwise.
+    def isAvailable(self) -> bool:
+        return len(self.fileNames()) > 0
+
+    # Loads the baked image of an asset, returns None if it hasn't been baked at the supplied bucket.
+    def load(self, rendererKey: tuple, bucket: int, contentHash: str = None) -> typing.Optional[QtGui.QImage]:
+        if not self.isAvailable():
+            return None
+        contentHash = contentHash or self.rendererContentHash(rendererKey)
+        if contentHash == None:
+            return None
+        self._contentHashes.setdefault(rendererKey, contentHash)
+        if not self.imageFileName(contentHash, bucket) in self.fileNames():
+            return None
+        image = QtGui.QImage(self.imagePath(contentHash, bucket))
+        if image.isNull():
+            return None
+        return image.convertToFormat(QtGui.QImage.Format_ARGB32_Premultiplied)
+
+    # Saves the baked image of an asset, returns true if successful.
+    def save(self, contentHash: str, bucket: int, image: QtGui.QImage) -> bool:
+        path = self.imagePath(contentHash, bucket)
+        # Write to a temporary file first, so concurrent readers never see a partial image.
+        temporaryPath = f'{path}.{os.getpid()}.tmp'
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            if not image.save(temporaryPath, "PNG"):
+                return False
+            os.replace(temporaryPath, path)
+        except OSError:
+            return False
+        if self._fileNames != None:
+            self._fileNames.add(os.path.basename(path))
+        return True
+
+# The process wide baked raster cache.
+bakedRasterCache = InariBakedRasterCache()
+
+"""
+InariTextureAtlas packs the rasters of many assets, rasterized at a single pixmapCache bucket, into a few large pages.
+InariView uses it to draw all visible items as pixmap fragments of the pages, instead of painting every item separately.
+Assets are packed on demand using simple shelf packing; assets too large for a page are left out and painted normally.
+"""
+class InariTextureAtlas():
+    # Width and height of a page in pixels.
+    pageSize: int = 2048
+    # Transparent border around every packed raster, avoids bleeding between neighbours when drawn with smooth filtering.
+    padding: int = 1
+    # Whether QPainter.drawPixmapFragments() accepts a list of fragments, PySide2 only binds the single fragment overload.
+    _batchedFragments: bool = None
+
+    # Constructor.
+    def __init__(self, bucket: int) -> None:
+        self.bucket = bucket
+        self.pages: typing.List[QtGui.QPixmap] = []
+        # Maps renderer keys to (page index, source rect), or None for assets that couldn't be packed.
+        self._regions: typing.Dict[tuple, typing.Optional[typing.Tuple[int, QtCore.QRectF]]] = {}
+        # Shelf packing state of the last page: the cursor and the height of the current shelf.
+        self._cursorX = 0
+        self._cursorY = 0
+        self._shelfHeight = 0
+
+    # Returns the (page index, source rect) of an asset, packing it if needed, or None if it can't be packed.
+    def region(self, rendererKey: tuple, renderer: QtSvg.QSvgRenderer) -> typing.Optional[typing.Tuple[int, QtCore.QRectF]]:
+        if rendererKey in self._regions:
+            return self._regions[rendererKey]
+        self._regions[rendererKey] = self._pack(rendererKey, renderer)
+        return self._regions[rendererKey]
+
+    # Rasterizes an asset into the atlas.
+    def _pack(self, rendererKey: tuple, renderer: QtSvg.QSvgRenderer) -> typing.Optional[typing.Tuple[int, QtCore.QRectF]]:
+        pixmap = pixmapCache.pixmap(rendererKey, renderer, InariPixmapCache.bucketScale(self.bucket))
+        if pixmap is None:
+            return None
+        width, height = pixmap.width() + self.padding * 2, pixmap.height() + self.padding * 2
+        if width > self.pageSize or height > self.pageSize:
+            return None
+
+        # Start a new shelf if the raster doesn't fit in the current one, and a new page if the shelf doesn't fit.
+        if self._cursorX + width > self.pageSize:
+            self._cursorX, self._cursorY, self._shelfHeight = 0, self._cursorY + self._shelfHeight, 0
+        if len(self.pages) == 0 or self._cursorY + height > self.pageSize:
+            page = QtGui.QPixmap(self.pageSize, self.pageSize)
+            page.fill(QtCore.Qt.transparent)
+            self.pages.append(page)
+            self._cursorX, self._cursorY, self._shelfHeight = 0, 0, 0
+
+        x, y = self._cursorX + self.padding, self._cursorY + self.padding
+        painter = QtGui.QPainter(self.pages[-1])
+        painter.setCompositionMode(QtGui.QPainter.CompositionMode_Source)
+        painter.drawPixmap(x, y, pixmap)
+        painter.end()
+        self._cursorX += width
+        self._shelfHeight = max(self._shelfHeight, height)
+        return len(self.pages) - 1, QtCore.QRectF(x, y, pixmap.width(), pixmap.height())
+
+    # Draws a batch of fragments of a single page.
+    @classmethod
+    def drawFragments(cls, painter: QtGui.QPainter, fragments: typing.List[QtGui.QPainter.PixmapFragment], page: QtGui.QPixmap) -> None:
+        if cls._batchedFragments != False:
+            try:
+                painter.drawPixmapFragments(fragments, page)
+                cls._batchedFragments = True
+                return
+            except TypeError:
+                cls._batchedFragments = False
+        for fragment in fragments:
+            painter.drawPixmapFragments(fragment, 1, page)
+
+"""
+InariAssetPreloader reads, validates and rasterizes the unique assets of a scene on a thread pool before its items are built.
+The GUI thread only wraps the finished results, inserting the renderers into the svgRendererCache and the images into
+the pixmapCache, so building the items doesn't have to parse a single SVG.
+The preloader holds a reference to every inserted renderer until release() is called, so they can't be evicted before use.
+"""
+class InariAssetPreloader():
+    # Number of worker threads, None uses one per core.
+    maxWorkers: int = None
+
+    # Constructor.
+    def __init__(self, scale: float = 1.0, maxWorkers: int = None) -> None:
+        self.bucket = InariPixmapCache.bucket(scale)
+        self.maxWorkers = maxWorkers
+        self._executor: concurrent.futures.ThreadPoolExecutor = None
+        self._futures: typing.List[concurrent.futures.Future] = []
+        self._acquiredKeys: typing.List[tuple] = []
+
+    # Returns the unique image paths referenced by a json items list, including all sub-items if recursive is true.
+    @classmethod
+    def collectImagePaths(cls, jsonItems: typing.List[dict], recursive: bool = True) -> typing.List[str]:
+        paths: typing.Dict[str, None] = {}
+        pending = list(jsonItems)
+        while len(pending) > 0:
+            jsonItem = pending.pop()
+            for key in ("imagePath", "hoverImagePath"):
+                if key in jsonItem:
+                    paths[str(jsonItem[key])] = None
+            if recursive:
+                pending.extend(jsonItem.get("items", []))
+        return list(paths)
+
+    # Reads, validates and rasterizes a single asset, runs on a worker thread.
+    # Returns a tuple of the renderer key, renderer and image, or None if the asset couldn't be loaded.
+    @staticmethod
+    def loadAsset(filepath: str, bucket: int) -> typing.Optional[typing.Tuple[tuple, QtSvg.QSvgRenderer, typing.Optional[QtGui.QImage]]]:
+        key = svgRendererCache.key(filepath)
+        try:
+            with open(key[0], "rb") as file:
+                data = file.read()
+        except IOError:
+            print(f'Failed to read asset from path: {filepath}')
+            return None
+
+        renderer = QtSvg.QSvgRenderer(QtCore.QByteArray(data))
+        if not renderer.isValid():
+            print(f'Invalid SVG asset: {filepath}')
+            return None
+        image = bakedRasterCache.load(key, bucket, InariBakedRasterCache.contentHash(data))
+        if image is None:
+            image = InariPixmapCache.rasterize(renderer, bucket)
+
+        # The renderer is used by items on the GUI thread from now on.
+        renderer.moveToThread(QtCore.QCoreApplication.instance().thread())
+        return key, renderer, image
+
+    # Starts loading the supplied assets on the thread pool, assets already cached are skipped.
+    def start(self, filepaths: typing.List[str]) -> None:
+        filepaths = [filepath for filepath in filepaths if not svgRendererCache.contains(svgRendererCache.key(filepath))]
+        if len(filepaths) == 0:
+            return
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.maxWorkers or os.cpu_count())
+        self._futures = [self._executor.submit(self.loadAsset, filepath, self.bucket) for filepath in filepaths]
+
+    # Wraps the finished results on the calling thread, returns true once all assets are done.
+    # If block is true, this waits for all the assets to finish first.
+    def collect(self, block: bool = False) -> bool:
+        if block:
+            concurrent.futures.wait(self._futures)
+        finished = [future for future in self._futures if future.done()]
+        self._futures = [future for future in self._futures if not future.done()]
+        for future in finished:
+            result = future.result()
+            if result == None:
+                continue
+            key, renderer, image = result
+            svgRendererCache.insert(key, renderer)
+            self._acquiredKeys.append(key)
+            if image is not None and not pixmapCache.contains(key, self.bucket):
+                pixmapCache.insert(key, self.bucket, QtGui.QPixmap.fromImage(image))
+
+        if len(self._futures) == 0 and self._executor != None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        return len(self._futures) == 0
+
+    # Releases the references held on the preloaded renderers, call once the items have been built.
+    # Assets that haven't started loading yet are cancelled.
+    def release(self) -> None:
+        for future in self._futures:
+            future.cancel()
+        self._futures = []
+        if self._executor != None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        for key in self._acquiredKeys:
+            svgRendererCache.release(key)
+        self._acquiredKeys = []
+# endregion
+
 # region InariItems.
 """
 InariItem is the master class for all scene items.
@@ -583,18 +3443,97 @@ If you want to create an item with custom logic, it needs to inherit from InariI
 class InariItem(QtWidgets.QGraphicsItem):
     # The owning InariWidget.
     inariWidget: "InariWidget" = None
-    # The QSvgRenderer used to render the item. 
+    # The QSvgRenderer used to render the item, shared with all items using the same asset.
     renderer: QtSvg.QSvgRenderer = None
+    # The svgRendererCache key of the renderer.
+    rendererKey: tuple = None
+    # Path of the asset the renderer was acquired for.
+    imagePath: str = None
     # The InariCommandInterpreter used for interacting with the host application.
     commandInterpreter: InariCommandInterpreter = None 
+    # Items smaller than this many pixels on screen are drawn as flat shapes of the average asset color.
+    flatShapeSize: float = 4.0
+    # Below this view level of detail, top-level panels draw themselves and their sub-items from a single overview image.
+    overviewLevelOfDetail: float = 0.3
+    # False for locators and their sub-items, which move and change selection. While the scene is live they're drawn on top of the
+    # overview image of their panel instead of into it, see InariScene.isLive().
+    partOfOverview: bool = True
+    # The top-level item this item belongs to, which is the item itself for top-level items.
+    panelItem: "InariItem" = None
+    # The sub-items added with addSubItem, in stacking order.
+    subItems: typing.List["InariItem"] = None
+    # The json sub-items of a top-level item whose sub-items haven't been built yet, see InariWidget.setLazyInstantiationEnabled().
+    pendingJsonItems: typing.List[dict] = None
+    # The json item the item was last deserialized or reloaded from, reloading skips items whose json item didn't change.
+    jsonItem: dict = None
+    # The cached overview image of a top-level panel, the rect it covers in item coordinates, and the bucket it was rendered at.
+    _overviewImage: QtGui.QImage = None
+    _overviewRect: QtCore.QRectF = None
+    _overviewBucket: int = None
+    # True while the overview image of a top-level panel holds only its static art, with the locators drawn on top.
+    _liveOverview: bool = False
+    # The locators of a top-level panel with a live overview and their sub-items in stacking order, see updateLiveItems().
+    _liveItems: typing.List["InariItem"] = None
+    # The bounding rect of a top-level panel drawing its live items, grown to cover them so the panel is painted wherever they are.
+    _liveBoundingRect: QtCore.QRectF = None
+    # True while the item is drawn by its panel on top of the live overview image instead of painting itself, see updateLiveItems().
+    drawnByPanel: bool = False
+    # True while the item is drawn by the InariView atlas rendering, see setDrawnByView().
+    # Kept as a plain bool, as testing the item flags from itemChange() isn't supported by all PySide2 versions.
+    drawnByView: bool = False
 
     # Constructor.
     def __init__(self, inariWidget: "InariWidget", filepath: str) -> None:
         super().__init__()
 
         # Configure the item.
-        self.inariWidget = InariWidget
-        self.renderer = QtSvg.QSvgRenderer(filepath)
+        self.inariWidget = inariWidget
+        # Maps the keys of the acquired renderers to the finalizers releasing them.
+        self._rendererFinalizers: typing.List[typing.Tuple[tuple, weakref.finalize]] = []
+        self.imagePath = filepath
+        self.rendererKey, self.renderer = self.acquireRenderer(filepath)
+        # Qt asks for the bounding rect many times per paint, so it's only built when the renderer changes.
+        self._boundingRect = QtCore.QRectF(QtCore.QPointF(0, 0), self.renderer.defaultSize())
+        self.panelItem = self
+        self.subItems = []
+        # Geometry changes invalidate the overview image of the panel the item belongs to.
+        self.setFlag(QtWidgets.QGraphicsItem.ItemSendsGeometryChanges, True)
+
+    # Acquires a shared renderer from the svgRendererCache, it's released again with releaseRenderer() or once the item is garbage collected.
+    def acquireRenderer(self, filepath: str) -> typing.Tuple[tuple, QtSvg.QSvgRenderer]:
+        key, renderer = svgRendererCache.acquire(filepath)
+        self._rendererFinalizers.append((key, weakref.finalize(self, svgRendererCache.release, key)))
+        return key, renderer
+
+    # Releases a renderer acquired with acquireRenderer().
+    def releaseRenderer(self, key: tuple) -> None:
+        for index, (finalizerKey, finalizer) in enumerate(self._rendererFinalizers):
+            if finalizerKey == key:
+                del self._rendererFinalizers[index]
+                finalizer()
+                return
+
+    # Returns true if the renderer acquired for the supplied path is outdated, because the path changed or the asset was modified on disk.
+    # The svgRendererCache keys of already checked paths can be passed in keys, so every asset is only checked once.
+    @staticmethod
+    def isRendererOutdated(rendererKey: tuple, imagePath: str, filepath: str, keys: typing.Dict[str, tuple] = None) -> bool:
+        if imagePath != filepath:
+            return True
+        keys = {} if keys == None else keys
+        key = keys.get(filepath)
+        if key == None:
+            key = keys[filepath] = svgRendererCache.key(filepath)
+        return key != rendererKey
+
+    # Replaces the asset the item is drawn with.
+    def setImagePath(self, filepath: str) -> None:
+        self.prepareGeometryChange()
+        previousKey = self.rendererKey
+        self.imagePath = filepath
+        self.rendererKey, self.renderer = self.acquireRenderer(filepath)
+        self._boundingRect = QtCore.QRectF(QtCore.QPointF(0, 0), self.renderer.defaultSize())
+        self.releaseRenderer(previousKey)
+        self.invalidateOverview()
 
     # Sets the InariCommandInterpreter used for interacting with the host application.
     def setCommandInterpreter(self, commandInterpreter: InariCommandInterpreter):
@@ -602,11 +3541,296 @@ class InariItem(QtWidgets.QGraphicsItem):
 
     # Overwritten boundingRect() method, please refer to the QT documentation.
     def boundingRect(self) -> QtCore.QRectF:
-        return QtCore.QRectF(QtCore.QPointF(0, 0), self.renderer.defaultSize())
+        if self._liveBoundingRect is not None:
+            return self._liveBoundingRect
+        return self._boundingRect
+
+    # Returns the renderer key and renderer the item is currently drawn with.
+    def currentRenderer(self) -> typing.Tuple[tuple, QtSvg.QSvgRenderer]:
+        return self.rendererKey, self.renderer
+
+    # Adds a sub-item to the item.
+    # The hierarchy is mirrored on the Python side, as querying parent and child items from Qt inside paint and item change handlers breaks PySide2's object ownership.
+    def addSubItem(self, item: "InariItem") -> None:
+        item.setParentItem(self)
+        item.panelItem = self.panelItem
+        item.partOfOverview = self.partOfOverview and not isinstance(item, InariLocator)
+        self.subItems.append(item)
+        item.invalidateOverview()
+        if self.panelItem._liveOverview:
+            self.panelItem.updateLiveItems()
+
+    # Keeps json sub-items as pending, to be built once the item is first painted or expanded. None clears them.
+    def setPendingJsonItems(self, jsonItems: typing.Optional[typing.List[dict]]) -> None:
+        scene = self.scene()
+        if isinstance(scene, InariScene):
+            scene.unregisterPendingItem(self)
+        self.pendingJsonItems = jsonItems if jsonItems != None and len(jsonItems) > 0 else None
+        if isinstance(scene, InariScene):
+            scene.registerPendingItem(self)
+
+    # Returns the names of all items controlled by locators among the pending json sub-items.
+    def pendingItemNames(self) -> typing.List[str]:
+        itemNames = []
+        pending = list(self.pendingJsonItems or [])
+        while len(pending) > 0:
+            jsonItem = pending.pop()
+            if jsonItem.get("type") == "InariLocator":
+                itemNames.append(str(jsonItem.get("itemName")))
+            pending.extend(jsonItem.get("items", []))
+        return itemNames
+
+    # Builds the pending json sub-items, if any.
+    def expand(self) -> None:
+        if self.pendingJsonItems == None:
+            return
+        jsonItems = self.pendingJsonItems
+        self.setPendingJsonItems(None)
+        self.inariWidget.deserializeJsonElementsList(self, jsonItems)
+
+    # Removes a sub-item added with addSubItem() from the item and the scene.
+    def removeSubItem(self, item: "InariItem") -> None:
+        if item in self.subItems:
+            self.subItems.remove(item)
+        if item.scene() != None:
+            item.scene().removeItem(item)
+        item.invalidateOverview()
+        item.setDrawnByPanel(False)
+        if self.panelItem._liveOverview:
+            self.panelItem.updateLiveItems()
+
+    # Returns true if the item is a top-level panel drawing an overview image at the supplied view level of detail.
+    def drawsOverview(self, viewLevelOfDetail: float) -> bool:
+        return viewLevelOfDetail < self.overviewLevelOfDetail and self.panelItem is self and len(self.subItems) > 0 and not isinstance(self, InariLocator)
+
+    # Drops the overview image of the panel this item belongs to if the item is drawn into it, it's rendered again the next time it's needed.
+    # A locator changing while the scene is live switches its panel to a live overview instead, so it isn't rendered again every frame.
+    def invalidateOverview(self) -> None:
+        panelItem = self.panelItem
+        if self.partOfOverview:
+            panelItem._overviewImage = None
+        elif not panelItem._liveOverview:
+            scene = self.inariWidget.inariScene
+            if scene.isLive():
+                scene.registerLiveOverviewPanel(panelItem)
+                panelItem.setLiveOverview(True)
+            else:
+                panelItem._overviewImage = None
+
+    # Sets whether the overview image of a top-level panel holds only its static art, with the locators drawn on top.
+    def setLiveOverview(self, liveOverview: bool) -> None:
+        if liveOverview == self._liveOverview:
+            return
+        self._liveOverview = liveOverview
+        self._overviewImage = None
+        self.updateLiveItems()
+        self.update()
+
+    # Collects the locators of a top-level panel and their sub-items. Zoomed far out, they're drawn by the panel on top of its live overview image
+    # in a single loop, instead of each painting itself, as painting every locator on its own costs more than drawing it.
+    def updateLiveItems(self) -> None:
+        scene = self.scene()
+        drawnByPanel = self._liveOverview and isinstance(scene, InariScene) and scene.overviewZoom and not self.drawnByView
+        liveItems: typing.List[InariItem] = []
+        liveBoundingRect = QtCore.QRectF(self._boundingRect)
+        items = list(self.subItems)
+        while len(items) > 0:
+            item = items.pop(0)
+            if not item.partOfOverview:
+                liveItems.append(item)
+                item.setDrawnByPanel(drawnByPanel)
+                liveBoundingRect |= item.mapRectToItem(self, item._boundingRect)
+            items[0:0] = item.subItems
+        self._liveItems = liveItems if drawnByPanel else None
+        self.prepareGeometryChange()
+        self._liveBoundingRect = liveBoundingRect if drawnByPanel else None
+
+    # Grows the bounding rect of a top-level panel drawing its live items to cover the supplied rect, in item coordinates.
+    def includeLiveRect(self, rect: QtCore.QRectF) -> None:
+        if self._liveBoundingRect is None or self._liveBoundingRect.contains(rect):
+            return
+        self.prepareGeometryChange()
+        self._liveBoundingRect = self._liveBoundingRect | rect
+
+    # If true, the item doesn't paint itself and is drawn by its panel instead, see updateLiveItems().
+    def setDrawnByPanel(self, drawnByPanel: bool) -> None:
+        if drawnByPanel == self.drawnByPanel:
+            return
+        self.drawnByPanel = drawnByPanel
+        self.setFlag(QtWidgets.QGraphicsItem.ItemHasNoContents, self.drawnByView or drawnByPanel)
+        self.update()
+
+    # Returns true if the item is drawn into the overview image of its panel.
+    def isDrawnByOverview(self) -> bool:
+        return self.partOfOverview or not self.panelItem._liveOverview
 
     # Overwritten paint method, please refer to the QT documentation.
     def paint(self, painter: QtGui.QPainter, option: QtWidgets.QStyleOptionGraphicsItem, widget: typing.Optional[QtWidgets.QWidget] = ...) -> None:
-        self.renderer.render(painter, self.boundingRect())
+        # Items with pending sub-items have become visible, so the sub-items are built.
+        if self.pendingJsonItems != None:
+            self.inariWidget.scheduleExpand(self)
+
+        # Painted items are counted, and timed for the paint heat overlay, while the statistics panel is open.
+        inariStatistics = self.inariWidget.inariStatistics
+        if not inariStatistics.enabled:
+            self.paintItem(painter, option, widget)
+            return
+        start = time.perf_counter()
+        if self.paintItem(painter, option, widget):
+            inariStatistics.itemPainted(self, time.perf_counter() - start)
+
+    # Paints the item, returns false if there was nothing to paint because the item is drawn by the overview image of its panel.
+    def paintItem(self, painter: QtGui.QPainter, option: QtWidgets.QStyleOptionGraphicsItem, widget: typing.Optional[QtWidgets.QWidget]) -> bool:
+        # Level of detail: zoomed far out, the panel draws itself and its sub-items from one low resolution image, see isDrawnByOverview().
+        # Without a view, for example when rendering the scene to an image, the painter transform of the item is used instead.
+        view = widget.parentWidget() if isinstance(widget, QtWidgets.QWidget) else None
+        viewLevelOfDetail = option.levelOfDetailFromTransform(view.transform() if isinstance(view, InariView) else painter.worldTransform())
+        if self.isDrawnByOverview() and self.panelItem.drawsOverview(viewLevelOfDetail):
+            if self.panelItem is self:
+                self.paintOverview(painter, option, widget)
+                self.paintLiveItems(painter, option, widget)
+                return True
+            return False
+
+        rendererKey, renderer = self.currentRenderer()
+        self.paintRenderer(painter, option, widget, rendererKey, renderer)
+        self.paintLiveItems(painter, option, widget)
+        return True
+
+    # Draws the locators of a top-level panel, and their sub-items, that are drawn by the panel, see updateLiveItems().
+    def paintLiveItems(self, painter: QtGui.QPainter, option: QtWidgets.QStyleOptionGraphicsItem, widget: typing.Optional[QtWidgets.QWidget]) -> None:
+        if self._liveItems is None:
+            return
+        baseTransform = painter.worldTransform()
+        devicePixelRatio = self.devicePixelRatio(painter, widget)
+        view = widget.parentWidget() if isinstance(widget, QtWidgets.QWidget) else None
+        rasterize = not (isinstance(view, InariView) and view.isZooming())
+        painter.setRenderHint(QtGui.QPainter.SmoothPixmapTransform)
+        for item in self._liveItems:
+            if not item.drawnByPanel or not item.isVisible():
+                continue
+            itemTransform = item.itemTransform(self)[0] * baseTransform
+            painter.setWorldTransform(itemTransform)
+            rendererKey, renderer = item.currentRenderer()
+            item.drawRenderer(painter, rendererKey, renderer, QtWidgets.QStyleOptionGraphicsItem.levelOfDetailFromTransform(itemTransform) * devicePixelRatio, rasterize)
+        painter.setWorldTransform(baseTransform)
+
+    # Paints the overview image of a top-level panel, rendering it first if needed.
+    def paintOverview(self, painter: QtGui.QPainter, option: QtWidgets.QStyleOptionGraphicsItem, widget: typing.Optional[QtWidgets.QWidget]) -> None:
+        bucket = InariPixmapCache.bucket(option.levelOfDetailFromTransform(painter.worldTransform()) * self.devicePixelRatio(painter, widget))
+        # Keep scaling the current overview image while zooming, it's rendered at the new scale once the zoom gesture settles.
+        view = widget.parentWidget() if isinstance(widget, QtWidgets.QWidget) else None
+        zooming = isinstance(view, InariView) and view.isZooming()
+        if self._overviewImage is None or (self._overviewBucket != bucket and not zooming):
+            self.renderOverview(bucket, not zooming)
+        if self._overviewImage is None:
+            return
+        painter.setRenderHint(QtGui.QPainter.SmoothPixmapTransform)
+        painter.drawImage(self._overviewRect, self._overviewImage, QtCore.QRectF(self._overviewImage.rect()))
+
+    # Renders the item and the sub-items drawn by the overview into the overview image, at the bucket scale.
+    def renderOverview(self, bucket: int, rasterize: bool = True) -> None:
+        # Collect the items drawn into the image in stacking order, parents before their sub-items, and the rect they cover.
+        inverseSceneTransform = self.sceneTransform().inverted()[0]
+        drawnItems: typing.List[typing.Tuple[InariItem, QtGui.QTransform]] = []
+        rect = QtCore.QRectF()
+        items = [self]
+        while len(items) > 0:
+            item = items.pop(0)
+            if not isinstance(item, InariItem) or not item.isDrawnByOverview() or not item.isVisible():
+                continue
+            transform = item.sceneTransform() * inverseSceneTransform
+            drawnItems.append((item, transform))
+            rect |= transform.mapRect(item._boundingRect)
+            items[0:0] = item.subItems
+
+        scale = InariPixmapCache.bucketScale(bucket)
+        width, height = math.ceil(rect.width() * scale), math.ceil(rect.height() * scale)
+        if width <= 0 or height <= 0 or width > InariPixmapCache.maximumPixmapSize or height > InariPixmapCache.maximumPixmapSize:
+            self._overviewImage = None
+            return
+
+        image = QtGui.QImage(width, height, QtGui.QImage.Format_ARGB32_Premultiplied)
+        image.fill(QtCore.Qt.transparent)
+        painter = QtGui.QPainter(image)
+        painter.setRenderHint(QtGui.QPainter.SmoothPixmapTransform)
+        baseTransform = QtGui.QTransform.fromTranslate(-rect.x(), -rect.y()) * QtGui.QTransform.fromScale(scale, scale)
+        for item, transform in drawnItems:
+            itemTransform = transform * baseTransform
+            painter.setWorldTransform(itemTransform)
+            rendererKey, renderer = item.currentRenderer()
+            itemPixmap = pixmapCache.pixmap(rendererKey, renderer, QtWidgets.QStyleOptionGraphicsItem.levelOfDetailFromTransform(itemTransform), rasterize)
+            if itemPixmap is None:
+                renderer.render(painter, item._boundingRect)
+            else:
+                painter.drawPixmap(item._boundingRect, itemPixmap, QtCore.QRectF(itemPixmap.rect()))
+        painter.end()
+
+        self._overviewImage = image
+        self._overviewRect = rect
+        self._overviewBucket = bucket
+
+    # Overwritten item change handler, please refer to the QT documentation.
+    def itemChange(self, change: QtWidgets.QGraphicsItem.GraphicsItemChange, value: typing.Any) -> typing.Any:
+        # Keep the pending item name index of the scene up to date.
+        if self.pendingJsonItems != None:
+            if change == QtWidgets.QGraphicsItem.ItemSceneChange and isinstance(self.scene(), InariScene):
+                self.scene().unregisterPendingItem(self)
+            elif change == QtWidgets.QGraphicsItem.ItemSceneHasChanged and isinstance(value, InariScene):
+                value.registerPendingItem(self)
+
+        # Changes to the item make the overview image of its panel outdated, see invalidateOverview().
+        if change in (QtWidgets.QGraphicsItem.ItemSelectedHasChanged, QtWidgets.QGraphicsItem.ItemVisibleHasChanged, QtWidgets.QGraphicsItem.ItemPositionHasChanged, QtWidgets.QGraphicsItem.ItemTransformHasChanged):
+            self.invalidateOverview()
+
+        # Follow the atlas rendering mode of the scene the item is added to.
+        if change == QtWidgets.QGraphicsItem.ItemSceneHasChanged and isinstance(value, InariScene):
+            self.setDrawnByView(value.atlasRenderingEnabled)
+        # Items drawn by the view or their panel have no contents of their own, so the area they cover is invalidated manually.
+        elif (self.drawnByView or self.drawnByPanel) and self.scene() != None:
+            if change in (QtWidgets.QGraphicsItem.ItemPositionChange, QtWidgets.QGraphicsItem.ItemTransformChange, QtWidgets.QGraphicsItem.ItemPositionHasChanged, QtWidgets.QGraphicsItem.ItemTransformHasChanged, QtWidgets.QGraphicsItem.ItemSelectedHasChanged, QtWidgets.QGraphicsItem.ItemVisibleHasChanged):
+                self.scene().update(self.sceneBoundingRect())
+            # The panel drawing the item is painted wherever the item moves.
+            if self.drawnByPanel and change in (QtWidgets.QGraphicsItem.ItemPositionHasChanged, QtWidgets.QGraphicsItem.ItemTransformHasChanged):
+                self.panelItem.includeLiveRect(self.mapRectToItem(self.panelItem, self._boundingRect | self.childrenBoundingRect()))
+        return super().itemChange(change, value)
+
+    # If true, the item doesn't paint itself and is drawn by the InariView atlas rendering instead.
+    def setDrawnByView(self, drawnByView: bool) -> None:
+        self.drawnByView = drawnByView
+        self.setFlag(QtWidgets.QGraphicsItem.ItemHasNoContents, drawnByView or self.drawnByPanel)
+        if self._liveOverview:
+            self.updateLiveItems()
+
+    # Returns the device pixel ratio painted at, taken from the widget when painting a view.
+    # Wrapping painter.device() when it's a view's viewport breaks PySide2's object ownership and deletes the viewport.
+    @staticmethod
+    def devicePixelRatio(painter: QtGui.QPainter, widget: typing.Optional[QtWidgets.QWidget]) -> float:
+        if isinstance(widget, QtWidgets.QWidget):
+            return widget.devicePixelRatioF()
+        return painter.device().devicePixelRatioF()
+
+    # Paints a renderer into the bounding rect, using a pixmap from the pixmapCache matching the current device scale.
+    def paintRenderer(self, painter: QtGui.QPainter, option: QtWidgets.QStyleOptionGraphicsItem, widget: typing.Optional[QtWidgets.QWidget], rendererKey: tuple, renderer: QtSvg.QSvgRenderer) -> None:
+        scale = option.levelOfDetailFromTransform(painter.worldTransform()) * self.devicePixelRatio(painter, widget)
+        # Don't rasterize new pixmaps while the view is zooming, the view repaints once the zoom gesture has settled.
+        view = widget.parentWidget() if isinstance(widget, QtWidgets.QWidget) else None
+        rasterize = not (isinstance(view, InariView) and view.isZooming())
+        painter.setRenderHint(QtGui.QPainter.SmoothPixmapTransform)
+        self.drawRenderer(painter, rendererKey, renderer, scale, rasterize)
+
+    # Draws a renderer into the bounding rect at the supplied device scale, the painter is expected to use smooth pixmap transforms.
+    def drawRenderer(self, painter: QtGui.QPainter, rendererKey: tuple, renderer: QtSvg.QSvgRenderer, scale: float, rasterize: bool) -> None:
+        # Level of detail: items only a few pixels in size are drawn as flat shapes.
+        boundingRect = self._boundingRect
+        if max(boundingRect.width(), boundingRect.height()) * scale < self.flatShapeSize:
+            painter.fillRect(boundingRect, pixmapCache.averageColor(rendererKey, renderer))
+            return
+        pixmap = pixmapCache.pixmap(rendererKey, renderer, scale, rasterize)
+        if pixmap is None:
+            renderer.render(painter, boundingRect)
+            return
+        painter.drawPixmap(boundingRect, pixmap, QtCore.QRectF(pixmap.rect()))
 
 """
 InariLocator is used to control a control object or locator in the host applications scene.
@@ -614,11 +3838,16 @@ InariLocator is used to control a control object or locator in the host applicat
 class InariLocator(InariItem):
     # The QSvgRenderer used to render the item when active/selected.
     activeRenderer: QtSvg.QSvgRenderer = None
+    # The svgRendererCache key of the active renderer.
+    activeRendererKey: tuple = None
+    # Path of the asset the active renderer was acquired for.
+    hoverImagePath: str = None
     # The name of the control object in the host applications scene.
     itemName: str = None
-    # Internal variables used for transformation calculations.
-    _initialLeftClickPosition: QtCore.QPointF = None
-    _initialPosition: QtCore.QPoint = None
+    # The position of the item in the scene file, live pose reflection offsets the item from it.
+    restPosition: QtCore.QPointF = None
+    # Locators move and change selection, see InariItem.partOfOverview.
+    partOfOverview: bool = False
 
     # Constructor.
     def __init__(self, inariWidget: "InariWidget", filepath: str, hoverFilepath: str) -> None:
@@ -629,35 +3858,62 @@ class InariLocator(InariItem):
         self.setAcceptedMouseButtons(QtCore.Qt.MouseButton.AllButtons)
         self.setAcceptHoverEvents(True)
 
-        # Create the active renderer.
-        self.activeRenderer = QtSvg.QSvgRenderer(hoverFilepath)
+        # Acquire the active renderer.
+        self.hoverImagePath = hoverFilepath
+        self.activeRendererKey, self.activeRenderer = self.acquireRenderer(hoverFilepath)
+
+    # Replaces the asset the item is drawn with while active/selected.
+    def setHoverImagePath(self, hoverFilepath: str) -> None:
+        previousKey = self.activeRendererKey
+        self.hoverImagePath = hoverFilepath
+        self.activeRendererKey, self.activeRenderer = self.acquireRenderer(hoverFilepath)
+        self.releaseRenderer(previousKey)
+        self.invalidateOverview()
+        self.update()
 
     # Sets the item name.
     def setItemName(self, itemName: str) -> None:
+        scene = self.scene()
+        if isinstance(scene, InariScene):
+            scene.unregisterLocator(self)
         self.itemName = itemName
-
-    # Overwritten paint method, please refer to the QT documentation.
-    def paint(self, painter: QtGui.QPainter, option: QtWidgets.QStyleOptionGraphicsItem, widget: typing.Optional[QtWidgets.QWidget] = ...) -> None:
-        # If selected, render using active renderer, else render using normal renderer.
+        if isinstance(scene, InariScene):
+            scene.registerLocator(self)
+
+    # Overwritten shape method, please refer to the QT documentation.
+    # The outline of the asset is used, so clicks, hovers and rubber band selection only hit the visible parts of the locator.
+    def shape(self) -> QtGui.QPainterPath:
+        return shapeCache.shape(self.rendererKey, self.renderer)
+
+    # Overwritten item change handler, please refer to the QT documentation.
+    def itemChange(self, change: QtWidgets.QGraphicsItem.GraphicsItemChange, value: typing.Any) -> typing.Any:
+        # Keep the item name index of the scene up to date.
+        if change == QtWidgets.QGraphicsItem.ItemSceneChange:
+            if isinstance(self.scene(), InariScene):
+                self.scene().unregisterLocator(self)
+        elif change == QtWidgets.QGraphicsItem.ItemSceneHasChanged:
+            if isinstance(value, InariScene):
+                value.registerLocator(self)
+        return super().itemChange(change, value)
+
+    # Overwritten currentRenderer method, if selected the active renderer is used, else the normal renderer.
+    def currentRenderer(self) -> typing.Tuple[tuple, QtSvg.QSvgRenderer]:
         if self.isSelected():
-            self.activeRenderer.render(painter, self.boundingRect())
-        else:
-            self.renderer.render(painter, self.boundingRect())
+            return self.activeRendererKey, self.activeRenderer
+        return self.rendererKey, self.renderer
 
     # Overwritten mouse press event handler, please refer to the QT documentation.
     def mousePressEvent(self, event: QtWidgets.QGraphicsSceneMouseEvent) -> None:
         super().mousePressEvent(event)
 
-        # Start drag translation.
+        # Start drag translation of all selected locators.
         if (event.button() == QtCore.Qt.LeftButton):
-            # The build in Qt mouse event only gets called when the item is hovered.
-            self.scene().registerSceneMouseMoveEventListener(self)
-
-             # Capture necessary data for drag translation.
-            self._initialLeftClickPosition = event.scenePos()
-            pos = self.commandInterpreter.Host_GetPosition(self.itemName, worldSpace=False)
-            self._initialPosition = QtCore.QPointF(pos[0], pos[1])
-            
+            locators = [item for item in self.scene().selectedItems() if isinstance(item, InariLocator)]
+            if not self in locators:
+                locators.append(self)
+            # The build in Qt mouse event only gets called when the item is hovered, so the scene forwards the drag.
+            self.scene().beginDragSession(locators, event.scenePos())
+
         # Calling updates forces a redraw if the item.
         self.update()
 
@@ -667,19 +3923,8 @@ class InariLocator(InariItem):
 
         # End drag translation.
         if (event.button() == QtCore.Qt.LeftButton):
-            self.scene().unregisterSceneMouseMoveEventListener(self)
+            self.scene().endDragSession()
 
         # Calling updates forces a redraw if the item.
         self.update()
-
-    # sceneMouseMoveEvent, called by InariScene when registerd to scene mouse move events.
-    def sceneMouseMoveEvent(self, event:QtWidgets.QGraphicsSceneMouseEvent) -> None:
-        # Drag translation.
-        delta = (event.scenePos() - self._initialLeftClickPosition)
-        delta.setY(delta.y() * -1)
-        delta /= 100
-        newPosition = self._initialPosition + delta
-        
-        # Set the newly calculated object position.
-        self.commandInterpreter.Host_SetPosition(self.itemName, newPosition.x(), newPosition.y(), 0, worldSpace=False, relative=False)
 # endregion
\ No newline at end of file
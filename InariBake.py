@@ -0,0 +1,83 @@
+import argparse
+import concurrent.futures
+import os
+import sys
+import typing
+
+# The workers rasterize without a display.
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide2 import QtCore, QtGui, QtSvg
+from Inari import InariWidget, InariAssetPreloader, InariPixmapCache, InariBakedRasterCache
+
+# Default zoom range the assets are baked at, every InariPixmapCache bucket in between is baked.
+defaultMinimumScale = 0.25
+defaultMaximumScale = 4.0
+
+# Process pool initializer, QtSvg needs a QGuiApplication for rendering text.
+def initializeWorker() -> None:
+    global application
+    application = QtGui.QGuiApplication.instance() or QtGui.QGuiApplication([])
+
+# Rasterizes a single asset at all buckets, runs in a worker process.
+# Returns a tuple of the asset path and the number of baked images, or None if the asset couldn't be read.
+def bakeAsset(filepath: str, buckets: typing.List[int], directory: str) -> typing.Tuple[str, typing.Optional[int]]:
+    try:
+        with open(filepath, "rb") as file:
+            data = file.read()
+    except IOError:
+        return filepath, None
+
+    renderer = QtSvg.QSvgRenderer(QtCore.QByteArray(data))
+    if not renderer.isValid():
+        return filepath, None
+
+    cache = InariBakedRasterCache(directory)
+    contentHash = InariBakedRasterCache.contentHash(data)
+    baked = 0
+    for bucket in buckets:
+        # Images are keyed by content, so images baked for an identical asset are reused.
+        if os.path.isfile(cache.imagePath(contentHash, bucket)):
+            continue
+        image = InariPixmapCache.rasterize(renderer, bucket)
+        if image is not None and cache.save(contentHash, bucket, image):
+            baked += 1
+    return filepath, baked
+
+# Pre-rasterizes all assets referenced by scene files into the InariBakedRasterCache, run from the picker root directory
+# since asset paths are resolved relative to the working directory, just like when the picker opens the scene.
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pre-rasterize the assets of Inari scene files at multiple zoom levels.")
+    parser.add_argument("scenes", nargs="+", help="Scene files to bake the assets of.")
+    parser.add_argument("--cache", default=InariBakedRasterCache.defaultDirectory, help="Cache directory.")
+    parser.add_argument("--min-scale", type=float, default=defaultMinimumScale, help="Smallest zoom level to bake.")
+    parser.add_argument("--max-scale", type=float, default=defaultMaximumScale, help="Largest zoom level to bake.")
+    parser.add_argument("--scales", type=float, nargs="+", default=None, help="Explicit zoom levels to bake, instead of the range.")
+    parser.add_argument("--workers", type=int, default=None, help="Number of worker processes, defaults to one per core.")
+    arguments = parser.parse_args()
+
+    # Collect the unique assets referenced by the scenes.
+    filepaths: typing.Dict[str, None] = {}
+    for scene in arguments.scenes:
+        projectObject = InariWidget.readSceneFile(scene)
+        if projectObject == None:
+            sys.exit(1)
+        filepaths.update(dict.fromkeys(InariAssetPreloader.collectImagePaths(projectObject.get("items", []))))
+    if arguments.scales != None:
+        buckets = sorted(set(InariPixmapCache.bucket(scale) for scale in arguments.scales))
+    else:
+        buckets = list(range(InariPixmapCache.bucket(arguments.min_scale), InariPixmapCache.bucket(arguments.max_scale) + 1))
+
+    # Bake the assets across the process pool.
+    success = True
+    with concurrent.futures.ProcessPoolExecutor(max_workers=arguments.workers, initializer=initializeWorker) as executor:
+        futures = [executor.submit(bakeAsset, filepath, buckets, arguments.cache) for filepath in filepaths]
+        for future in concurrent.futures.as_completed(futures):
+            filepath, baked = future.result()
+            if baked == None:
+                print(f'Failed to bake asset: {filepath}')
+                success = False
+            else:
+                print(f'Baked {baked} images of {filepath}')
+
+    sys.exit(0 if success else 1)
@@ -0,0 +1,20 @@
+import argparse
+import sys
+from Inari import InariCompiledScene
+
+# Compiles json scene files into the binary InariCompiledScene format, InariWidget picks the compiled file
+# automatically when opening the json file, as long as the compiled file is newer.
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compile Inari json scene files into compiled scene files.")
+    parser.add_argument("scenes", nargs="+", help="Json scene files to compile.")
+    arguments = parser.parse_args()
+
+    success = True
+    for scene in arguments.scenes:
+        compiledPath = InariCompiledScene.compile(scene)
+        if compiledPath == None:
+            success = False
+        else:
+            print(f'Compiled {scene} -> {compiledPath}')
+
+    sys.exit(0 if success else 1)
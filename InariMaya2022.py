@@ -1,9 +1,11 @@
 from os import replace
+import threading
 import weakref
 
 import maya.cmds as cmds
 import maya.OpenMayaUI as omui
 import maya.OpenMaya as om
+import maya.utils
 from shiboken2 import wrapInstance
 from PySide2 import QtGui, QtWidgets, QtCore 
 
@@ -12,6 +14,8 @@ import Inari
 import importlib
 
 importlib.reload(Inari)
+import InariRemote
+importlib.reload(InariRemote)
 win = None
 
 def dock_window(dialog_class):
@@ -41,6 +45,15 @@ def dock_window(dialog_class):
     return win.run()
 
 class InariMayaCommandInterpreter(Inari.InariCommandInterpreter):
+    # Translate attributes whose changes are reported to the transform changed callbacks.
+    translateAttributes = ("translate", "translateX", "translateY", "translateZ")
+
+    def __init__(self) -> None:
+        self.transformChangedCallbackIds = []
+        self.frameChangedCallbackIds = []
+        # Maps item names -> MFnTransform of the watched items, local positions are read through them instead of xform.
+        self.transforms = {}
+
     def Host_SetSelection(self, items:typing.List[str]) -> None:
         print(items)
         cmds.select(items, replace=True)
@@ -53,9 +66,69 @@ class InariMayaCommandInterpreter(Inari.InariCommandInterpreter):
         cmds.xform(item, translation=[x, y, z], worldSpace=worldSpace, r=relative)
         MyDockingUI.instances[0].inariWidget.update()
 
-    def Host_GetPosition(self, item:str, worldSpace:bool=False) -> typing.List[float]:
+    def Host_GetPosition(self, item:str, worldSpace:bool=False, relative:bool=True) -> typing.List[float]:
         return cmds.xform(item, q=True, t=True, ws=worldSpace)
 
+    def Host_SetPositions(self, positions:typing.Dict[str, typing.List[float]], worldSpace:bool=False, relative:bool=True) -> None:
+        for item, position in positions.items():
+            cmds.xform(item, translation=position, worldSpace=worldSpace, r=relative)
+        MyDockingUI.instances[0].inariWidget.update()
+
+    def Host_GetPositions(self, items:typing.List[str], worldSpace:bool=False, relative:bool=True) -> typing.List[typing.List[float]]:
+        positions = []
+        for item in items:
+            transform = self.transforms.get(item) if not worldSpace else None
+            if transform != None:
+                translation = transform.getTranslation(om.MSpace.kTransform)
+                positions.append([translation.x, translation.y, translation.z])
+            else:
+                positions.append(cmds.xform(item, q=True, t=True, ws=worldSpace))
+        return positions
+
+    def Host_OpenUndoChunk(self, name:str) -> None:
+        cmds.undoInfo(openChunk=True, chunkName=name)
+
+    def Host_CloseUndoChunk(self) -> None:
+        cmds.undoInfo(closeChunk=True)
+
+    def Host_AddTransformChangedCallback(self, items:typing.List[str], callback:typing.Callable[[str], None]) -> bool:
+        for item in items:
+            selectionList = om.MSelectionList()
+            try:
+                selectionList.add(item)
+            except RuntimeError:
+                # Items missing from the Maya scene are simply not watched.
+                continue
+            node = om.MObject()
+            selectionList.getDependNode(0, node)
+            if node.hasFn(om.MFn.kTransform):
+                dagPath = om.MDagPath()
+                selectionList.getDagPath(0, dagPath)
+                self.transforms[item] = om.MFnTransform(dagPath)
+            self.transformChangedCallbackIds.append(om.MNodeMessage.addAttributeChangedCallback(node, self.attributeChanged, (item, callback)))
+        return True
+
+    def Host_RemoveTransformChangedCallbacks(self) -> None:
+        for callbackId in self.transformChangedCallbackIds:
+            om.MMessage.removeCallback(callbackId)
+        self.transformChangedCallbackIds = []
+        self.transforms = {}
+
+    def Host_AddFrameChangedCallback(self, callback:typing.Callable[[], None]) -> bool:
+        self.frameChangedCallbackIds.append(om.MEventMessage.addEventCallback("timeChanged", lambda clientData: callback()))
+        return True
+
+    def Host_RemoveFrameChangedCallbacks(self) -> None:
+        for callbackId in self.frameChangedCallbackIds:
+            om.MMessage.removeCallback(callbackId)
+        self.frameChangedCallbackIds = []
+
+    # MNodeMessage attribute changed callback, forwards translate changes to the Inari callback.
+    def attributeChanged(self, message, plug, otherPlug, clientData) -> None:
+        if message & om.MNodeMessage.kAttributeSet and om.MFnAttribute(plug.attribute()).name() in self.translateAttributes:
+            item, callback = clientData
+            callback(item)
+
 class MyDockingUI(QtWidgets.QWidget):
     instances = list()
     CONTROL_NAME = 'my_workspcae_control'
@@ -75,6 +148,9 @@ class MyDockingUI(QtWidgets.QWidget):
 
         self.commandInterpreter = InariMayaCommandInterpreter()
         self.inariWidget = Inari.InariWidget(self, self.commandInterpreter)
+        self.inariWidget.setLazyInstantiationEnabled(True)
+        # Scene edits are made by Maya at idle time, the picker never waits on them.
+        self.inariWidget.setAsyncHostCallsEnabled(True, maya.utils.executeDeferred)
         self.inariWidget.Load("C:/Dev/Inari/example.json")
         self.OnSelectionChangedEvent = om.MEventMessage.addEventCallback("SelectionChanged", OnSelectionChanged)
 
@@ -88,6 +164,8 @@ class MyDockingUI(QtWidgets.QWidget):
 
     def __del__(self):
         om.MMessage.removeCallback(self.OnSelectionChangedEvent)
+        self.commandInterpreter.Host_RemoveTransformChangedCallbacks()
+        self.commandInterpreter.Host_RemoveFrameChangedCallbacks()
 
     @staticmethod
     def delete_instances():
@@ -106,8 +184,15 @@ class MyDockingUI(QtWidgets.QWidget):
     def run(self):
         return self
 
+# Serves remote pickers, like a standalone picker started with "InariStandalone.py --connect", from a background thread.
+# The host calls are executed on Maya's main thread.
+def serveRemotePickers(address: str = InariRemote.defaultAddress) -> InariRemote.InariRemoteServer:
+    server = InariRemote.InariRemoteServer(InariMayaCommandInterpreter(), address, maya.utils.executeInMainThreadWithResult)
+    threading.Thread(target=server.serveForever, daemon=True).start()
+    return server
+
 def OnSelectionChanged(*args, **kwargs):
-    MyDockingUI.instances[0].inariWidget.SetSelection(MyDockingUI.instances[0].commandInterpreter.Host_GetSelection())
+    MyDockingUI.instances[0].inariWidget.setSelection(MyDockingUI.instances[0].commandInterpreter.Host_GetSelection())
 
 # this is where we call the window
 my_dock = dock_window(MyDockingUI)
\ No newline at end of file
@@ -0,0 +1,468 @@
+import argparse
+import json
+import os
+import selectors
+import socket
+import struct
+import sys
+import threading
+import typing
+
+from PySide2 import QtCore
+from Inari import InariCommandInterpreter
+
+# Address used when none is supplied, "host:port" for TCP or a file path for a Unix socket.
+defaultAddress = "127.0.0.1:7720"
+# Every message is a json array prefixed with its length in bytes, as an unsigned 32 bit big-endian integer.
+headerStruct = struct.Struct("!I")
+# Messages longer than this are treated as a broken stream.
+maximumMessageSize = 64 * 1024 * 1024
+
+# Returns the socket family and address for "host:port" TCP addresses and Unix socket paths.
+def parseAddress(address: str) -> typing.Tuple[int, typing.Union[str, typing.Tuple[str, int]]]:
+    host, separator, port = address.rpartition(":")
+    if separator and port.isdigit():
+        return socket.AF_INET, (host if host else "127.0.0.1", int(port))
+    return socket.AF_UNIX, address
+
+# Encodes a message into a frame, compact json prefixed with its length.
+def encodeMessage(message: list) -> bytes:
+    payload = json.dumps(message, separators=(",", ":"), default=str).encode("utf-8")
+    return headerStruct.pack(len(payload)) + payload
+
+# Removes all complete frames from the start of the buffer and returns their decoded messages.
+def decodeMessages(buffer: bytearray) -> typing.List[list]:
+    messages = []
+    while len(buffer) >= headerStruct.size:
+        size, = headerStruct.unpack_from(buffer)
+        if size > maximumMessageSize:
+            raise ValueError(f'Message of {size} bytes exceeds the maximum message size.')
+        if len(buffer) < headerStruct.size + size:
+            break
+        messages.append(json.loads(bytes(buffer[headerStruct.size:headerStruct.size + size]).decode("utf-8")))
+        del buffer[:headerStruct.size + size]
+    return messages
+
+"""
+InariRemoteCommandInterpreter sends the host calls of an InariWidget to an InariRemoteServer over a TCP or Unix socket.
+A message carries a batch of calls as [id, name, args, kwargs] arrays. Calls without a result, like setting positions or the selection,
+are pipelined: they're batched without an id and sent once the event loop is idle or a call needing a result is made, so they cost no round trip.
+Calls with a result are sent together with the batch before them, and wait for the response.
+The server answers with ["r", id, result, error] arrays, reports errors of pipelined calls as ["e", name, error] and pushes host notifications
+as ["n", name, args], which are passed to the callbacks registered on this side.
+Notifications caused by a message are pushed before its responses, so Host_Synchronize() is a pipelined call with an id whose
+response is an acknowledgement, received after the echoes of all calls sent before it.
+"""
+class InariRemoteCommandInterpreter(InariCommandInterpreter):
+    # Number of pipelined calls sent at once at most, a full batch is sent right away.
+    maximumBatchSize: int = 256
+    # Time in seconds to wait for a response before the call fails.
+    timeout: float = 10.0
+
+    # Constructor, connects to the server; needs a QCoreApplication for sending batches and receiving notifications.
+    def __init__(self, address: str = defaultAddress) -> None:
+        family, socketAddress = parseAddress(address)
+        self.socket = socket.socket(family, socket.SOCK_STREAM)
+        self.socket.connect(socketAddress)
+        if family == socket.AF_INET:
+            self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.socket.settimeout(self.timeout)
+        self._buffer = bytearray()
+        self._batch: typing.List[list] = []
+        self._nextId = 0
+        # Maps call ids -> (result, error) of responses received while waiting for another one.
+        self._responses: typing.Dict[int, typing.Tuple[typing.Any, typing.Optional[str]]] = {}
+        # Notifications received while waiting for a response are dispatched once the call returns.
+        # Acknowledgements of Host_Synchronize() are queued among them as ["s", id] arrays, so their callbacks run in order.
+        self._notifications: typing.List[list] = []
+        # Maps call ids of Host_Synchronize() -> callbacks waiting for the acknowledgement.
+        self._synchronizeCallbacks: typing.Dict[int, typing.Callable[[], None]] = {}
+        self._transformChangedCallbacks: typing.List[typing.Callable[[str], None]] = []
+        self._frameChangedCallbacks: typing.List[typing.Callable[[], None]] = []
+        self._sendTimer = QtCore.QTimer()
+        self._sendTimer.setSingleShot(True)
+        self._sendTimer.setInterval(0)
+        self._sendTimer.timeout.connect(self.send)
+        self._readNotifier = QtCore.QSocketNotifier(self.socket.fileno(), QtCore.QSocketNotifier.Read)
+        self._readNotifier.activated.connect(self.readAvailable)
+
+    # Closes the connection, pipelined calls are sent first.
+    def close(self) -> None:
+        if self.socket == None:
+            return
+        self.send()
+        self._readNotifier.setEnabled(False)
+        self._sendTimer.stop()
+        self.socket.close()
+        self.socket = None
+        # No acknowledgements are going to arrive anymore.
+        callbacks, self._synchronizeCallbacks = self._synchronizeCallbacks, {}
+        for callback in callbacks.values():
+            callback()
+
+    # Queues a pipelined call, it's sent with the next batch.
+    def post(self, name: str, *args, **kwargs) -> None:
+        self.enqueue([None, name, list(args), kwargs])
+
+    # Adds a call to the next batch, and schedules sending it.
+    def enqueue(self, call: list) -> None:
+        self._batch.append(call)
+        if len(self._batch) >= self.maximumBatchSize:
+            self.send()
+        elif not self._sendTimer.isActive():
+            self._sendTimer.start()
+
+    # Sends a call together with the pipelined calls queued before it and returns its result, raises RuntimeError if it failed in the host.
+    def request(self, name: str, *args, **kwargs) -> typing.Any:
+        callId = self._nextId
+        self._nextId += 1
+        self._batch.append([callId, name, list(args), kwargs])
+        self.send()
+        self._readNotifier.setEnabled(False)
+        try:
+            while not callId in self._responses:
+                self.receive()
+        finally:
+            self._readNotifier.setEnabled(True)
+        result, error = self._responses.pop(callId)
+        self.dispatchNotifications()
+        if error != None:
+            raise RuntimeError(f'{name} failed in the host: {error}')
+        return result
+
+    # Sends the queued calls as one message.
+    def send(self) -> None:
+        self._sendTimer.stop()
+        if len(self._batch) == 0 or self.socket == None:
+            return
+        batch, self._batch = self._batch, []
+        self.socket.sendall(encodeMessage(batch))
+
+    # Blocks until data arrives and handles the complete messages.
+    def receive(self) -> None:
+        data = self.socket.recv(65536)
+        if len(data) == 0:
+            raise ConnectionError("The Inari server closed the connection.")
+        self._buffer += data
+        for message in decodeMessages(self._buffer):
+            for entry in message:
+                if entry[0] == "r" and entry[1] in self._synchronizeCallbacks:
+                    self._notifications.append(["s", entry[1]])
+                elif entry[0] == "r":
+                    self._responses[entry[1]] = (entry[2], entry[3])
+                elif entry[0] == "e":
+                    print(f'{entry[1]} failed in the host: {entry[2]}')
+                elif entry[0] == "n":
+                    self._notifications.append(entry)
+
+    # Connected to the read socket notifier, handles notifications pushed by the server.
+    def readAvailable(self) -> None:
+        try:
+            self.receive()
+        except ConnectionError as error:
+            print(error)
+            self._readNotifier.setEnabled(False)
+            return
+        self.dispatchNotifications()
+
+    # Passes the received notifications to the registered callbacks.
+    def dispatchNotifications(self) -> None:
+        notifications, self._notifications = self._notifications, []
+        for notification in notifications:
+            if notification[0] == "s":
+                self._synchronizeCallbacks.pop(notification[1])()
+                continue
+            kind, name, args = notification
+            if name == "transformChanged":
+                for callback in list(self._transformChangedCallbacks):
+                    callback(*args)
+            elif name == "frameChanged":
+                for callback in list(self._frameChangedCallbacks):
+                    callback()
+
+    def Host_SetSelection(self, items:typing.List[str]) -> None:
+        self.post("Host_SetSelection", items)
+
+    def Host_GetSelection(self) -> typing.List[str]:
+        return self.request("Host_GetSelection")
+
+    def Host_SetPosition(self, item:str, x:float, y:float, z:float, worldSpace:bool=False, relative:bool=True) -> None:
+        self.post("Host_SetPosition", item, x, y, z, worldSpace=worldSpace, relative=relative)
+
+    def Host_GetPosition(self, item:str, worldSpace:bool=False, relative:bool=True) -> typing.List[float]:
+        return self.request("Host_GetPosition", item, worldSpace=worldSpace, relative=relative)
+
+    def Host_SetPositions(self, positions:typing.Dict[str, typing.List[float]], worldSpace:bool=False, relative:bool=True) -> None:
+        self.post("Host_SetPositions", positions, worldSpace=worldSpace, relative=relative)
+
+    def Host_GetPositions(self, items:typing.List[str], worldSpace:bool=False, relative:bool=True) -> typing.List[typing.List[float]]:
+        return self.request("Host_GetPositions", items, worldSpace=worldSpace, relative=relative)
+
+    def Host_OpenUndoChunk(self, name:str) -> None:
+        self.post("Host_OpenUndoChunk", name)
+
+    def Host_CloseUndoChunk(self) -> None:
+        self.post("Host_CloseUndoChunk")
+
+    # Callbacks stay on this side, the server pushes a notification for every change.
+    def Host_AddTransformChangedCallback(self, items:typing.List[str], callback:typing.Callable[[str], None]) -> bool:
+        if not self.request("Host_AddTransformChangedCallback", items):
+            return False
+        self._transformChangedCallbacks.append(callback)
+        return True
+
+    def Host_RemoveTransformChangedCallbacks(self) -> None:
+        self._transformChangedCallbacks = []
+        self.post("Host_RemoveTransformChangedCallbacks")
+
+    def Host_AddFrameChangedCallback(self, callback:typing.Callable[[], None]) -> bool:
+        if not self.request("Host_AddFrameChangedCallback"):
+            return False
+        self._frameChangedCallbacks.append(callback)
+        return True
+
+    def Host_RemoveFrameChangedCallbacks(self) -> None:
+        self._frameChangedCallbacks = []
+        self.post("Host_RemoveFrameChangedCallbacks")
+
+    # Pipelined like the calls before it, the callback runs once the server acknowledged it.
+    def Host_Synchronize(self, callback:typing.Callable[[], None]) -> None:
+        if self.socket == None:
+            callback()
+            return
+        callId = self._nextId
+        self._nextId += 1
+        self._synchronizeCallbacks[callId] = callback
+        self.enqueue([callId, "Host_Synchronize", [], {}])
+
+"""
+InariRemoteServer is the reference server for InariRemoteCommandInterpreter, it executes the received calls on an InariCommandInterpreter.
+All calls of a message are executed in order and answered with a single message. Host notifications are batched and pushed to all clients,
+the ones caused by a message before its answer.
+Hosts that only allow scene edits from their main thread pass a dispatch function running a callable there and returning its result,
+like maya.utils.executeInMainThreadWithResult, and run serveForever() on a thread of its own.
+"""
+class InariRemoteServer():
+    # Constructor, starts listening on the address.
+    def __init__(self, commandInterpreter: InariCommandInterpreter, address: str = defaultAddress, dispatch: typing.Callable[[typing.Callable[[], typing.Any]], typing.Any] = None) -> None:
+        self.commandInterpreter = commandInterpreter
+        self.dispatch = dispatch if dispatch != None else (lambda function: function())
+        family, socketAddress = parseAddress(address)
+        self.listener = socket.socket(family, socket.SOCK_STREAM)
+        if family == socket.AF_INET:
+            self.listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.listener.bind(socketAddress)
+        self.listener.listen()
+        self.listener.setblocking(False)
+        # Notifications are pushed by the serving thread, a wakeup socket pair interrupts its select when one is queued.
+        self._wakeupReader, self._wakeupWriter = socket.socketpair()
+        self._wakeupReader.setblocking(False)
+        self._notifications: typing.List[list] = []
+        self._lock = threading.Lock()
+        self._running = False
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self.listener, selectors.EVENT_READ, None)
+        self._selector.register(self._wakeupReader, selectors.EVENT_READ, None)
+        # Maps client sockets -> receive buffers.
+        self._clients: typing.Dict[socket.socket, bytearray] = {}
+
+    # Returns the address the server listens on, with the actual port when listening on port 0.
+    def address(self) -> str:
+        socketAddress = self.listener.getsockname()
+        return f'{socketAddress[0]}:{socketAddress[1]}' if isinstance(socketAddress, tuple) else socketAddress
+
+    # Handles clients until stop() is called.
+    def serveForever(self) -> None:
+        self._running = True
+        while self._running:
+            self.serve(None)
+
+    # Handles the pending connections, messages and notifications, waiting up to timeout seconds for them, None waits indefinitely.
+    def serve(self, timeout: typing.Optional[float] = 0) -> None:
+        for key, events in self._selector.select(timeout):
+            if key.fileobj is self.listener:
+                self.accept()
+            elif key.fileobj is self._wakeupReader:
+                try:
+                    self._wakeupReader.recv(4096)
+                except BlockingIOError:
+                    pass
+            else:
+                self.read(key.fileobj)
+        self.pushNotifications()
+
+    # Stops serveForever(), can be called from any thread.
+    def stop(self) -> None:
+        self._running = False
+        self._wakeupWriter.send(b"\0")
+
+    # Closes the server and all client connections.
+    def close(self) -> None:
+        for client in list(self._clients):
+            self.disconnect(client)
+        self._selector.close()
+        socketAddress = self.listener.getsockname()
+        self.listener.close()
+        # Unix sockets leave their file behind.
+        if isinstance(socketAddress, str) and os.path.exists(socketAddress):
+            os.remove(socketAddress)
+        self._wakeupReader.close()
+        self._wakeupWriter.close()
+
+    # Accepts a pending client connection.
+    def accept(self) -> None:
+        client, clientAddress = self.listener.accept()
+        if client.family == socket.AF_INET:
+            client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        client.setblocking(True)
+        self._clients[client] = bytearray()
+        self._selector.register(client, selectors.EVENT_READ, None)
+
+    # Drops a client connection.
+    def disconnect(self, client: socket.socket) -> None:
+        self._selector.unregister(client)
+        del self._clients[client]
+        client.close()
+
+    # Reads from a client and answers its complete messages.
+    def read(self, client: socket.socket) -> None:
+        try:
+            data = client.recv(65536)
+        except OSError:
+            data = b""
+        if len(data) == 0:
+            self.disconnect(client)
+            return
+        buffer = self._clients[client]
+        buffer += data
+        try:
+            messages = decodeMessages(buffer)
+        except ValueError as error:
+            print(error)
+            self.disconnect(client)
+            return
+        for message in messages:
+            responses = self.dispatch(lambda: self.execute(message))
+            # The echoes of the calls go out first, so clients receive them before the acknowledgements.
+            self.pushNotifications()
+            if len(responses) > 0:
+                self.sendMessage(client, responses)
+
+    # Executes the calls of a message in order, returns the responses.
+    def execute(self, message: typing.List[list]) -> typing.List[list]:
+        responses = []
+        for callId, name, args, kwargs in message:
+            result, error = None, None
+            try:
+                result = self.call(name, args, kwargs)
+            except Exception as exception:
+                error = repr(exception)
+            if callId != None:
+                responses.append(["r", callId, result, error])
+            elif error != None:
+                responses.append(["e", name, error])
+        return responses
+
+    # Calls an InariCommandInterpreter method, the callback registrations are replaced by notifications pushed to the clients.
+    def call(self, name: str, args: list, kwargs: dict) -> typing.Any:
+        if not name.startswith("Host_"):
+            raise AttributeError(f'Unknown host call: {name}')
+        if name == "Host_AddTransformChangedCallback":
+            return self.commandInterpreter.Host_AddTransformChangedCallback(args[0], lambda item: self.notify("transformChanged", item))
+        if name == "Host_AddFrameChangedCallback":
+            return self.commandInterpreter.Host_AddFrameChangedCallback(lambda: self.notify("frameChanged"))
+        # The calls before it have been executed once it's answered, its callback stays on the client.
+        if name == "Host_Synchronize":
+            return None
+        return getattr(self.commandInterpreter, name)(*args, **kwargs)
+
+    # Queues a notification for all clients, can be called from any thread.
+    def notify(self, name: str, *args) -> None:
+        with self._lock:
+            self._notifications.append(["n", name, list(args)])
+            first = len(self._notifications) == 1
+        if first:
+            self._wakeupWriter.send(b"\0")
+
+    # Sends the queued notifications to all clients as one message.
+    def pushNotifications(self) -> None:
+        with self._lock:
+            notifications, self._notifications = self._notifications, []
+        if len(notifications) == 0:
+            return
+        for client in list(self._clients):
+            self.sendMessage(client, notifications)
+
+    # Sends a message to a client, dropping the client if it's gone.
+    def sendMessage(self, client: socket.socket, message: list) -> None:
+        try:
+            client.sendall(encodeMessage(message))
+        except OSError:
+            self.disconnect(client)
+
+"""
+InariMemoryCommandInterpreter is an in-memory host for testing the remote transport locally.
+It keeps the selection and positions of the items and notifies transform changes.
+"""
+class InariMemoryCommandInterpreter(InariCommandInterpreter):
+    # Constructor.
+    def __init__(self, verbose: bool = False) -> None:
+        self.verbose = verbose
+        self.selection: typing.List[str] = []
+        self.positions: typing.Dict[str, typing.List[float]] = {}
+        self.transformChangedCallbacks: typing.Dict[str, typing.List[typing.Callable[[str], None]]] = {}
+
+    def Host_SetSelection(self, items:typing.List[str]) -> None:
+        if self.verbose:
+            print(f'Host_SetSelection(items: {items})')
+        self.selection = list(items)
+
+    def Host_GetSelection(self) -> typing.List[str]:
+        return list(self.selection)
+
+    def Host_SetPosition(self, item:str, x:float, y:float, z:float, worldSpace:bool=False, relative:bool=True) -> None:
+        if self.verbose:
+            print(f'Host_SetPosition(item: {item}, x: {x}, y: {y}, z: {z}, worldSpace: {worldSpace}, relative: {relative})')
+        position = self.positions.setdefault(item, [0.0, 0.0, 0.0])
+        if relative:
+            position[0], position[1], position[2] = position[0] + x, position[1] + y, position[2] + z
+        else:
+            position[0], position[1], position[2] = x, y, z
+        for callback in self.transformChangedCallbacks.get(item, []):
+            callback(item)
+
+    def Host_GetPosition(self, item:str, worldSpace:bool=False, relative:bool=True) -> typing.List[float]:
+        return list(self.positions.get(item, [0.0, 0.0, 0.0]))
+
+    def Host_OpenUndoChunk(self, name:str) -> None:
+        if self.verbose:
+            print(f'Host_OpenUndoChunk(name: {name})')
+
+    def Host_CloseUndoChunk(self) -> None:
+        if self.verbose:
+            print(f'Host_CloseUndoChunk()')
+
+    def Host_AddTransformChangedCallback(self, items:typing.List[str], callback:typing.Callable[[str], None]) -> bool:
+        for item in items:
+            self.transformChangedCallbacks.setdefault(item, []).append(callback)
+        return True
+
+    def Host_RemoveTransformChangedCallbacks(self) -> None:
+        self.transformChangedCallbacks.clear()
+
+# Runs the reference server with an in-memory host.
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reference Inari server, executing the host calls of remote pickers on an in-memory host.")
+    parser.add_argument("--listen", default=defaultAddress, help="Address to listen on, host:port or a Unix socket path.")
+    parser.add_argument("--verbose", action="store_true", help="Print the host calls changing the in-memory host.")
+    arguments = parser.parse_args()
+
+    server = InariRemoteServer(InariMemoryCommandInterpreter(arguments.verbose), arguments.listen)
+    sys.stdout.write(f'Listening on {server.address()}\n')
+    sys.stdout.flush()
+    try:
+        server.serveForever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
@@ -1,3 +1,4 @@
+import argparse
 import sys
 from Inari import InariWidget, InariCommandInterpreter
 
@@ -8,14 +9,18 @@ from PySide2.QtSvg import QGraphicsSvgItem, QSvgRenderer
 from PySide2 import QtCore, QtGui, QtWidgets, QtSvg
 
 class Window(QtWidgets.QWidget):
-    def __init__(self):
+    # The picker drives the host through commandInterpreter, the print-only InariCommandInterpreter by default.
+    def __init__(self, commandInterpreter: InariCommandInterpreter = None):
         super().__init__()
 
         self.setWindowTitle("Khaos System | Inari")
         self.setGeometry(300, 50, 766, 980)
         self.setWindowIcon(QtGui.QIcon("resources/textures/icon.png"))
 
-        inariWidget = InariWidget(self, InariCommandInterpreter())
+        inariWidget = InariWidget(self, commandInterpreter if commandInterpreter != None else InariCommandInterpreter())
+        inariWidget.setLazyInstantiationEnabled(True)
+        # Host calls are deferred to a zero timer of the event loop.
+        inariWidget.setAsyncHostCallsEnabled(True)
         
         layout = QtWidgets.QVBoxLayout()
         layout.setMargin(0)
@@ -26,8 +31,16 @@ class Window(QtWidgets.QWidget):
 
 
 if __name__ == "__main__":
-    myApp = QtWidgets.QApplication(sys.argv)
-    window = Window()
+    parser = argparse.ArgumentParser(description="Standalone Inari picker.")
+    parser.add_argument("--connect", default=None, metavar="ADDRESS", help="Drive the host behind an InariRemoteServer, host:port or a Unix socket path.")
+    arguments, qtArguments = parser.parse_known_args()
+
+    myApp = QtWidgets.QApplication(sys.argv[:1] + qtArguments)
+    commandInterpreter = None
+    if arguments.connect != None:
+        from InariRemote import InariRemoteCommandInterpreter
+        commandInterpreter = InariRemoteCommandInterpreter(arguments.connect)
+    window = Window(commandInterpreter)
 
 myApp.exec_()
 sys.exit(0)
@@ -0,0 +1,325 @@
+import argparse
+import collections
+import json
+import os
+import sys
+import time
+import typing
+
+from PySide2 import QtCore, QtGui, QtWidgets, QtTest
+from Inari import InariWidget, InariCommandInterpreter
+
+# Trace file format version, written to the header record.
+traceVersion = 1
+
+# Input events recorded on the view and replayed, mapped to the names they are stored under.
+viewEventTypes: typing.Dict[QtCore.QEvent.Type, str] = {
+    QtCore.QEvent.MouseButtonPress: "MouseButtonPress",
+    QtCore.QEvent.MouseButtonRelease: "MouseButtonRelease",
+    QtCore.QEvent.MouseButtonDblClick: "MouseButtonDblClick",
+    QtCore.QEvent.MouseMove: "MouseMove",
+    QtCore.QEvent.Wheel: "Wheel",
+    QtCore.QEvent.KeyPress: "KeyPress",
+    QtCore.QEvent.KeyRelease: "KeyRelease"
+}
+# Scene events recorded for reference, they are generated again by the view when the input events are replayed.
+sceneEventTypes: typing.Dict[QtCore.QEvent.Type, str] = {
+    QtCore.QEvent.GraphicsSceneMousePress: "GraphicsSceneMousePress",
+    QtCore.QEvent.GraphicsSceneMouseRelease: "GraphicsSceneMouseRelease",
+    QtCore.QEvent.GraphicsSceneMouseMove: "GraphicsSceneMouseMove"
+}
+
+# Converts host call arguments and results to json compatible values.
+def jsonValue(value: typing.Any) -> typing.Any:
+    if isinstance(value, dict):
+        return {str(key): jsonValue(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [jsonValue(item) for item in value]
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return str(value)
+
+"""
+InariTraceRecorder captures the input events of an InariWidget's view and scene, and the host calls, to a trace file.
+The trace starts with a header describing the scene and camera, followed by one json record per line:
+input events on the view, scene events for reference, and host calls with their arguments, results and durations.
+All records are timestamped in seconds since the recording started.
+"""
+class InariTraceRecorder(QtCore.QObject):
+    # Constructor.
+    def __init__(self, inariWidget: InariWidget, parent: QtCore.QObject = None) -> None:
+        super().__init__(parent)
+        self.inariWidget = inariWidget
+        self._file: typing.Optional[typing.TextIO] = None
+        self._viewport: typing.Optional[QtWidgets.QWidget] = None
+        self._startTime: float = 0.0
+
+    # Returns true while recording.
+    def isRecording(self) -> bool:
+        return self._file != None
+
+    # Starts recording to the supplied trace file, replacing it if it exists.
+    def start(self, path: str) -> None:
+        if self.isRecording():
+            self.stop()
+
+        view = self.inariWidget.inariView
+        transform = view.transform()
+        self._file = open(path, "w")
+        self._startTime = time.perf_counter()
+        self.write({
+            "record": "header",
+            "version": traceVersion,
+            "workingDirectory": os.getcwd(),
+            "scene": os.path.abspath(self.inariWidget.currentScenePath) if self.inariWidget.currentScenePath != None else None,
+            "viewportSize": [view.viewport().width(), view.viewport().height()],
+            "transform": [transform.m11(), transform.m12(), transform.m21(), transform.m22(), transform.dx(), transform.dy()],
+            "scroll": [view.horizontalScrollBar().value(), view.verticalScrollBar().value()],
+            "selection": [item.itemName for item in self.inariWidget.inariScene.selectedItems() if getattr(item, "itemName", None) != None],
+            "atlasRendering": self.inariWidget.inariScene.atlasRenderingEnabled
+        })
+
+        self._viewport = view.viewport()
+        view.installEventFilter(self)
+        self._viewport.installEventFilter(self)
+        self.inariWidget.inariScene.installEventFilter(self)
+        self.inariWidget.inariCommandInterpreter.addListener(self.hostCall)
+
+    # Stops recording and closes the trace file.
+    def stop(self) -> None:
+        if not self.isRecording():
+            return
+        view = self.inariWidget.inariView
+        view.removeEventFilter(self)
+        self._viewport.removeEventFilter(self)
+        self._viewport = None
+        self.inariWidget.inariScene.removeEventFilter(self)
+        self.inariWidget.inariCommandInterpreter.removeListener(self.hostCall)
+        self._file.close()
+        self._file = None
+
+    # Writes a record to the trace file.
+    def write(self, record: dict) -> None:
+        if record["record"] != "header":
+            record["time"] = time.perf_counter() - self._startTime
+        self._file.write(json.dumps(record) + "\n")
+
+    # Overwritten event filter, please refer to the QT documentation.
+    def eventFilter(self, watched: QtCore.QObject, event: QtCore.QEvent) -> bool:
+        eventType = event.type()
+        if eventType in viewEventTypes:
+            # Mouse events are delivered to the viewport and key events to the view, events the view forwards elsewhere are skipped.
+            if watched is not (self._viewport if isinstance(event, (QtGui.QMouseEvent, QtGui.QWheelEvent)) else self.inariWidget.inariView):
+                return False
+            record = {"record": "input", "type": viewEventTypes[eventType], "modifiers": int(event.modifiers())}
+            if isinstance(event, QtGui.QMouseEvent):
+                record.update({"position": [event.localPos().x(), event.localPos().y()], "button": int(event.button()), "buttons": int(event.buttons())})
+            elif isinstance(event, QtGui.QWheelEvent):
+                record.update({"position": [event.posF().x(), event.posF().y()], "angleDelta": [event.angleDelta().x(), event.angleDelta().y()], "buttons": int(event.buttons())})
+            elif isinstance(event, QtGui.QKeyEvent):
+                # Auto repeated key presses are generated by the platform while a key is held, they aren't replayed.
+                if event.isAutoRepeat():
+                    return False
+                record.update({"key": event.key(), "text": event.text()})
+            self.write(record)
+        elif eventType in sceneEventTypes:
+            self.write({"record": "scene", "type": sceneEventTypes[eventType], "scenePosition": [event.scenePos().x(), event.scenePos().y()], "buttons": int(event.buttons())})
+        return False
+
+    # Host call listener, added to the widget's InariCommandInterpreterProxy.
+    def hostCall(self, name: str, args: tuple, kwargs: dict, result: typing.Any, duration: float) -> None:
+        self.write({"record": "host", "call": name, "args": jsonValue(args), "kwargs": jsonValue(kwargs), "result": jsonValue(result), "duration": duration})
+
+"""
+InariTraceInterpreter is a mock InariCommandInterpreter used when replaying traces.
+Queries return the results recorded in the trace, in the order they were recorded, so the replay takes the same code paths.
+"""
+class InariTraceInterpreter(InariCommandInterpreter):
+    # Constructor.
+    def __init__(self, hostRecords: typing.List[dict]) -> None:
+        self.calls: typing.Counter[str] = collections.Counter()
+        self._results: typing.Dict[str, typing.Deque[typing.Any]] = collections.defaultdict(collections.deque)
+        for record in hostRecords:
+            self._results[record["call"]].append(record.get("result"))
+
+    # Returns the next recorded result of a host call, or the default if the trace has no more of them.
+    def result(self, name: str, default: typing.Any) -> typing.Any:
+        self.calls[name] += 1
+        results = self._results[name]
+        result = results.popleft() if len(results) > 0 else None
+        return default if result is None else result
+
+    def Host_SetSelection(self, items:typing.List[str]) -> None:
+        self.result("Host_SetSelection", None)
+
+    def Host_GetSelection(self) -> typing.List[str]:
+        return self.result("Host_GetSelection", [])
+
+    def Host_SetPosition(self, item:str, x:float, y:float, z:float, worldSpace:bool=False, relative:bool=True) -> None:
+        self.result("Host_SetPosition", None)
+
+    def Host_GetPosition(self, item:str, worldSpace:bool=False, relative:bool=True) -> typing.List[float]:
+        return self.result("Host_GetPosition", [0.0, 0.0, 0.0])
+
+    def Host_SetPositions(self, positions:typing.Dict[str, typing.List[float]], worldSpace:bool=False, relative:bool=True) -> None:
+        self.result("Host_SetPositions", None)
+
+    def Host_GetPositions(self, items:typing.List[str], worldSpace:bool=False, relative:bool=True) -> typing.List[typing.List[float]]:
+        return self.result("Host_GetPositions", [[0.0, 0.0, 0.0] for item in items])
+
+    def Host_OpenUndoChunk(self, name:str) -> None:
+        self.result("Host_OpenUndoChunk", None)
+
+    def Host_CloseUndoChunk(self) -> None:
+        self.result("Host_CloseUndoChunk", None)
+
+    # Transform change notifications can't be replayed, so the position mirror is only enabled if it was when recording.
+    def Host_AddTransformChangedCallback(self, items:typing.List[str], callback:typing.Callable[[str], None]) -> bool:
+        return self.result("Host_AddTransformChangedCallback", False)
+
+    def Host_RemoveTransformChangedCallbacks(self) -> None:
+        self.result("Host_RemoveTransformChangedCallbacks", None)
+
+    # Frame notifications can't be replayed either, live pose reflection falls back to polling the recorded results.
+    def Host_AddFrameChangedCallback(self, callback:typing.Callable[[], None]) -> bool:
+        return self.result("Host_AddFrameChangedCallback", False)
+
+    def Host_RemoveFrameChangedCallbacks(self) -> None:
+        self.result("Host_RemoveFrameChangedCallbacks", None)
+
+"""
+InariTraceReplayer feeds the input events of a trace back into a fresh InariWidget, against an InariTraceInterpreter.
+Every event is sent to the view and followed by processing the events it posted, like repaints, and the time this takes is its latency.
+With realtime pacing, the recorded gaps between events are waited out so timers like the command queue flush fire as they did when recording.
+"""
+class InariTraceReplayer():
+    # Latency percentiles reported.
+    percentiles: typing.List[int] = [50, 90, 99]
+
+    # Constructor.
+    def __init__(self, path: str, scenePath: str = None, realtime: bool = True) -> None:
+        with open(path, "r") as file:
+            records = [json.loads(line) for line in file if line.strip() != ""]
+        if len(records) == 0 or records[0].get("record") != "header" or records[0].get("version") != traceVersion:
+            raise ValueError(f'Not an Inari trace file: {path}')
+
+        self.header = records[0]
+        self.inputRecords = [record for record in records if record["record"] == "input"]
+        self.hostRecords = [record for record in records if record["record"] == "host"]
+        self.scenePath = scenePath or self.header["scene"]
+        self.realtime = realtime
+
+    # Replays the trace and returns the latency report.
+    def replay(self) -> dict:
+        application = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+        # Asset paths in scene files are relative to the working directory the picker ran in.
+        if self.header.get("workingDirectory") and os.path.isdir(self.header["workingDirectory"]):
+            os.chdir(self.header["workingDirectory"])
+
+        commandInterpreter = InariTraceInterpreter(self.hostRecords)
+        inariWidget = InariWidget(None, commandInterpreter)
+        inariWidget.show()
+        if self.scenePath != None:
+            inariWidget.openScene(self.scenePath)
+        inariWidget.setAtlasRenderingEnabled(self.header.get("atlasRendering", False))
+        inariWidget.setSelection(self.header.get("selection", []))
+
+        # Restore the camera, the viewport is resized to the recorded size.
+        view = inariWidget.inariView
+        viewportSize = self.header["viewportSize"]
+        inariWidget.resize(inariWidget.width() + viewportSize[0] - view.viewport().width(), inariWidget.height() + viewportSize[1] - view.viewport().height())
+        view.setTransform(QtGui.QTransform(*self.header["transform"][0:4], self.header["transform"][4], self.header["transform"][5]))
+        view.horizontalScrollBar().setValue(self.header["scroll"][0])
+        view.verticalScrollBar().setValue(self.header["scroll"][1])
+        view.setFocus()
+        application.processEvents()
+
+        latencies: typing.Dict[str, typing.List[float]] = collections.defaultdict(list)
+        startTime = time.perf_counter()
+        for record in self.inputRecords:
+            if self.realtime:
+                while time.perf_counter() - startTime < record["time"]:
+                    application.processEvents(QtCore.QEventLoop.AllEvents, 1)
+
+            eventStart = time.perf_counter()
+            self.sendEvent(inariWidget, record)
+            application.processEvents()
+            latencies[record["type"]].append((time.perf_counter() - eventStart) * 1000)
+
+        # Let pending timers, like the command queue flush, finish.
+        settleTime = time.perf_counter()
+        while time.perf_counter() - settleTime < 0.1:
+            application.processEvents(QtCore.QEventLoop.AllEvents, 1)
+
+        report = {
+            "trace": {"events": len(self.inputRecords), "hostCalls": len(self.hostRecords), "duration": self.inputRecords[-1]["time"] if len(self.inputRecords) > 0 else 0.0},
+            "latency": {eventType: self.summarize(samples) for eventType, samples in latencies.items()},
+            "hostCalls": dict(commandInterpreter.calls)
+        }
+        report["latency"]["all"] = self.summarize([sample for samples in latencies.values() for sample in samples])
+        return report
+
+    # Sends a recorded input event to the view.
+    def sendEvent(self, inariWidget: InariWidget, record: dict) -> None:
+        view = inariWidget.inariView
+        viewport = view.viewport()
+        modifiers = QtCore.Qt.KeyboardModifiers(record["modifiers"])
+        eventType = record["type"]
+        if eventType in ("KeyPress", "KeyRelease"):
+            # Sent through the window system, so the application wide keyboard modifier state is updated too.
+            action = QtTest.QTest.Press if eventType == "KeyPress" else QtTest.QTest.Release
+            QtTest.QTest.sendKeyEvent(action, view.window().windowHandle(), QtCore.Qt.Key(record["key"]), record["text"], modifiers)
+            return
+
+        position = QtCore.QPointF(record["position"][0], record["position"][1])
+        globalPosition = QtCore.QPointF(viewport.mapToGlobal(position.toPoint()))
+        buttons = QtCore.Qt.MouseButtons(record["buttons"])
+        if eventType == "Wheel":
+            angleDelta = QtCore.QPoint(record["angleDelta"][0], record["angleDelta"][1])
+            event = QtGui.QWheelEvent(position, globalPosition, QtCore.QPoint(), angleDelta, buttons, modifiers, QtCore.Qt.NoScrollPhase, False)
+        else:
+            event = QtGui.QMouseEvent(getattr(QtCore.QEvent, eventType), position, globalPosition, QtCore.Qt.MouseButton(record["button"]), buttons, modifiers)
+        QtWidgets.QApplication.sendEvent(viewport, event)
+
+    # Returns the count, percentiles and maximum of latency samples in milliseconds.
+    @classmethod
+    def summarize(cls, samples: typing.List[float]) -> dict:
+        if len(samples) == 0:
+            return {"count": 0}
+        ordered = sorted(samples)
+        summary = {"count": len(ordered)}
+        for percentile in cls.percentiles:
+            summary[f'p{percentile}'] = ordered[min(len(ordered) - 1, int(round(percentile / 100 * (len(ordered) - 1))))]
+        summary["max"] = ordered[-1]
+        return summary
+
+# Replays a trace headless and reports the per event latency percentiles as json.
+# With --budget, exits with a non-zero code if the 99th percentile latency of any event type exceeds it, for use as a regression test.
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay an Inari interaction trace headless and report event latencies.")
+    parser.add_argument("trace", help="Trace file recorded with InariTraceRecorder.")
+    parser.add_argument("--scene", default=None, help="Scene file to replay against, defaults to the recorded scene.")
+    parser.add_argument("--fast", action="store_true", help="Replay the events back to back instead of at the recorded pace.")
+    parser.add_argument("--output", default=None, help="Json file to write the report to, defaults to stdout.")
+    parser.add_argument("--budget", type=float, default=None, help="Maximum allowed 99th percentile latency in milliseconds.")
+    arguments = parser.parse_args()
+
+    # The replay runs without a display.
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    tracePath = os.path.abspath(arguments.trace)
+    scenePath = os.path.abspath(arguments.scene) if arguments.scene != None else None
+    report = InariTraceReplayer(tracePath, scenePath, not arguments.fast).replay()
+
+    if arguments.output != None:
+        with open(arguments.output, "w") as file:
+            json.dump(report, file, indent=4)
+    else:
+        json.dump(report, sys.stdout, indent=4)
+        sys.stdout.write("\n")
+
+    if arguments.budget != None:
+        slowEvents = [eventType for eventType, summary in report["latency"].items() if summary.get("p99", 0.0) > arguments.budget]
+        for eventType in slowEvents:
+            sys.stderr.write(f'{eventType} p99 latency {report["latency"][eventType]["p99"]:.2f} ms exceeds the {arguments.budget:.2f} ms budget\n')
+        sys.exit(1 if len(slowEvents) > 0 else 0)
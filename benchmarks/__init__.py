@@ -0,0 +1,3 @@
+# Headless performance benchmarks for Inari.
+# Run them from the picker root directory, as the synthetic scenes reference the assets relative to it:
+#   python -m benchmarks --sizes 100 1000 5000 20000 --output results.json
@@ -0,0 +1,34 @@
+import argparse
+import json
+import sys
+
+from .suite import InariBenchmarkSuite, compareResults
+
+# Runs the benchmark suite and writes the results as json, optionally failing on regressions against a previous run.
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Headless Inari performance benchmarks.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=InariBenchmarkSuite.defaultSizes, help="Scene sizes, in locators.")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of samples per benchmark.")
+    parser.add_argument("--atlas", action="store_true", help="Benchmark with atlas rendering enabled.")
+    parser.add_argument("--viewport", default=None, choices=["raster", "opengl"], help="Viewport backend to benchmark, defaults to the one from the settings.")
+    parser.add_argument("--output", default=None, help="Json file to write the results to, defaults to stdout.")
+    parser.add_argument("--compare", default=None, help="Json results of a previous run to compare the medians against.")
+    parser.add_argument("--threshold", type=float, default=1.1, help="Slowdown factor reported as a regression.")
+    arguments = parser.parse_args()
+
+    results = InariBenchmarkSuite(arguments.repeat, arguments.atlas, arguments.viewport).run(arguments.sizes)
+
+    if arguments.output != None:
+        with open(arguments.output, "w") as file:
+            json.dump(results, file, indent=4)
+    else:
+        json.dump(results, sys.stdout, indent=4)
+        sys.stdout.write("\n")
+
+    if arguments.compare != None:
+        with open(arguments.compare, "r") as file:
+            previous = json.load(file)
+        regressions = compareResults(previous, results, arguments.threshold)
+        for benchmark, locators, previousMedian, currentMedian in regressions:
+            sys.stderr.write(f'Regression: {benchmark} with {locators} locators, {previousMedian:.2f} ms -> {currentMedian:.2f} ms\n')
+        sys.exit(1 if len(regressions) > 0 else 0)
@@ -0,0 +1,53 @@
+import json
+import random
+import typing
+
+# Assets the synthetic scenes are built from, relative to the picker root directory.
+panelImagePath: str = "./assets/Eyebrow_Background.svg"
+locatorImagePaths: typing.List[typing.Tuple[str, str]] = [(f'./assets/Eyebrow_Button0{index}.svg', f'./assets/Eyebrow_Button0{index}_Hover.svg') for index in range(1, 5)]
+# Panel layout, the locators are scattered over background panels laid out in a grid.
+locatorsPerPanel: int = 50
+panelsPerRow: int = 20
+panelWidth: float = 320.0
+panelHeight: float = 150.0
+
+# Generates a scene in the example.json schema with the supplied number of locators.
+# The same seed always generates the same scene, so runs can be compared.
+def generateScene(locatorCount: int, seed: int = 0) -> dict:
+    generator = random.Random(seed)
+    panels = []
+    for panelIndex in range((locatorCount + locatorsPerPanel - 1) // locatorsPerPanel):
+        locators = []
+        for locatorIndex in range(min(locatorsPerPanel, locatorCount - panelIndex * locatorsPerPanel)):
+            imagePath, hoverImagePath = locatorImagePaths[locatorIndex % len(locatorImagePaths)]
+            locators.append({
+                "type": "InariLocator",
+                "imagePath": imagePath,
+                "hoverImagePath": hoverImagePath,
+                "positionX": generator.uniform(0, 250),
+                "positionY": generator.uniform(0, 80),
+                "itemName": f'CTRL_{panelIndex}_{locatorIndex}'
+            })
+        panels.append({
+            "type": "InariItem",
+            "imagePath": panelImagePath,
+            "positionX": (panelIndex % panelsPerRow) * panelWidth,
+            "positionY": (panelIndex // panelsPerRow) * panelHeight,
+            "scaleX": 1.0,
+            "scaleY": 1.0,
+            "items": locators
+        })
+    return {"items": panels}
+
+# Writes a generated scene to a json file.
+def writeScene(scene: dict, path: str) -> None:
+    with open(path, "w") as file:
+        json.dump(scene, file)
+
+# Returns the number of items in a scene, including all nested sub-items.
+def itemCount(scene: dict) -> int:
+    return sum(1 + itemCount(item) for item in scene.get("items", []))
+
+# Returns the item names of all locators in a generated scene.
+def locatorNames(scene: dict) -> typing.List[str]:
+    return [locator["itemName"] for panel in scene["items"] for locator in panel["items"]]
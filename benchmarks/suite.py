@@ -0,0 +1,361 @@
+import collections
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+import traceback
+import types
+import typing
+
+# The benchmarks run without a display.
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import PySide2
+from PySide2 import QtCore, QtGui, QtWidgets, QtTest
+from Inari import InariWidget, InariCommandInterpreter, InariItem
+from . import scenes
+
+"""
+InariBenchmarkInterpreter is a stub InariCommandInterpreter standing in for the host application.
+It keeps the selection and positions in memory and counts the host calls. Like the Maya bridge, it echoes
+selection changes back to the InariWidget and notifies transform changes synchronously, so benchmarks include the full round trip.
+Playback is simulated with advanceFrame(), which like Maya only sends frame notifications for animated values.
+"""
+class InariBenchmarkInterpreter(InariCommandInterpreter):
+    # The InariWidget selection changes are echoed to.
+    inariWidget: InariWidget = None
+
+    # Constructor.
+    def __init__(self) -> None:
+        self.calls: typing.Counter[str] = collections.Counter()
+        self.selection: typing.List[str] = []
+        self.positions: typing.Dict[str, typing.List[float]] = {}
+        self.transformChangedCallbacks: typing.Dict[str, typing.List[typing.Callable[[str], None]]] = {}
+        self.frameChangedCallbacks: typing.List[typing.Callable[[], None]] = []
+
+    def Host_SetSelection(self, items:typing.List[str]) -> None:
+        self.calls["Host_SetSelection"] += 1
+        self.selection = list(items)
+        if self.inariWidget != None:
+            self.inariWidget.setSelection(self.selection)
+
+    def Host_GetSelection(self) -> typing.List[str]:
+        self.calls["Host_GetSelection"] += 1
+        return list(self.selection)
+
+    def Host_SetPosition(self, item:str, x:float, y:float, z:float, worldSpace:bool=False, relative:bool=True) -> None:
+        self.calls["Host_SetPosition"] += 1
+        position = self.positions.setdefault(item, [0.0, 0.0, 0.0])
+        if relative:
+            position[0], position[1], position[2] = position[0] + x, position[1] + y, position[2] + z
+        else:
+            position[0], position[1], position[2] = x, y, z
+        for callback in self.transformChangedCallbacks.get(item, []):
+            callback(item)
+
+    def Host_GetPosition(self, item:str, worldSpace:bool=False, relative:bool=True) -> typing.List[float]:
+        self.calls["Host_GetPosition"] += 1
+        return list(self.positions.get(item, [0.0, 0.0, 0.0]))
+
+    # Bulk implementation, so the batched calls are counted once like in the Maya bridge.
+    def Host_SetPositions(self, positions:typing.Dict[str, typing.List[float]], worldSpace:bool=False, relative:bool=True) -> None:
+        self.calls["Host_SetPositions"] += 1
+        for item, (x, y, z) in positions.items():
+            position = self.positions.setdefault(item, [0.0, 0.0, 0.0])
+            if relative:
+                position[0], position[1], position[2] = position[0] + x, position[1] + y, position[2] + z
+            else:
+                position[0], position[1], position[2] = x, y, z
+        for item in positions:
+            for callback in self.transformChangedCallbacks.get(item, []):
+                callback(item)
+
+    # Bulk implementation, see Host_SetPositions().
+    def Host_GetPositions(self, items:typing.List[str], worldSpace:bool=False, relative:bool=True) -> typing.List[typing.List[float]]:
+        self.calls["Host_GetPositions"] += 1
+        return [list(self.positions.get(item, [0.0, 0.0, 0.0])) for item in items]
+
+    def Host_OpenUndoChunk(self, name:str) -> None:
+        self.calls["Host_OpenUndoChunk"] += 1
+
+    def Host_CloseUndoChunk(self) -> None:
+        self.calls["Host_CloseUndoChunk"] += 1
+
+    def Host_AddTransformChangedCallback(self, items:typing.List[str], callback:typing.Callable[[str], None]) -> bool:
+        self.calls["Host_AddTransformChangedCallback"] += 1
+        for item in items:
+            self.transformChangedCallbacks.setdefault(item, []).append(callback)
+        return True
+
+    def Host_RemoveTransformChangedCallbacks(self) -> None:
+        self.calls["Host_RemoveTransformChangedCallbacks"] += 1
+        self.transformChangedCallbacks.clear()
+
+    def Host_AddFrameChangedCallback(self, callback:typing.Callable[[], None]) -> bool:
+        self.calls["Host_AddFrameChangedCallback"] += 1
+        self.frameChangedCallbacks.append(callback)
+        return True
+
+    def Host_RemoveFrameChangedCallbacks(self) -> None:
+        self.calls["Host_RemoveFrameChangedCallbacks"] += 1
+        self.frameChangedCallbacks.clear()
+
+    # Sets the positions of animated items and notifies the frame changed callbacks, without transform change notifications.
+    def advanceFrame(self, positions: typing.Dict[str, typing.List[float]]) -> None:
+        for item, position in positions.items():
+            self.positions[item] = list(position)
+        for callback in self.frameChangedCallbacks:
+            callback()
+
+"""
+InariBenchmarkSuite times scene loading, painting, navigation and selection sync of an InariWidget on synthetic scenes.
+Every benchmark is repeated and reported with its raw samples in milliseconds, so runs can be compared sample by sample.
+Qt swallows exceptions raised in virtual overrides and slots, so they're collected through sys.excepthook and fail the run,
+as does a scene whose item count doesn't match the generated one; a broken widget would otherwise benchmark as fast.
+"""
+class InariBenchmarkSuite():
+    # Scene sizes, in locators, benchmarked by default.
+    defaultSizes: typing.List[int] = [100, 1000, 5000, 20000]
+    # Size of the benchmarked view in pixels.
+    viewSize: QtCore.QSize = QtCore.QSize(1000, 1000)
+    # Number of mouse move or wheel events per navigation gesture.
+    gestureEvents: int = 50
+    # Fraction of the locators selected by the selection benchmarks.
+    selectionFraction: float = 0.1
+
+    # Constructor.
+    def __init__(self, repeat: int = 5, atlasRendering: bool = False, viewportBackend: str = None) -> None:
+        self.repeat = repeat
+        self.atlasRendering = atlasRendering
+        self.application = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+        self.commandInterpreter = InariBenchmarkInterpreter()
+        self.inariWidget = InariWidget(None, self.commandInterpreter, viewportBackend)
+        self.inariWidget.resize(self.viewSize)
+        self.inariWidget.show()
+        self.inariWidget.setAtlasRenderingEnabled(atlasRendering)
+        self.commandInterpreter.inariWidget = self.inariWidget
+        # Formatted exceptions raised in Qt callbacks since the last check, see checkErrors().
+        self.errors: typing.List[str] = []
+
+    # Runs all benchmarks for every scene size and returns the results, ready to be written as json.
+    # Raises RuntimeError if a benchmark failed.
+    def run(self, sizes: typing.List[int]) -> dict:
+        results = []
+        previousExceptHook = sys.excepthook
+        sys.excepthook = self.exceptHook
+        try:
+            with tempfile.TemporaryDirectory() as directory:
+                for size in sizes:
+                    scene = scenes.generateScene(size)
+                    path = os.path.join(directory, f'scene_{size}.json')
+                    scenes.writeScene(scene, path)
+                    results.extend(self.runScene(path, scene, size))
+        finally:
+            sys.excepthook = previousExceptHook
+        return {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "pyside": PySide2.__version__,
+            "qt": QtCore.qVersion(),
+            "platform": platform.platform(),
+            "qpa": QtGui.QGuiApplication.platformName(),
+            "repeat": self.repeat,
+            "atlasRendering": self.atlasRendering,
+            "viewportBackend": self.inariWidget.inariView.viewportBackend,
+            "results": results
+        }
+
+    # Runs all benchmarks on a single scene file.
+    def runScene(self, path: str, scene: dict, size: int) -> typing.List[dict]:
+        results = [self.benchmarkOpenScene(path)]
+        self.inariWidget.inariView.frameSelected()
+        self.application.processEvents()
+        self.checkErrors()
+        itemCount = self.sceneItemCount()
+        if itemCount != scenes.itemCount(scene):
+            raise RuntimeError(f'The scene with {size} locators opened with {itemCount} of {scenes.itemCount(scene)} items.')
+        results.append(self.benchmarkPaint())
+        results.append(self.benchmarkPan())
+        results.append(self.benchmarkZoom())
+        results.append(self.benchmarkRubberBand())
+        results.extend(self.benchmarkSetSelection(scenes.locatorNames(scene)))
+        results.append(self.benchmarkLivePose(scenes.locatorNames(scene)))
+        for result in results:
+            result["locators"] = size
+        return results
+
+    # Times opening the scene, the first sample includes parsing the assets.
+    def benchmarkOpenScene(self, path: str) -> dict:
+        return self.measure("openScene", lambda: self.inariWidget.openScene(path))
+
+    # Times a synchronous repaint of the whole view.
+    def benchmarkPaint(self) -> dict:
+        return self.measure("paint", lambda: self.inariWidget.inariView.viewport().repaint())
+
+    # Times alt + middle mouse drag panning, per mouse move event including the repaint.
+    def benchmarkPan(self) -> dict:
+        viewport = self.inariWidget.inariView.viewport()
+        center = QtCore.QPoint(viewport.width() // 2, viewport.height() // 2)
+
+        def pan() -> None:
+            self.sendMouseEvent(QtCore.QEvent.MouseButtonPress, center, QtCore.Qt.MiddleButton, QtCore.Qt.MiddleButton)
+            for index in range(self.gestureEvents):
+                # Pan back and forth, so the view ends up where it started.
+                offset = (index if index < self.gestureEvents // 2 else self.gestureEvents - index) * 4
+                self.sendMouseEvent(QtCore.QEvent.MouseMove, center + QtCore.QPoint(offset, offset), QtCore.Qt.NoButton, QtCore.Qt.MiddleButton)
+                # The view applies camera input once per display frame, every event is timed as if it got a frame of its own.
+                self.inariWidget.inariView.applyCameraInput()
+                self.application.processEvents()
+            self.sendMouseEvent(QtCore.QEvent.MouseButtonRelease, center, QtCore.Qt.MiddleButton, QtCore.Qt.NoButton)
+            self.inariWidget.inariView.flushCameraInput()
+
+        # Camera navigation only happens while alt is held.
+        QtTest.QTest.keyPress(self.inariWidget.window().windowHandle(), QtCore.Qt.Key_Alt, QtCore.Qt.AltModifier)
+        try:
+            return self.measure("pan", pan, self.gestureEvents)
+        finally:
+            QtTest.QTest.keyRelease(self.inariWidget.window().windowHandle(), QtCore.Qt.Key_Alt, QtCore.Qt.NoModifier)
+
+    # Times mouse wheel zooming, per wheel event including the repaint, each wheel event is given a display frame of its own.
+    def benchmarkZoom(self) -> dict:
+        view = self.inariWidget.inariView
+        viewport = view.viewport()
+        center = QtCore.QPointF(viewport.width() / 2, viewport.height() / 2)
+
+        def zoom() -> None:
+            for index in range(self.gestureEvents):
+                # Zoom out and back in, so the view ends up where it started.
+                angleDelta = QtCore.QPoint(0, -120 if index < self.gestureEvents // 2 else 120)
+                event = QtGui.QWheelEvent(center, QtCore.QPointF(viewport.mapToGlobal(center.toPoint())), QtCore.QPoint(), angleDelta, QtCore.Qt.NoButton, QtCore.Qt.NoModifier, QtCore.Qt.NoScrollPhase, False)
+                QtWidgets.QApplication.sendEvent(viewport, event)
+                view.applyCameraInput()
+                self.application.processEvents()
+            view.flushCameraInput()
+
+        return self.measure("zoom", zoom, self.gestureEvents)
+
+    # Times rubber band selection from the view corner to its center, per mouse move event including the selection sync.
+    def benchmarkRubberBand(self) -> dict:
+        viewport = self.inariWidget.inariView.viewport()
+        # frameSelected() leaves a margin around the scene, so the drag starts on empty space.
+        start = QtCore.QPoint(4, 4)
+        end = QtCore.QPoint(viewport.width() // 2, viewport.height() // 2)
+
+        def rubberBand() -> None:
+            self.sendMouseEvent(QtCore.QEvent.MouseButtonPress, start, QtCore.Qt.LeftButton, QtCore.Qt.LeftButton)
+            for index in range(1, self.gestureEvents + 1):
+                self.sendMouseEvent(QtCore.QEvent.MouseMove, start + (end - start) * (index / self.gestureEvents), QtCore.Qt.NoButton, QtCore.Qt.LeftButton)
+                self.application.processEvents()
+            self.sendMouseEvent(QtCore.QEvent.MouseButtonRelease, end, QtCore.Qt.LeftButton, QtCore.Qt.NoButton)
+            self.inariWidget.setSelection([])
+
+        result = self.measure("rubberBand", rubberBand, self.gestureEvents)
+        result["selected"] = len(self.commandInterpreter.selection)
+        return result
+
+    # Times applying a host selection to Inari, and the round trip of an Inari selection through the host and back.
+    def benchmarkSetSelection(self, itemNames: typing.List[str]) -> typing.List[dict]:
+        generator = random.Random(0)
+        count = max(1, int(len(itemNames) * self.selectionFraction))
+        selections = [generator.sample(itemNames, count) for index in range(2)]
+        iteration = iter(range(sys.maxsize))
+
+        def setSelection(notifyHost: bool) -> None:
+            self.inariWidget.setSelection(selections[next(iteration) % 2], notifyHost=notifyHost)
+
+        results = [
+            self.measure("setSelection", lambda: setSelection(False)),
+            self.measure("setSelectionRoundTrip", lambda: setSelection(True))
+        ]
+        self.inariWidget.setSelection([])
+        for result in results:
+            result["selected"] = count
+        return results
+
+    # Times live pose reflection during playback, per frame including the bulk position query and the repaint.
+    # Every frame animates a fraction of the locators, the others keep their pose.
+    def benchmarkLivePose(self, itemNames: typing.List[str]) -> dict:
+        generator = random.Random(0)
+        animatedItems = generator.sample(itemNames, max(1, int(len(itemNames) * self.selectionFraction)))
+        iteration = iter(range(sys.maxsize))
+        positionMirror = self.inariWidget.inariPositionMirror
+
+        def playback() -> None:
+            for index in range(self.gestureEvents):
+                offset = (next(iteration) % self.gestureEvents) * 0.01
+                self.commandInterpreter.advanceFrame({item: [offset, offset, 0.0] for item in animatedItems})
+                # The mirror refreshes once per display frame, every host frame is timed as if it got a display frame of its own.
+                positionMirror.refresh()
+                self.application.processEvents()
+
+        self.inariWidget.setLivePoseEnabled(True)
+        try:
+            result = self.measure("livePose", playback, self.gestureEvents)
+        finally:
+            self.inariWidget.setLivePoseEnabled(False)
+            self.commandInterpreter.advanceFrame({item: [0.0, 0.0, 0.0] for item in animatedItems})
+            positionMirror.refresh()
+        result["animated"] = len(animatedItems)
+        return result
+
+    # Sends a mouse event to the view viewport.
+    def sendMouseEvent(self, eventType: QtCore.QEvent.Type, position: QtCore.QPoint, button: QtCore.Qt.MouseButton, buttons: QtCore.Qt.MouseButtons) -> None:
+        viewport = self.inariWidget.inariView.viewport()
+        event = QtGui.QMouseEvent(eventType, QtCore.QPointF(position), QtCore.QPointF(viewport.mapToGlobal(position)), button, buttons, QtWidgets.QApplication.queryKeyboardModifiers())
+        QtWidgets.QApplication.sendEvent(viewport, event)
+
+    # Returns the number of InariItems in the scene, including the sub-items of items that haven't been expanded yet.
+    def sceneItemCount(self) -> int:
+        itemCount = 0
+        for item in self.inariWidget.inariScene.items():
+            if isinstance(item, InariItem):
+                itemCount += 1
+                if item.pendingJsonItems != None:
+                    itemCount += scenes.itemCount({"items": item.pendingJsonItems})
+        return itemCount
+
+    # Installed as sys.excepthook while running, collects the exceptions Qt would only print.
+    def exceptHook(self, exceptionType: typing.Type[BaseException], exception: BaseException, exceptionTraceback: types.TracebackType) -> None:
+        self.errors.append("".join(traceback.format_exception(exceptionType, exception, exceptionTraceback)))
+        sys.__excepthook__(exceptionType, exception, exceptionTraceback)
+
+    # Raises RuntimeError if exceptions were raised in Qt callbacks since the last check.
+    def checkErrors(self, name: str = None) -> None:
+        if len(self.errors) == 0:
+            return
+        errors, self.errors = self.errors, []
+        raise RuntimeError(f'{len(errors)} exceptions raised in Qt callbacks{f" during {name}" if name != None else ""}, the first one:\n{errors[0]}')
+
+    # Calls a function "repeat" times and returns the samples in milliseconds, divided by the number of events per call.
+    def measure(self, name: str, function: typing.Callable[[], typing.Any], events: int = 1) -> dict:
+        self.commandInterpreter.calls.clear()
+        self.checkErrors()
+        samples = []
+        for index in range(self.repeat):
+            start = time.perf_counter()
+            function()
+            samples.append((time.perf_counter() - start) * 1000 / events)
+        self.checkErrors(name)
+        return {
+            "benchmark": name,
+            "samples": samples,
+            "min": min(samples),
+            "median": statistics.median(samples),
+            "mean": statistics.mean(samples),
+            "max": max(samples),
+            "hostCalls": dict(self.commandInterpreter.calls)
+        }
+
+# Compares the medians of two runs, returns a list of (benchmark, locators, previous median, current median) for every
+# benchmark that got slower by more than the threshold factor.
+def compareResults(previous: dict, current: dict, threshold: float) -> typing.List[typing.Tuple[str, int, float, float]]:
+    previousMedians = {(result["benchmark"], result["locators"]): result["median"] for result in previous["results"]}
+    regressions = []
+    for result in current["results"]:
+        key = (result["benchmark"], result["locators"])
+        if key in previousMedians and result["median"] > previousMedians[key] * threshold:
+            regressions.append((key[0], key[1], previousMedians[key], result["median"]))
+    return regressions